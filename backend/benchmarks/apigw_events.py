@@ -0,0 +1,24 @@
+import json
+from typing import Optional
+
+from utils.apigw import http_event as _http_event
+
+
+def http_event(
+    method: str,
+    route: str,
+    path: str,
+    body: Optional[dict] = None,
+    path_params: Optional[dict] = None,
+    headers: Optional[dict] = None,
+    source_ip: str = "203.0.113.10",
+) -> dict:
+    return _http_event(
+        method,
+        route,
+        path,
+        body=json.dumps(body) if body is not None else None,
+        path_params=path_params,
+        headers={"content-type": "application/json", "user-agent": "benchmarks/1.0", **(headers or {})},
+        source_ip=source_ip,
+    )
@@ -0,0 +1,48 @@
+import os
+import timeit
+
+from cryptography.fernet import Fernet
+
+from infra import crypto_service
+
+
+ITERATIONS = 20000
+
+
+def _uncached_encrypt(plain: str) -> str:
+    key = os.environ["ENCRYPTION_KEY"].encode()
+    return Fernet(key).encrypt(plain.encode()).decode()
+
+
+def _uncached_decrypt(ciphertext: str) -> str:
+    key = os.environ["ENCRYPTION_KEY"].encode()
+    return Fernet(key).decrypt(ciphertext.encode()).decode()
+
+
+def _uncached_cipher(_) -> Fernet:
+    return Fernet(os.environ["ENCRYPTION_KEY"].encode())
+
+
+def _per_call_us(fn, arg) -> float:
+    return timeit.timeit(lambda: fn(arg), number=ITERATIONS) / ITERATIONS * 1e6
+
+
+def main() -> None:
+    os.environ.setdefault("ENCRYPTION_KEY", Fernet.generate_key().decode())
+    crypto_service.reset_cipher_cache()
+
+    ciphertext = crypto_service.encrypt("MinhaSenha123!")
+    rows = [
+        ("setup", _per_call_us(_uncached_cipher, None), _per_call_us(lambda _: crypto_service.get_cipher(), None)),
+        ("encrypt", _per_call_us(_uncached_encrypt, "MinhaSenha123!"), _per_call_us(crypto_service.encrypt, "MinhaSenha123!")),
+        ("decrypt", _per_call_us(_uncached_decrypt, ciphertext), _per_call_us(crypto_service.decrypt, ciphertext)),
+    ]
+
+    print(f"{'op':<8} {'antes (us)':>12} {'depois (us)':>12} {'ganho':>8}")
+    for op, before, after in rows:
+        print(f"{op:<8} {before:>12.2f} {after:>12.2f} {before / after:>7.2f}x")
+    print(f"cipher: {crypto_service.get_cipher_metrics()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+import os
+import time
+
+from benchmarks.dynamodb_standin import endpoint_url, start_standin
+from infra import dynamodb_repository, pwd_repository
+
+
+ITERATIONS = 1000
+
+ITEM = {
+    "token_hash": "0" * 64,
+    "ciphertext": "g" * 120,
+    "key_id": "k0",
+    "expires_at": 4102444800,
+    "max_views": 100,
+    "views_used": 0,
+    "revoked": False,
+}
+
+
+def _cpu_us_per_request(api: str) -> float:
+    os.environ["DYNAMODB_API"] = api
+    dynamodb_repository.reset_table_cache()
+    pwd_repository.set_repository(None)
+
+    def request():
+        pwd_repository.save_secret(ITEM)
+        pwd_repository.consume_view_and_maybe_delete(ITEM["token_hash"])
+
+    for _ in range(50):
+        request()
+
+    # thread_time: só a CPU do cliente, sem a thread do servidor stand-in.
+    start = time.thread_time()
+    for _ in range(ITERATIONS):
+        request()
+    return (time.thread_time() - start) / ITERATIONS * 1e6
+
+
+def main() -> None:
+    server, _ = start_standin()
+    os.environ["DYNAMODB_ENDPOINT_URL"] = endpoint_url(server)
+    os.environ.setdefault("TABLE_NAME", "secure-secrets")
+    os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+    os.environ.setdefault("AWS_ACCESS_KEY_ID", "bench")
+    os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "bench")
+
+    try:
+        resource_us = _cpu_us_per_request("resource")
+        client_us = _cpu_us_per_request("client")
+    finally:
+        server.shutdown()
+        dynamodb_repository.reset_table_cache()
+        pwd_repository.set_repository(None)
+
+    print("CPU por requisição (put_item + update_item), em microssegundos")
+    print(f"{'resource':<10} {resource_us:>10.1f}")
+    print(f"{'client':<10} {client_us:>10.1f}")
+    print(f"{'ganho':<10} {resource_us / client_us:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
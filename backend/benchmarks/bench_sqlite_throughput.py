@@ -0,0 +1,53 @@
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from cryptography.fernet import Fernet
+
+from infra import crypto_service, pwd_repository
+from usecases.create_secret import create_secret
+from usecases.get_secret import get_secret
+
+
+REQUESTS = 2000
+WORKERS = 8
+
+
+def _create(_):
+    resp = create_secret({"body": json.dumps({"expiration_in_seconds": 3600, "pass_view_limit": 1})})
+    return json.loads(resp["body"])["pwdId"]
+
+
+def _get(pwd_id):
+    return get_secret({"pathParameters": {"pwdId": pwd_id}})["statusCode"]
+
+
+def _run(label, fn, args) -> list:
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=WORKERS) as pool:
+        results = list(pool.map(fn, args))
+    elapsed = time.perf_counter() - start
+    print(f"{label:<14} {len(args) / elapsed:>10.0f} ops/s")
+    return results
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["PWD_BACKEND"] = "sqlite"
+        os.environ["SQLITE_PATH"] = os.path.join(tmp, "secrets.db")
+        os.environ.setdefault("ENCRYPTION_KEY", Fernet.generate_key().decode())
+        pwd_repository.set_repository(None)
+        crypto_service.reset_cipher_cache()
+
+        print(f"SQLite (WAL), {WORKERS} threads, {REQUESTS} requisições")
+        pwd_ids = _run("create_secret", _create, list(range(REQUESTS)))
+        statuses = _run("get_secret", _get, pwd_ids)
+        assert set(statuses) == {200}
+
+        pwd_repository.set_repository(None)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,385 @@
+import json
+import math
+import re
+import threading
+import time
+from decimal import Decimal
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+
+_TOKEN_RE = re.compile(r"\s*(<>|<=|>=|[=<>(),+\-]|[#:]?[A-Za-z_][A-Za-z0-9_]*)")
+_KEYWORDS = {"AND", "OR", "NOT", "BETWEEN", "IN", "SET", "REMOVE", "ADD", "DELETE"}
+
+
+class DynamoDBError(Exception):
+    def __init__(self, code: str, message: str, extra: Optional[dict] = None):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+        self.extra = extra or {}
+
+
+def _tokenize(expression: str) -> List[str]:
+    tokens = []
+    pos = 0
+    expression = expression.strip()
+    while pos < len(expression):
+        match = _TOKEN_RE.match(expression, pos)
+        if not match:
+            raise DynamoDBError("ValidationException", f"Expressão inválida: {expression!r}")
+        token = match.group(1)
+        tokens.append(token.upper() if token.upper() in _KEYWORDS else token)
+        pos = match.end()
+    return tokens
+
+
+def _sort_key(av: dict) -> Tuple[str, Any]:
+    if "N" in av:
+        return "N", Decimal(av["N"])
+    if "S" in av:
+        return "S", av["S"]
+    if "B" in av:
+        return "B", av["B"]
+    if "BOOL" in av:
+        return "BOOL", av["BOOL"]
+    return "NULL", None
+
+
+class _Expression:
+    def __init__(self, expression: str, names: Optional[dict], values: Optional[dict]):
+        self.tokens = _tokenize(expression)
+        self.pos = 0
+        self.names = names or {}
+        self.values = values or {}
+
+    def peek(self) -> Optional[str]:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def take(self, expected: Optional[str] = None) -> str:
+        token = self.peek()
+        if token is None or (expected is not None and token != expected):
+            raise DynamoDBError("ValidationException", f"Esperado {expected!r}, encontrado {token!r}")
+        self.pos += 1
+        return token
+
+    def name(self) -> str:
+        token = self.take()
+        if token.startswith("#"):
+            return self.names[token]
+        return token
+
+    def operand(self, item: dict) -> Optional[dict]:
+        token = self.peek()
+        if token is not None and token.startswith(":"):
+            self.take()
+            value = self.values[token]
+        elif token == "if_not_exists":
+            self.take()
+            self.take("(")
+            path = self.name()
+            self.take(",")
+            default = self.operand(item)
+            self.take(")")
+            value = item.get(path, default)
+        else:
+            value = item.get(self.name())
+
+        while self.peek() in ("+", "-"):
+            op = self.take()
+            right = self.operand(item)
+            if value is None or right is None or "N" not in value or "N" not in right:
+                raise DynamoDBError("ValidationException", "Operando aritmético inválido")
+            a, b = Decimal(value["N"]), Decimal(right["N"])
+            value = {"N": str(a + b if op == "+" else a - b)}
+        return value
+
+    # condição: OR > AND > NOT > comparações/funções
+    def condition(self, item: dict) -> bool:
+        result = self.and_condition(item)
+        while self.peek() == "OR":
+            self.take()
+            right = self.and_condition(item)
+            result = result or right
+        return result
+
+    def and_condition(self, item: dict) -> bool:
+        result = self.not_condition(item)
+        while self.peek() == "AND":
+            self.take()
+            right = self.not_condition(item)
+            result = result and right
+        return result
+
+    def not_condition(self, item: dict) -> bool:
+        if self.peek() == "NOT":
+            self.take()
+            return not self.not_condition(item)
+        return self.primary(item)
+
+    def primary(self, item: dict) -> bool:
+        token = self.peek()
+        if token == "(":
+            self.take()
+            result = self.condition(item)
+            self.take(")")
+            return result
+        if token in ("attribute_exists", "attribute_not_exists"):
+            self.take()
+            self.take("(")
+            exists = self.name() in item
+            self.take(")")
+            return exists if token == "attribute_exists" else not exists
+        if token == "begins_with":
+            self.take()
+            self.take("(")
+            value = self.operand(item)
+            self.take(",")
+            prefix = self.operand(item)
+            self.take(")")
+            return value is not None and "S" in value and value["S"].startswith(prefix["S"])
+
+        left = self.operand(item)
+        op = self.take()
+        if op == "BETWEEN":
+            low = self.operand(item)
+            self.take("AND")
+            high = self.operand(item)
+            return _compare(left, ">=", low) and _compare(left, "<=", high)
+        if op == "IN":
+            self.take("(")
+            options = [self.operand(item)]
+            while self.peek() == ",":
+                self.take()
+                options.append(self.operand(item))
+            self.take(")")
+            return any(_compare(left, "=", option) for option in options)
+        return _compare(left, op, self.operand(item))
+
+    def evaluate(self, item: dict) -> bool:
+        result = self.condition(item)
+        if self.peek() is not None:
+            raise DynamoDBError("ValidationException", f"Token inesperado: {self.peek()!r}")
+        return result
+
+    def apply_update(self, item: dict) -> dict:
+        updated = dict(item)
+        while self.peek() is not None:
+            action = self.take()
+            while True:
+                path = self.name()
+                if action == "SET":
+                    self.take("=")
+                    updated[path] = self.operand(item)
+                elif action == "REMOVE":
+                    updated.pop(path, None)
+                elif action == "ADD":
+                    delta = self.operand(item)
+                    current = updated.get(path, {"N": "0"})
+                    updated[path] = {"N": str(Decimal(current["N"]) + Decimal(delta["N"]))}
+                else:
+                    raise DynamoDBError("ValidationException", f"Ação não suportada: {action}")
+                if self.peek() != ",":
+                    break
+                self.take()
+        return updated
+
+
+def _compare(left: Optional[dict], op: str, right: Optional[dict]) -> bool:
+    if left is None or right is None:
+        return op == "<>" and (left is None) != (right is None)
+    left_type, left_value = _sort_key(left)
+    right_type, right_value = _sort_key(right)
+    if left_type != right_type:
+        return op == "<>"
+    if op == "=":
+        return left_value == right_value
+    if op == "<>":
+        return left_value != right_value
+    if op == "<":
+        return left_value < right_value
+    if op == "<=":
+        return left_value <= right_value
+    if op == ">":
+        return left_value > right_value
+    if op == ">=":
+        return left_value >= right_value
+    raise DynamoDBError("ValidationException", f"Operador desconhecido: {op}")
+
+
+def _project(item: dict, request: dict) -> dict:
+    projection = request.get("ProjectionExpression")
+    if not projection:
+        return item
+    names = request.get("ExpressionAttributeNames") or {}
+    fields = [names.get(field.strip(), field.strip()) for field in projection.split(",")]
+    return {field: item[field] for field in fields if field in item}
+
+
+class DynamoDBStandIn:
+    def __init__(self, tables: Optional[Dict[str, str]] = None, latency_ms: float = 0.0):
+        self.tables = {name: {} for name in (tables or {"secure-secrets": "token_hash"})}
+        self.key_names = dict(tables or {"secure-secrets": "token_hash"})
+        self.latency_ms = latency_ms
+        self.lock = threading.Lock()
+        self.calls: Dict[str, int] = {}
+
+    def _table(self, name: str) -> Tuple[dict, str]:
+        if name not in self.tables:
+            raise DynamoDBError("ResourceNotFoundException", f"Tabela não encontrada: {name}")
+        return self.tables[name], self.key_names[name]
+
+    def _key(self, key_name: str, key_map: dict) -> Tuple[str, Any]:
+        if key_name not in key_map:
+            raise DynamoDBError("ValidationException", f"Chave {key_name} ausente")
+        return _sort_key(key_map[key_name])
+
+    def _check(self, request: dict, item: Optional[dict]) -> None:
+        condition = request.get("ConditionExpression")
+        if not condition:
+            return
+        expression = _Expression(condition, request.get("ExpressionAttributeNames"), request.get("ExpressionAttributeValues"))
+        if not expression.evaluate(item or {}):
+            extra = {}
+            if item and request.get("ReturnValuesOnConditionCheckFailure") == "ALL_OLD":
+                extra["Item"] = item
+            raise DynamoDBError("ConditionalCheckFailedException", "The conditional request failed", extra)
+
+    def handle(self, operation: str, request: dict) -> dict:
+        self.calls[operation] = self.calls.get(operation, 0) + 1
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        handler = getattr(self, f"_op_{operation}", None)
+        if handler is None:
+            raise DynamoDBError("UnknownOperationException", f"Operação não suportada: {operation}")
+        with self.lock:
+            return handler(request)
+
+    def _op_PutItem(self, request: dict) -> dict:
+        table, key_name = self._table(request["TableName"])
+        key = self._key(key_name, request["Item"])
+        old = table.get(key)
+        self._check(request, old)
+        table[key] = request["Item"]
+        return {"Attributes": old} if old and request.get("ReturnValues") == "ALL_OLD" else {}
+
+    def _op_GetItem(self, request: dict) -> dict:
+        table, key_name = self._table(request["TableName"])
+        item = table.get(self._key(key_name, request["Key"]))
+        return {"Item": _project(item, request)} if item else {}
+
+    def _op_UpdateItem(self, request: dict) -> dict:
+        table, key_name = self._table(request["TableName"])
+        key = self._key(key_name, request["Key"])
+        old = table.get(key)
+        self._check(request, old)
+        base = old or dict(request["Key"])
+        new = _Expression(
+            request.get("UpdateExpression", ""),
+            request.get("ExpressionAttributeNames"),
+            request.get("ExpressionAttributeValues"),
+        ).apply_update(base)
+        table[key] = new
+        return_values = request.get("ReturnValues", "NONE")
+        if return_values == "ALL_NEW":
+            return {"Attributes": new}
+        if return_values == "ALL_OLD" and old:
+            return {"Attributes": old}
+        return {}
+
+    def _op_DeleteItem(self, request: dict) -> dict:
+        table, key_name = self._table(request["TableName"])
+        key = self._key(key_name, request["Key"])
+        old = table.get(key)
+        self._check(request, old)
+        table.pop(key, None)
+        return {"Attributes": old} if old and request.get("ReturnValues") == "ALL_OLD" else {}
+
+    def _op_BatchWriteItem(self, request: dict) -> dict:
+        for table_name, writes in request["RequestItems"].items():
+            table, key_name = self._table(table_name)
+            for write in writes:
+                if "PutRequest" in write:
+                    item = write["PutRequest"]["Item"]
+                    table[self._key(key_name, item)] = item
+                else:
+                    table.pop(self._key(key_name, write["DeleteRequest"]["Key"]), None)
+        return {"UnprocessedItems": {}}
+
+    def _op_Scan(self, request: dict) -> dict:
+        table, key_name = self._table(request["TableName"])
+        keys = sorted(table)
+        segment = request.get("Segment")
+        if segment is not None:
+            keys = [key for key in keys if hash(key) % request["TotalSegments"] == segment]
+        start = request.get("ExclusiveStartKey")
+        if start:
+            start_key = self._key(key_name, start)
+            keys = [key for key in keys if key > start_key]
+
+        limit = request.get("Limit")
+        evaluated = keys[:limit] if limit else keys
+        filter_expression = request.get("FilterExpression")
+        items = []
+        for key in evaluated:
+            item = table[key]
+            if filter_expression and not _Expression(
+                filter_expression,
+                request.get("ExpressionAttributeNames"),
+                request.get("ExpressionAttributeValues"),
+            ).evaluate(item):
+                continue
+            items.append(_project(item, request))
+
+        response = {"Items": items, "Count": len(items), "ScannedCount": len(evaluated)}
+        if request.get("ReturnConsumedCapacity") in ("TOTAL", "INDEXES"):
+            # Leitura eventualmente consistente: 0,5 RCU por 4 KB lidos, antes do filtro.
+            scanned_bytes = sum(len(json.dumps(table[key], default=str)) for key in evaluated)
+            response["ConsumedCapacity"] = {
+                "TableName": request["TableName"],
+                "CapacityUnits": max(1, math.ceil(scanned_bytes / 4096)) * 0.5,
+            }
+        if limit and len(keys) > limit:
+            response["LastEvaluatedKey"] = {key_name: table[evaluated[-1]][key_name]}
+        return response
+
+
+def _make_handler(standin: DynamoDBStandIn):
+    class _Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def do_POST(self):
+            raw = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            operation = self.headers.get("X-Amz-Target", "").rpartition(".")[2]
+            try:
+                status, payload = 200, standin.handle(operation, json.loads(raw or b"{}"))
+            except DynamoDBError as e:
+                status = 400
+                payload = {"__type": f"com.amazonaws.dynamodb.v20120810#{e.code}", "message": e.message, **e.extra}
+            body = json.dumps(payload).encode()
+
+            self.send_response(status)
+            self.send_header("Content-Type", "application/x-amz-json-1.0")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("x-amzn-RequestId", "standin")
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return _Handler
+
+
+def start_standin(standin: Optional[DynamoDBStandIn] = None) -> Tuple[ThreadingHTTPServer, DynamoDBStandIn]:
+    standin = standin or DynamoDBStandIn()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _make_handler(standin))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, standin
+
+
+def endpoint_url(server: ThreadingHTTPServer) -> str:
+    host, port = server.server_address[:2]
+    return f"http://{host}:{port}"
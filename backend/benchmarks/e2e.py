@@ -0,0 +1,176 @@
+import argparse
+import json
+import os
+import secrets
+import statistics
+import sys
+import time
+import tracemalloc
+
+from cryptography.fernet import Fernet
+
+from benchmarks.apigw_events import http_event
+from benchmarks.dynamodb_standin import DynamoDBStandIn, endpoint_url, start_standin
+from handlers import create_pwd, get_pwd
+from infra import crypto_service, dynamodb_repository, pwd_repository
+
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines.json")
+ALLOCATION_SAMPLE = 50
+
+
+def _create_event():
+    return http_event("POST", "/pwd", "/pwd", body={"expiration_in_seconds": 3600, "pass_view_limit": 1})
+
+
+def _get_event(pwd_id: str):
+    return http_event("GET", "/pwd/{pwdId}", f"/pwd/{pwd_id}", path_params={"pwdId": pwd_id})
+
+
+def _percentile(samples: list, pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def _measure(handler, events: list, expected_status: int) -> dict:
+    latencies = []
+    start = time.perf_counter()
+    for event in events:
+        t0 = time.perf_counter()
+        resp = handler(event, None)
+        latencies.append((time.perf_counter() - t0) * 1000)
+        if resp["statusCode"] != expected_status:
+            raise RuntimeError(f"status inesperado {resp['statusCode']}: {resp['body']}")
+    elapsed = time.perf_counter() - start
+
+    return {
+        "p50_ms": round(statistics.median(latencies), 3),
+        "p95_ms": round(_percentile(latencies, 95), 3),
+        "p99_ms": round(_percentile(latencies, 99), 3),
+        "ops_per_sec": round(len(events) / elapsed, 1),
+    }
+
+
+def _peak_kib_per_request(handler, events: list) -> float:
+    tracemalloc.start()
+    peaks = []
+    try:
+        for event in events:
+            baseline = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            handler(event, None)
+            peaks.append(tracemalloc.get_traced_memory()[1] - baseline)
+    finally:
+        tracemalloc.stop()
+    return round(statistics.mean(peaks) / 1024, 1)
+
+
+def _configure(server, api: str) -> None:
+    os.environ["DYNAMODB_ENDPOINT_URL"] = endpoint_url(server)
+    os.environ["DYNAMODB_API"] = api
+    os.environ["TABLE_NAME"] = "secure-secrets"
+    os.environ["PWD_BACKEND"] = "dynamodb"
+    os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+    os.environ.setdefault("AWS_ACCESS_KEY_ID", "bench")
+    os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "bench")
+    os.environ.setdefault("ENCRYPTION_KEY", Fernet.generate_key().decode())
+    dynamodb_repository.reset_table_cache()
+    pwd_repository.set_repository(None)
+    crypto_service.reset_cipher_cache()
+
+
+def run(requests: int, latency_ms: float, api: str) -> dict:
+    server, _ = start_standin(DynamoDBStandIn(latency_ms=latency_ms))
+    try:
+        _configure(server, api)
+
+        # Aquecimento: clientes boto3, cifra e caches fora da medição.
+        warm_ids = [json.loads(create_pwd.handler(_create_event(), None)["body"])["pwdId"] for _ in range(20)]
+        for pwd_id in warm_ids:
+            get_pwd.handler(_get_event(pwd_id), None)
+
+        create_events = [_create_event() for _ in range(requests)]
+        results = {"create": _measure(create_pwd.handler, create_events, 201)}
+
+        pwd_ids = [json.loads(create_pwd.handler(_create_event(), None)["body"])["pwdId"] for _ in range(requests)]
+        results["get"] = _measure(get_pwd.handler, [_get_event(pwd_id) for pwd_id in pwd_ids], 200)
+
+        probes = [_get_event(secrets.token_urlsafe(32)) for _ in range(requests)]
+        results["get_not_found"] = _measure(get_pwd.handler, probes, 404)
+
+        results["create"]["peak_kib_per_req"] = _peak_kib_per_request(
+            create_pwd.handler, [_create_event() for _ in range(ALLOCATION_SAMPLE)]
+        )
+        extra_ids = [json.loads(create_pwd.handler(_create_event(), None)["body"])["pwdId"] for _ in range(ALLOCATION_SAMPLE)]
+        results["get"]["peak_kib_per_req"] = _peak_kib_per_request(
+            get_pwd.handler, [_get_event(pwd_id) for pwd_id in extra_ids]
+        )
+        results["get_not_found"]["peak_kib_per_req"] = _peak_kib_per_request(
+            get_pwd.handler, [_get_event(secrets.token_urlsafe(32)) for _ in range(ALLOCATION_SAMPLE)]
+        )
+        return results
+    finally:
+        server.shutdown()
+        dynamodb_repository.reset_table_cache()
+        pwd_repository.set_repository(None)
+
+
+def find_regressions(results: dict, baseline: dict, tolerance: float) -> list:
+    regressions = []
+    for scenario, current in results.items():
+        previous = baseline.get(scenario)
+        if not previous:
+            continue
+        if current["p95_ms"] > previous["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{scenario}: p95 {current['p95_ms']}ms > baseline {previous['p95_ms']}ms")
+        if current["ops_per_sec"] < previous["ops_per_sec"] * (1 - tolerance):
+            regressions.append(f"{scenario}: {current['ops_per_sec']} ops/s < baseline {previous['ops_per_sec']} ops/s")
+    return regressions
+
+
+def _print_results(profile: str, results: dict) -> None:
+    print(f"perfil: {profile}")
+    print(f"{'cenário':<15} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'ops/s':>9} {'KiB/req':>8}")
+    for scenario, r in results.items():
+        print(
+            f"{scenario:<15} {r['p50_ms']:>8.2f} {r['p95_ms']:>8.2f} {r['p99_ms']:>8.2f} "
+            f"{r['ops_per_sec']:>9.1f} {r['peak_kib_per_req']:>8.1f}"
+        )
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark ponta a ponta dos handlers contra um DynamoDB local.")
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--api", choices=("resource", "client"), default="resource")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    profile = f"{args.api}/latency={args.latency_ms:g}ms"
+    results = run(args.requests, args.latency_ms, args.api)
+    _print_results(profile, results)
+
+    baselines = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baselines = json.load(f)
+
+    if args.save_baseline:
+        baselines[profile] = results
+        with open(args.baseline, "w") as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"baseline salva em {args.baseline}")
+        return 0
+
+    regressions = find_regressions(results, baselines.get(profile, {}), args.tolerance)
+    for regression in regressions:
+        print(f"REGRESSÃO {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+import json
+import os
+import subprocess
+import sys
+
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def handler_modules() -> list[str]:
+    # Todos os módulos de handlers.routes.ROUTES, mais o router.
+    from handlers.routes import ROUTES
+
+    return sorted({handler.rpartition(".")[0] for _, _, handler in ROUTES} | {"handlers.router"})
+
+
+HEAVY_PACKAGES = ("boto3", "botocore", "cryptography")
+
+# Teto de módulos novos no sys.modules ao importar cada handler a frio (sem
+# PREWARM), com folga de ~15% sobre a contagem atual. Contar módulos é
+# determinístico; tempo de import varia com a máquina.
+MODULE_BUDGETS = {
+    "handlers.create_pwd": 95,
+    "handlers.create_pwd_batch": 115,
+    "handlers.generate_pwd": 95,
+    "handlers.get_pwd": 90,
+    "handlers.get_pwd_meta": 92,
+    "handlers.health": 60,
+    "handlers.options": 10,
+    "handlers.revoke_pwd": 90,
+    "handlers.router": 70,
+}
+
+_PROBE = """
+import importlib, sys
+before = set(sys.modules)
+importlib.import_module(sys.argv[1])
+loaded = sorted(set(sys.modules) - before)
+import json
+print(json.dumps(loaded))
+"""
+
+
+def imported_modules(module: str) -> list[str]:
+    # Módulos que o import do handler carrega num interpretador limpo.
+    env = {key: value for key, value in os.environ.items() if key != "PREWARM"}
+    result = subprocess.run(
+        [sys.executable, "-c", _PROBE, module],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+def measure_imports(module: str) -> dict[str, tuple[int, int]]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        if not self_us.strip().isdigit():
+            continue
+        timings[name.strip()] = (int(self_us), int(cumulative_us))
+    return timings
+
+
+def heavy_modules(names) -> list[str]:
+    return sorted(name for name in names if name.split(".")[0] in HEAVY_PACKAGES)
+
+
+def main() -> None:
+    print(f"{'handler':<26} {'cumulativo (ms)':>16} {'modulos':>8} {'teto':>5}  pesados")
+    for module in handler_modules():
+        timings = measure_imports(module)
+        cumulative_ms = timings[module][1] / 1000
+        loaded = imported_modules(module)
+        heavy = heavy_modules(loaded)
+        budget = MODULE_BUDGETS.get(module, "-")
+        print(f"{module:<26} {cumulative_ms:>16.1f} {len(loaded):>8} {budget:>5}  {', '.join(heavy) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
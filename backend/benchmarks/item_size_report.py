@@ -0,0 +1,86 @@
+import hashlib
+import math
+import secrets
+from decimal import Decimal
+
+from cryptography.fernet import Fernet
+
+from infra.item_schema import COMPACT_SCHEMA, LEGACY_SCHEMA
+from utils.security import new_token
+
+
+SECRET_LENGTHS = (16, 64, 512, 700, 2048)
+
+
+def _number_size(value) -> int:
+    digits = Decimal(value).normalize().as_tuple().digits
+    return (len(digits) + 1) // 2 + 1
+
+
+def _value_size(value) -> int:
+    if value is True or value is False or value is None:
+        return 1
+    if isinstance(value, (int, float, Decimal)):
+        return _number_size(value)
+    if isinstance(value, str):
+        return len(value.encode())
+    return len(bytes(value))
+
+
+def item_size(stored: dict) -> int:
+    # Regras de tamanho de item do DynamoDB: nome do atributo + valor.
+    return sum(len(name.encode()) + _value_size(value) for name, value in stored.items())
+
+
+def write_units(size: int) -> int:
+    return math.ceil(size / 1024)
+
+
+def read_units(size: int, consistent: bool = True) -> float:
+    units = math.ceil(size / 4096)
+    return units if consistent else units / 2
+
+
+def sample_item(secret_length: int, cipher: Fernet) -> dict:
+    token = new_token(1_700_000_000)
+    return {
+        "token_hash": hashlib.sha256(token.encode()).hexdigest(),
+        "ciphertext": cipher.encrypt(secrets.token_urlsafe(secret_length)[:secret_length].encode()).decode(),
+        "key_id": "k1",
+        "expires_at": 1_700_086_400,
+        "max_views": 5,
+        "views_used": 0,
+        "revoked": False,
+    }
+
+
+def compare(secret_length: int, cipher: Fernet) -> dict:
+    item = sample_item(secret_length, cipher)
+    v1 = item_size(LEGACY_SCHEMA.encode_item(dict(item)))
+    v2 = item_size(COMPACT_SCHEMA.encode_item(item))
+    return {
+        "secret_length": secret_length,
+        "v1_bytes": v1,
+        "v2_bytes": v2,
+        "saved_bytes": v1 - v2,
+        "v1_wcu": write_units(v1),
+        "v2_wcu": write_units(v2),
+        "v1_rcu": read_units(v1),
+        "v2_rcu": read_units(v2),
+    }
+
+
+def main() -> None:
+    cipher = Fernet(Fernet.generate_key())
+    print(f"{'segredo':>8} {'v1 B':>7} {'v2 B':>7} {'economia':>9} {'WCU v1/v2':>10} {'RCU v1/v2':>10}")
+    for length in SECRET_LENGTHS:
+        r = compare(length, cipher)
+        pct = r["saved_bytes"] / r["v1_bytes"] * 100
+        print(
+            f"{length:>8} {r['v1_bytes']:>7} {r['v2_bytes']:>7} {r['saved_bytes']:>5} ({pct:>2.0f}%)"
+            f" {r['v1_wcu']:>4}/{r['v2_wcu']:<5} {r['v1_rcu']:>4}/{r['v2_rcu']:<5}"
+        )
+
+
+if __name__ == "__main__":
+    main()
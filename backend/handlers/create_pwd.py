@@ -1,4 +1,9 @@
 from usecases.create_secret import create_secret
+from infra import prewarm
+from utils import metrics
+
+prewarm.run()
 
 def handler(event, context):
-    return create_secret(event)
\ No newline at end of file
+    with metrics.request("create_pwd"):
+        return create_secret(event)
\ No newline at end of file
@@ -0,0 +1,9 @@
+from usecases.create_secrets_batch import create_secrets_batch
+from infra import prewarm
+from utils import metrics
+
+prewarm.run()
+
+def handler(event, context):
+    with metrics.request("create_pwd_batch"):
+        return create_secrets_batch(event)
\ No newline at end of file
@@ -0,0 +1,9 @@
+from usecases.generate_passwords import generate_passwords
+from infra import prewarm
+from utils import metrics
+
+prewarm.run()
+
+def handler(event, context):
+    with metrics.request("generate_pwd"):
+        return generate_passwords(event)
\ No newline at end of file
@@ -1,4 +1,9 @@
 from usecases.get_secret import get_secret
+from infra import prewarm
+from utils import metrics
+
+prewarm.run()
 
 def handler(event, context):
-    return get_secret(event)
\ No newline at end of file
+    with metrics.request("get_pwd"):
+        return get_secret(event)
\ No newline at end of file
@@ -0,0 +1,9 @@
+from usecases.peek_secret import peek_secret
+from infra import prewarm
+from utils import metrics
+
+prewarm.run()
+
+def handler(event, context):
+    with metrics.request("get_pwd_meta"):
+        return peek_secret(event)
\ No newline at end of file
@@ -1,4 +1,6 @@
-from utils.http import json_response
+from utils.http import constant_response
+
+HEALTH_OK = constant_response(200, {"status": "ok"})
 
 def handler(event, context):
-    return json_response(200, {"status": "ok"})
\ No newline at end of file
+    return HEALTH_OK()
\ No newline at end of file
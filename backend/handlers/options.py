@@ -1,7 +1,7 @@
 CORS_HEADERS = {
     "Access-Control-Allow-Origin": "http://localhost:3000", 
-    "Access-Control-Allow-Headers": "Content-Type,Authorization",
-    "Access-Control-Allow-Methods": "OPTIONS,GET,POST",
+    "Access-Control-Allow-Headers": "Content-Type,Authorization,Idempotency-Key",
+    "Access-Control-Allow-Methods": "OPTIONS,GET,POST,DELETE",
 }
 
 def handler(event, context):
@@ -0,0 +1,9 @@
+from usecases.revoke_secret import revoke_secret
+from infra import prewarm
+from utils import metrics
+
+prewarm.run()
+
+def handler(event, context):
+    with metrics.request("revoke_pwd"):
+        return revoke_secret(event)
\ No newline at end of file
@@ -0,0 +1,40 @@
+from handlers.routes import COMPILED_ROUTES, ROUTES, load_handler, match_route
+from infra import prewarm
+from utils.http import constant_response
+
+# Entrada única do perfil serverless.router.yml: um só pool de containers
+# quentes para todas as rotas HTTP. Só o módulo da rota chamada é importado.
+ROUTE_KEYS = {f"{method} {path}": handler for method, path, handler in ROUTES}
+
+NOT_FOUND = constant_response(404, {"message": "Not Found"})
+
+_handlers = {}
+
+prewarm.run()
+
+
+def resolve(event: dict):
+    spec = ROUTE_KEYS.get(event.get("routeKey"))
+    if spec is not None:
+        return spec
+
+    # Rota $default (ou evento sem routeKey): casa por método + rawPath e
+    # preenche pathParameters, que o API Gateway não extrai nesse caso.
+    http = (event.get("requestContext") or {}).get("http") or {}
+    found = match_route(COMPILED_ROUTES, http.get("method"), event.get("rawPath") or http.get("path") or "")
+    if found is None:
+        return None
+    if found.path_params:
+        event["pathParameters"] = found.path_params
+    return found.route.handler
+
+
+def handler(event, context):
+    spec = resolve(event)
+    if spec is None:
+        return NOT_FOUND()
+
+    route_handler = _handlers.get(spec)
+    if route_handler is None:
+        route_handler = _handlers[spec] = load_handler(spec)
+    return route_handler(event, context)
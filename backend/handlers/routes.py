@@ -0,0 +1,75 @@
+import importlib
+from typing import NamedTuple, Optional, Tuple
+
+# Espelha os eventos httpApi do serverless.yml (tests/test_routes.py garante
+# que os dois não divergem).
+ROUTES = (
+    ("POST", "/pwd", "handlers.create_pwd.handler"),
+    ("OPTIONS", "/pwd", "handlers.options.handler"),
+    ("POST", "/pwd/batch", "handlers.create_pwd_batch.handler"),
+    ("OPTIONS", "/pwd/batch", "handlers.options.handler"),
+    ("POST", "/pwd/generate", "handlers.generate_pwd.handler"),
+    ("OPTIONS", "/pwd/generate", "handlers.options.handler"),
+    ("GET", "/pwd/{pwdId}", "handlers.get_pwd.handler"),
+    ("DELETE", "/pwd/{pwdId}", "handlers.revoke_pwd.handler"),
+    ("OPTIONS", "/pwd/{pwdId}", "handlers.options.handler"),
+    ("GET", "/pwd/{pwdId}/meta", "handlers.get_pwd_meta.handler"),
+    ("GET", "/health", "handlers.health.handler"),
+)
+
+# Casos de uso asyncio equivalentes, usados pelo servidor asyncio (python -m
+# server --mode asyncio). Rotas fora daqui rodam o handler síncrono num pool.
+ASYNC_HANDLERS = {
+    "handlers.create_pwd.handler": "usecases.async_secrets.create_secret_async",
+    "handlers.create_pwd_batch.handler": "usecases.async_secrets.create_secrets_batch_async",
+    "handlers.get_pwd.handler": "usecases.async_secrets.get_secret_async",
+    "handlers.get_pwd_meta.handler": "usecases.async_secrets.peek_secret_async",
+}
+
+
+
+class Route(NamedTuple):
+    method: str
+    path: str
+    handler: str
+    # Segmentos do path; parâmetros ({pwdId}) viram None e o nome vai em params.
+    segments: Tuple[Optional[str], ...]
+    params: Tuple[Tuple[int, str], ...]
+
+
+class Match(NamedTuple):
+    route: Route
+    path_params: Optional[dict]
+
+
+def compile_route(method: str, path: str, handler: str) -> Route:
+    # Sem regex: o import de re custa mais que o roteamento inteiro a frio.
+    parts = path.strip("/").split("/")
+    segments = tuple(None if part.startswith("{") else part for part in parts)
+    params = tuple((i, part[1:-1]) for i, part in enumerate(parts) if part.startswith("{"))
+    return Route(method, path, handler, segments, params)
+
+
+def match_route(routes, method: str, path: str) -> Optional[Match]:
+    # Como no API Gateway, rotas estáticas têm prioridade sobre as com parâmetros.
+    parts = path.strip("/").split("/")
+    candidate = None
+    for route in routes:
+        if route.method != method or len(route.segments) != len(parts):
+            continue
+        if all(expected is None and part or expected == part for expected, part in zip(route.segments, parts)):
+            if not route.params:
+                return Match(route, None)
+            if candidate is None:
+                candidate = route
+    if candidate is None:
+        return None
+    return Match(candidate, {name: parts[i] for i, name in candidate.params})
+
+
+def load_handler(spec: str):
+    module_name, _, attr = spec.rpartition(".")
+    return getattr(importlib.import_module(module_name), attr)
+
+
+COMPILED_ROUTES = tuple(compile_route(*route) for route in ROUTES)
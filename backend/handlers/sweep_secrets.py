@@ -0,0 +1,9 @@
+from usecases.sweep_secrets import sweep_from_env
+from utils import metrics
+
+def handler(event, context):
+    with metrics.request("sweep_secrets"):
+        # As contagens vão no registro EMF da invocação (sweep_found/deleted/failed).
+        # Para antes do timeout e retoma na próxima execução (cursores por segmento).
+        remaining_ms = context.get_remaining_time_in_millis() if context is not None else None
+        return sweep_from_env(remaining_ms)
\ No newline at end of file
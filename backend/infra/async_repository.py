@@ -0,0 +1,84 @@
+import asyncio
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from infra import pwd_repository
+from infra.secret_repository import ConsumeStatus
+from utils import metrics
+
+# boto3 e sqlite3 são bloqueantes: cada chamada vai para um pool de threads
+# dedicado e o event loop fica livre para as demais requisições. O tamanho do
+# pool limita as chamadas simultâneas ao banco (ver DYNAMODB_MAX_POOL_CONNECTIONS).
+DEFAULT_IO_WORKERS = 64
+
+_executor: Optional[ThreadPoolExecutor] = None
+_lock = threading.Lock()
+
+
+def get_io_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                workers = int(os.environ.get("ASYNC_IO_WORKERS", DEFAULT_IO_WORKERS))
+                _executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="io")
+    return _executor
+
+
+def shutdown_io_executor() -> None:
+    global _executor
+    executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=True)
+
+
+def run_blocking(fn, *args):
+    # run_in_executor não copia o contexto (asyncio.to_thread copia): sem
+    # propagate, os spans do worker não chegariam às métricas da requisição.
+    call = metrics.propagate(functools.partial(fn, *args))
+    return asyncio.get_running_loop().run_in_executor(get_io_executor(), call)
+
+
+# Mesmas funções de infra.pwd_repository, resolvidas na chamada para respeitar
+# set_repository e monkeypatch nos testes.
+async def save_secret(item: dict) -> None:
+    await run_blocking(pwd_repository.save_secret, item)
+
+
+async def save_secrets(items: List[dict]) -> List[dict]:
+    return await run_blocking(pwd_repository.save_secrets, items)
+
+
+async def peek_secret(token_hash: str) -> Optional[dict]:
+    return await run_blocking(pwd_repository.peek_secret, token_hash)
+
+
+async def consume_view_and_maybe_delete(token_hash: str) -> Tuple[ConsumeStatus, Dict[str, Any]]:
+    return await run_blocking(pwd_repository.consume_view_and_maybe_delete, token_hash)
+
+
+async def revoke_secret(token_hash: str) -> bool:
+    return await run_blocking(pwd_repository.revoke_secret, token_hash)
+
+
+async def reencrypt_secret(token_hash: str, old_key_id: Optional[str], new_key_id: str, ciphertext: str) -> bool:
+    return await run_blocking(pwd_repository.reencrypt_secret, token_hash, old_key_id, new_key_id, ciphertext)
+
+
+_background = set()
+
+
+def run_in_background(coro) -> asyncio.Task:
+    # Guarda a referência: o loop só mantém referências fracas às tasks.
+    task = asyncio.get_running_loop().create_task(coro)
+    _background.add(task)
+    task.add_done_callback(_background.discard)
+    return task
+
+
+async def wait_background() -> None:
+    if _background:
+        await asyncio.gather(*list(_background), return_exceptions=True)
@@ -1,10 +1,108 @@
 import os
-from cryptography.fernet import Fernet
+from typing import TYPE_CHECKING, Dict, NamedTuple, Optional, Tuple
+
+if TYPE_CHECKING:
+    from cryptography.fernet import Fernet, MultiFernet
+
+
+LEGACY_KEY_ID = "k0"
+
+
+class Keyring(NamedTuple):
+    current_key_id: str
+    ciphers: Dict[str, "Fernet"]
+    multi: "MultiFernet"
+
+
+_keyring = None
+_keyring_config = None
+_metrics = {"hits": 0, "rebuilds": 0}
+
+
+def _key_config() -> str:
+    config = os.environ.get("ENCRYPTION_KEYS")
+    if config:
+        return config
+    legacy = os.environ.get("ENCRYPTION_KEY")
+    if not legacy:
+        raise RuntimeError("ENCRYPTION_KEY não configurada")
+    return f"{LEGACY_KEY_ID}:{legacy}"
+
+
+def _parse_keys(config: str) -> list[tuple[str, str]]:
+    keys = []
+    for entry in config.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        key_id, sep, key = entry.partition(":")
+        if not sep or not key_id or not key:
+            raise RuntimeError("ENCRYPTION_KEYS deve usar o formato id:chave,id:chave")
+        keys.append((key_id.strip(), key.strip()))
+    if not keys:
+        raise RuntimeError("ENCRYPTION_KEYS vazia")
+    return keys
+
+
+def get_keyring() -> Keyring:
+    global _keyring, _keyring_config
+    config = _key_config()
+    if _keyring is not None and config == _keyring_config:
+        _metrics["hits"] += 1
+        return _keyring
+
+    from cryptography.fernet import Fernet, MultiFernet
+
+    keys = _parse_keys(config)
+    ciphers = {key_id: Fernet(key.encode()) for key_id, key in keys}
+    _keyring = Keyring(
+        current_key_id=keys[0][0],
+        ciphers=ciphers,
+        multi=MultiFernet([ciphers[key_id] for key_id, _ in keys]),
+    )
+    _keyring_config = config
+    _metrics["rebuilds"] += 1
+    return _keyring
+
+
+def get_cipher() -> "MultiFernet":
+    return get_keyring().multi
+
+
+def get_cipher_metrics() -> dict:
+    return dict(_metrics)
+
+
+def reset_cipher_cache() -> None:
+    global _keyring, _keyring_config
+    _keyring = None
+    _keyring_config = None
+    _metrics["hits"] = 0
+    _metrics["rebuilds"] = 0
+
+
+def current_key_id() -> str:
+    return get_keyring().current_key_id
+
+
+def needs_reencryption(key_id: Optional[str]) -> bool:
+    return (key_id or LEGACY_KEY_ID) != current_key_id()
+
+
+def encrypt_with_key_id(plain: str) -> Tuple[str, str]:
+    keyring = get_keyring()
+    cipher = keyring.ciphers[keyring.current_key_id]
+    return keyring.current_key_id, cipher.encrypt(plain.encode()).decode()
+
 
 def encrypt(plain: str) -> str:
-    key = os.environ["ENCRYPTION_KEY"].encode()
-    return Fernet(key).encrypt(plain.encode()).decode()
+    return encrypt_with_key_id(plain)[1]
 
-def decrypt(ciphertext: str) -> str:
-    key = os.environ["ENCRYPTION_KEY"].encode()
-    return Fernet(key).decrypt(ciphertext.encode()).decode()
\ No newline at end of file
+def decrypt(ciphertext: str, key_id: Optional[str] = None) -> str:
+    keyring = get_keyring()
+    cipher = keyring.ciphers.get(key_id or LEGACY_KEY_ID)
+    if cipher is None:
+        if key_id:
+            raise RuntimeError(f"Chave de criptografia desconhecida: {key_id}")
+        cipher = keyring.multi
+    return cipher.decrypt(ciphertext.encode()).decode()
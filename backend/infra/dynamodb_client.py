@@ -0,0 +1,152 @@
+from typing import Any, Dict, Optional
+
+
+# Nomes longos (schema v1) e curtos (schema v2, ver infra/item_schema.py).
+NUMBER_ATTRIBUTES = ("expires_at", "max_views", "views_used", "e", "m", "v")
+STRING_ATTRIBUTES = ("token_hash", "ciphertext", "key_id", "k")
+BOOL_ATTRIBUTES = ("revoked", "r")
+BINARY_ATTRIBUTES = ("h", "c")
+
+
+def encode_value(value: Any) -> dict:
+    if value is True or value is False:
+        return {"BOOL": value}
+    if isinstance(value, int):
+        return {"N": str(value)}
+    if isinstance(value, str):
+        return {"S": value}
+    if isinstance(value, (bytes, bytearray)):
+        return {"B": bytes(value)}
+    if value is None:
+        return {"NULL": True}
+    raise TypeError(f"Tipo não suportado no schema: {type(value).__name__}")
+
+
+def decode_value(av: dict) -> Any:
+    if "S" in av:
+        return av["S"]
+    if "N" in av:
+        number = av["N"]
+        return float(number) if "." in number else int(number)
+    if "BOOL" in av:
+        return av["BOOL"]
+    if "B" in av:
+        return av["B"]
+    if "NULL" in av:
+        return None
+    raise TypeError(f"Tipo DynamoDB não suportado: {list(av)}")
+
+
+def encode_item(item: Dict[str, Any]) -> Dict[str, dict]:
+    encoded = {}
+    for name in STRING_ATTRIBUTES:
+        if name in item:
+            encoded[name] = {"S": item[name]}
+    for name in NUMBER_ATTRIBUTES:
+        if name in item:
+            encoded[name] = {"N": str(int(item[name]))}
+    for name in BOOL_ATTRIBUTES:
+        if name in item:
+            encoded[name] = {"BOOL": bool(item[name])}
+    for name in BINARY_ATTRIBUTES:
+        if name in item:
+            encoded[name] = {"B": bytes(item[name])}
+    for name, value in item.items():
+        if name not in encoded:
+            encoded[name] = encode_value(value)
+    return encoded
+
+
+def decode_item(av_map: Optional[Dict[str, dict]]) -> Optional[Dict[str, Any]]:
+    if av_map is None:
+        return None
+    item = {}
+    for name, av in av_map.items():
+        if name in NUMBER_ATTRIBUTES:
+            item[name] = int(av["N"])
+        elif name in STRING_ATTRIBUTES:
+            item[name] = av["S"]
+        elif name in BOOL_ATTRIBUTES:
+            item[name] = av["BOOL"]
+        elif name in BINARY_ATTRIBUTES:
+            item[name] = av["B"]
+        else:
+            item[name] = decode_value(av)
+    return item
+
+
+def _encode_values(values: Optional[Dict[str, Any]]) -> Optional[Dict[str, dict]]:
+    if values is None:
+        return None
+    return {name: encode_value(value) for name, value in values.items()}
+
+
+class ClientTable:
+    def __init__(self, client, table_name: str):
+        self.client = client
+        self.name = table_name
+
+    def _call(self, operation, kwargs: dict) -> dict:
+        kwargs["TableName"] = self.name
+        if "ExpressionAttributeValues" in kwargs:
+            kwargs["ExpressionAttributeValues"] = _encode_values(kwargs["ExpressionAttributeValues"])
+        return operation(**kwargs)
+
+    def put_item(self, Item: dict, **kwargs) -> dict:
+        kwargs["Item"] = encode_item(Item)
+        return self._call(self.client.put_item, kwargs)
+
+    def get_item(self, Key: dict, **kwargs) -> dict:
+        kwargs["Key"] = encode_item(Key)
+        res = self._call(self.client.get_item, kwargs)
+        if "Item" in res:
+            res["Item"] = decode_item(res["Item"])
+        return res
+
+    def update_item(self, Key: dict, **kwargs) -> dict:
+        kwargs["Key"] = encode_item(Key)
+        res = self._call(self.client.update_item, kwargs)
+        if "Attributes" in res:
+            res["Attributes"] = decode_item(res["Attributes"])
+        return res
+
+    def delete_item(self, Key: dict, **kwargs) -> dict:
+        kwargs["Key"] = encode_item(Key)
+        res = self._call(self.client.delete_item, kwargs)
+        if "Attributes" in res:
+            res["Attributes"] = decode_item(res["Attributes"])
+        return res
+
+    def scan(self, **kwargs) -> dict:
+        if "ExclusiveStartKey" in kwargs:
+            kwargs["ExclusiveStartKey"] = encode_item(kwargs["ExclusiveStartKey"])
+        res = self._call(self.client.scan, kwargs)
+        res["Items"] = [decode_item(item) for item in res.get("Items", [])]
+        if "LastEvaluatedKey" in res:
+            res["LastEvaluatedKey"] = decode_item(res["LastEvaluatedKey"])
+        return res
+
+    def batch_write_item(self, RequestItems: dict, **kwargs) -> dict:
+        kwargs["RequestItems"] = {
+            table_name: [_encode_write_request(request) for request in requests]
+            for table_name, requests in RequestItems.items()
+        }
+        res = self.client.batch_write_item(**kwargs)
+        if res.get("UnprocessedItems"):
+            res["UnprocessedItems"] = {
+                table_name: [_decode_write_request(request) for request in requests]
+                for table_name, requests in res["UnprocessedItems"].items()
+            }
+        return res
+
+
+def _encode_write_request(request: dict) -> dict:
+    if "PutRequest" in request:
+        return {"PutRequest": {"Item": encode_item(request["PutRequest"]["Item"])}}
+    return {"DeleteRequest": {"Key": encode_item(request["DeleteRequest"]["Key"])}}
+
+
+def _decode_write_request(request: dict) -> dict:
+    if "PutRequest" in request:
+        return {"PutRequest": {"Item": decode_item(request["PutRequest"]["Item"])}}
+    return {"DeleteRequest": {"Key": decode_item(request["DeleteRequest"]["Key"])}}
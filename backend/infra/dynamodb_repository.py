@@ -0,0 +1,436 @@
+import os
+import random
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from infra.dynamodb_client import ClientTable
+from infra.item_schema import LEGACY_SCHEMA, ItemSchema, get_schema
+from infra.secret_repository import ConsumeStatus, DeadPage, RevokeStatus, SpendCapacity
+from utils import metrics
+from utils.time_utils import now_unix
+
+
+BATCH_WRITE_LIMIT = 25
+BATCH_MAX_ATTEMPTS = 8
+BATCH_BACKOFF_BASE_SECONDS = 0.05
+BATCH_BACKOFF_MAX_SECONDS = 2.0
+PEEK_ATTRIBUTES = ("expires_at", "max_views", "views_used", "revoked")
+
+_dynamodb = None
+_dynamodb_client = None
+_table = None
+
+
+def _boto_kwargs() -> dict:
+    kwargs = {}
+    endpoint_url = os.environ.get("DYNAMODB_ENDPOINT_URL")
+    if endpoint_url:
+        kwargs["endpoint_url"] = endpoint_url
+    # O padrão do botocore (10 conexões) limita o pool de I/O assíncrono.
+    max_pool_connections = os.environ.get("DYNAMODB_MAX_POOL_CONNECTIONS")
+    if max_pool_connections:
+        from botocore.config import Config
+
+        kwargs["config"] = Config(max_pool_connections=int(max_pool_connections))
+    return kwargs
+
+
+def get_dynamodb():
+    global _dynamodb
+    if _dynamodb is None:
+        import boto3
+
+        _dynamodb = boto3.resource("dynamodb", **_boto_kwargs())
+    return _dynamodb
+
+
+def get_dynamodb_client():
+    global _dynamodb_client
+    if _dynamodb_client is None:
+        import boto3
+
+        _dynamodb_client = boto3.client("dynamodb", **_boto_kwargs())
+    return _dynamodb_client
+
+
+def open_table(table_name: str):
+    api = os.environ.get("DYNAMODB_API", "resource")
+    if api == "client":
+        return ClientTable(get_dynamodb_client(), table_name)
+    if api == "resource":
+        return get_dynamodb().Table(table_name)
+    raise RuntimeError(f"DYNAMODB_API inválida: {api}")
+
+
+def get_table():
+    global _table
+    if _table is None:
+        table_name = os.environ.get("TABLE_NAME")
+        if not table_name:
+            raise RuntimeError("TABLE_NAME não configurada")
+        _table = open_table(table_name)
+    return _table
+
+
+def reset_table_cache() -> None:
+    global _dynamodb, _dynamodb_client, _table
+    _dynamodb = None
+    _dynamodb_client = None
+    _table = None
+
+
+# Item existe e ainda pode ser lido; vale para o delete da visualização final e
+# para o incremento.
+VIEWABLE_CONDITION = (
+    "attribute_exists(token_hash) AND views_used < max_views AND expires_at > :now AND "
+    "(attribute_not_exists(revoked) OR revoked = :false)"
+)
+
+
+def _viewable(item: dict) -> bool:
+    return (
+        int(item.get("views_used", 0)) < int(item.get("max_views", 0))
+        and int(item.get("expires_at", 0)) > now_unix()
+        and not item.get("revoked")
+    )
+
+
+def _is_conditional_failure(error) -> bool:
+    return error.response.get("Error", {}).get("Code") == "ConditionalCheckFailedException"
+
+
+def _backoff(attempt: int) -> float:
+    return random.uniform(0, min(BATCH_BACKOFF_MAX_SECONDS, BATCH_BACKOFF_BASE_SECONDS * 2 ** attempt))
+
+
+class DynamoDBSecretRepository:
+    def __init__(self, table, sleep=time.sleep, schema: ItemSchema = LEGACY_SCHEMA):
+        self.table = table
+        self._sleep = sleep
+        self.schema = schema
+
+    def _batch_client(self):
+        if isinstance(self.table, ClientTable):
+            return self.table
+        return self.table.meta.client
+
+    def save(self, item: dict) -> None:
+        with metrics.span("dynamodb_put"):
+            res = self.table.put_item(Item=self.schema.encode_item(item), **metrics.dynamodb_capacity_kwargs())
+        metrics.add_consumed_capacity(res.get("ConsumedCapacity"))
+
+    def _batch_write(self, requests: List[dict]) -> List[dict]:
+        client = self._batch_client()
+        failed: List[dict] = []
+
+        for start in range(0, len(requests), BATCH_WRITE_LIMIT):
+            pending = requests[start:start + BATCH_WRITE_LIMIT]
+            for attempt in range(BATCH_MAX_ATTEMPTS):
+                with metrics.span("dynamodb_batch_write"):
+                    res = client.batch_write_item(
+                        RequestItems={self.table.name: pending},
+                        **metrics.dynamodb_capacity_kwargs(),
+                    )
+                metrics.add_consumed_capacity(res.get("ConsumedCapacity"))
+                pending = res.get("UnprocessedItems", {}).get(self.table.name, [])
+                if not pending:
+                    break
+                self._sleep(_backoff(attempt))
+            failed.extend(pending)
+
+        return failed
+
+    def bulk_save(self, items: List[dict]) -> List[dict]:
+        schema = self.schema
+        failed = self._batch_write([{"PutRequest": {"Item": schema.encode_item(item)}} for item in items])
+        return [schema.decode_item(request["PutRequest"]["Item"]) for request in failed]
+
+    def bulk_delete(self, token_hashes: List[str], spend: Optional[SpendCapacity] = None) -> List[str]:
+        schema = self.schema
+        if spend is not None:
+            # Delete custa ao menos 1 WCU, exista o item ou não.
+            spend(len(token_hashes))
+        failed = self._batch_write([{"DeleteRequest": {"Key": schema.key(h)}} for h in token_hashes])
+        hash_attr = schema.attr("token_hash")
+        return [schema.decode_hash(request["DeleteRequest"]["Key"][hash_attr]) for request in failed]
+
+    def get(self, token_hash: str) -> Optional[dict]:
+        with metrics.span("dynamodb_get"):
+            res = self.table.get_item(Key=self.schema.key(token_hash), **metrics.dynamodb_capacity_kwargs())
+        metrics.add_consumed_capacity(res.get("ConsumedCapacity"))
+        return self.schema.decode_item(res.get("Item"))
+
+    def peek(self, token_hash: str) -> Optional[dict]:
+        with metrics.span("dynamodb_peek"):
+            res = self.table.get_item(
+                Key=self.schema.key(token_hash),
+                ProjectionExpression=", ".join(self.schema.attr(name) for name in PEEK_ATTRIBUTES),
+                ConsistentRead=False,
+                **metrics.dynamodb_capacity_kwargs(),
+            )
+        metrics.add_consumed_capacity(res.get("ConsumedCapacity"))
+        return self.schema.decode_item(res.get("Item"))
+
+    def consume(self, token_hash: str) -> Tuple[ConsumeStatus, Dict[str, Any]]:
+        # A visualização final é um único delete condicional com ALL_OLD. Sem
+        # saber views_used antes, tenta como final quando max_views = 1 (o
+        # padrão); nos demais a falha devolve o item e ele decide o próximo passo.
+        item, current = self._delete_final_view(token_hash, "max_views = :one", {":one": 1})
+        if item is not None:
+            return "consumed_and_deleted", item
+        if current is None:
+            return "not_found", {}
+        if not _viewable(current):
+            return "not_allowed", {}
+
+        views_used = int(current["views_used"])
+        if views_used + 1 >= int(current["max_views"]):
+            item, _ = self._delete_final_view(token_hash, "views_used = :seen", {":seen": views_used})
+            if item is not None:
+                return "consumed_and_deleted", item
+            # Outra leitura passou na frente: o incremento condicional decide.
+        return self._add_view(token_hash)
+
+    def _delete_final_view(
+        self, token_hash: str, condition: str, values: dict
+    ) -> Tuple[Optional[dict], Optional[dict]]:
+        # (item consumido, None) se apagou; senão (None, item atual ou None se não existe).
+        from botocore.exceptions import ClientError
+        from infra.dynamodb_client import decode_item
+
+        try:
+            with metrics.span("dynamodb_delete"):
+                res = self.table.delete_item(
+                    Key=self.schema.key(token_hash),
+                    ConditionExpression=self.schema.expr(f"{VIEWABLE_CONDITION} AND {condition}"),
+                    ExpressionAttributeValues={":now": now_unix(), ":false": False, **values},
+                    ReturnValues="ALL_OLD",
+                    ReturnValuesOnConditionCheckFailure="ALL_OLD",
+                    **metrics.dynamodb_capacity_kwargs(),
+                )
+        except ClientError as e:
+            metrics.add_consumed_capacity(e.response.get("ConsumedCapacity"))
+            if not _is_conditional_failure(e):
+                raise
+            # ALL_OLD vem como AttributeValue cru, tanto no resource quanto no client.
+            stored = e.response.get("Item")
+            return None, self.schema.decode_item(decode_item(stored)) if stored else None
+
+        metrics.add_consumed_capacity(res.get("ConsumedCapacity"))
+        item = self.schema.decode_item(res.get("Attributes")) or {}
+        item["views_used"] = int(item.get("views_used", 0)) + 1
+        return item, None
+
+    def _add_view(self, token_hash: str) -> Tuple[ConsumeStatus, Dict[str, Any]]:
+        from botocore.exceptions import ClientError
+
+        try:
+            with metrics.span("dynamodb_update"):
+                res = self.table.update_item(
+                    Key=self.schema.key(token_hash),
+                    UpdateExpression=self.schema.expr("SET views_used = views_used + :one"),
+                    ConditionExpression=self.schema.expr(VIEWABLE_CONDITION),
+                    ExpressionAttributeValues={
+                        ":one": 1,
+                        ":now": now_unix(),
+                        ":false": False,
+                    },
+                    ReturnValues="ALL_NEW",
+                    ReturnValuesOnConditionCheckFailure="ALL_OLD",
+                    **metrics.dynamodb_capacity_kwargs(),
+                )
+        except ClientError as e:
+            metrics.add_consumed_capacity(e.response.get("ConsumedCapacity"))
+            if _is_conditional_failure(e):
+                # ALL_OLD devolve o item que falhou na condição; sem item, o token não existe.
+                if e.response.get("Item"):
+                    return "not_allowed", {}
+                return "not_found", {}
+            raise
+
+        metrics.add_consumed_capacity(res.get("ConsumedCapacity"))
+        item = self.schema.decode_item(res.get("Attributes")) or {}
+        views_used = int(item.get("views_used", 0))
+        max_views = int(item.get("max_views", 0))
+
+        if max_views > 0 and views_used >= max_views:
+            # Só numa corrida com outra leitura entre o delete e o incremento.
+            self._delete_exhausted(token_hash)
+            return "consumed_and_deleted", item
+
+        return "consumed", item
+
+    def _delete_exhausted(self, token_hash: str) -> None:
+        from botocore.exceptions import ClientError
+
+        try:
+            with metrics.span("dynamodb_delete"):
+                res = self.table.delete_item(
+                    Key=self.schema.key(token_hash),
+                    ConditionExpression=self.schema.expr("views_used >= max_views"),
+                    **metrics.dynamodb_capacity_kwargs(),
+                )
+        except ClientError as e:
+            if not _is_conditional_failure(e):
+                raise
+            return
+        metrics.add_consumed_capacity(res.get("ConsumedCapacity"))
+
+    def revoke(self, token_hash: str) -> bool:
+        from botocore.exceptions import ClientError
+
+        try:
+            self.table.update_item(
+                Key=self.schema.key(token_hash),
+                UpdateExpression=self.schema.expr("SET revoked = :true"),
+                ConditionExpression=self.schema.expr("attribute_exists(token_hash)"),
+                ExpressionAttributeValues={":true": True},
+            )
+        except ClientError as e:
+            if _is_conditional_failure(e):
+                return False
+            raise
+        return True
+
+    def revoke_with_token(self, token_hash: str, revoke_hash: str) -> RevokeStatus:
+        from botocore.exceptions import ClientError
+
+        kwargs = {
+            "Key": self.schema.key(token_hash),
+            "ConditionExpression": self.schema.expr("attribute_exists(token_hash) AND revoke_hash = :revoke_hash"),
+            "ReturnValuesOnConditionCheckFailure": "ALL_OLD",
+            **metrics.dynamodb_capacity_kwargs(),
+        }
+        try:
+            with metrics.span("dynamodb_delete"):
+                res = self.table.delete_item(ExpressionAttributeValues={":revoke_hash": revoke_hash}, **kwargs)
+        except ClientError as e:
+            if _is_conditional_failure(e):
+                return "forbidden" if e.response.get("Item") else "not_found"
+            delete_error = e
+        else:
+            metrics.add_consumed_capacity(res.get("ConsumedCapacity"))
+            return "deleted"
+
+        # O delete falhou por outro motivo (throttling, timeout): marca o item
+        # como revogado, que o consume já respeita; o sweeper apaga depois.
+        try:
+            with metrics.span("dynamodb_update"):
+                res = self.table.update_item(
+                    UpdateExpression=self.schema.expr("SET revoked = :true"),
+                    ExpressionAttributeValues={":revoke_hash": revoke_hash, ":true": True},
+                    **kwargs,
+                )
+        except ClientError as e:
+            if _is_conditional_failure(e):
+                return "forbidden" if e.response.get("Item") else "not_found"
+            raise e from delete_error
+        metrics.add_consumed_capacity(res.get("ConsumedCapacity"))
+        return "revoked"
+
+    def reencrypt(self, token_hash: str, old_key_id: Optional[str], new_key_id: str, ciphertext: str) -> bool:
+        from botocore.exceptions import ClientError
+
+        if old_key_id:
+            key_condition = "key_id = :old_key_id"
+            values = {":old_key_id": old_key_id}
+        else:
+            key_condition = "attribute_not_exists(key_id)"
+            values = {}
+
+        expr = self.schema.expr
+        try:
+            self.table.update_item(
+                Key=self.schema.key(token_hash),
+                UpdateExpression=expr("SET ciphertext = :ciphertext, key_id = :new_key_id"),
+                ConditionExpression=expr(
+                    f"attribute_exists(token_hash) AND {key_condition} AND views_used < max_views"
+                ),
+                ExpressionAttributeValues={
+                    ":ciphertext": self.schema.encode_ciphertext(ciphertext),
+                    ":new_key_id": new_key_id,
+                    **values,
+                },
+            )
+        except ClientError as e:
+            # Condição falhou: outra leitura já recriptografou ou o item sumiu.
+            if _is_conditional_failure(e):
+                return False
+            raise
+        return True
+
+    def iter_live_token_hashes(self) -> Iterator[str]:
+        kwargs = {
+            "ProjectionExpression": self.schema.attr("token_hash"),
+            "FilterExpression": self.schema.expr("expires_at > :now AND views_used < max_views"),
+            "ExpressionAttributeValues": {":now": now_unix()},
+        }
+        return self._scan_token_hashes(kwargs)
+
+    def iter_dead_token_hashes(
+        self,
+        segment: int = 0,
+        total_segments: int = 1,
+        page_size: int = 1000,
+        spend: Optional[SpendCapacity] = None,
+    ) -> Iterator[str]:
+        for token_hashes, _ in self.iter_dead_pages(segment, total_segments, page_size, spend):
+            yield from token_hashes
+
+    def iter_dead_pages(
+        self,
+        segment: int = 0,
+        total_segments: int = 1,
+        page_size: int = 1000,
+        spend: Optional[SpendCapacity] = None,
+        cursor: Optional[str] = None,
+    ) -> Iterator[DeadPage]:
+        kwargs = {
+            "ProjectionExpression": self.schema.attr("token_hash"),
+            "FilterExpression": self.schema.expr("expires_at <= :now OR views_used >= max_views OR revoked = :true"),
+            "ExpressionAttributeValues": {":now": now_unix(), ":true": True},
+            "Limit": page_size,
+        }
+        if total_segments > 1:
+            kwargs["Segment"] = segment
+            kwargs["TotalSegments"] = total_segments
+        if cursor is not None:
+            # A tabela só tem chave de partição: o LastEvaluatedKey é o próprio hash.
+            kwargs["ExclusiveStartKey"] = self.schema.key(cursor)
+        return self._scan_pages(kwargs, spend)
+
+    def _scan_token_hashes(self, kwargs: dict, spend: Optional[SpendCapacity] = None) -> Iterator[str]:
+        for token_hashes, _ in self._scan_pages(kwargs, spend):
+            yield from token_hashes
+
+    def _scan_pages(self, kwargs: dict, spend: Optional[SpendCapacity] = None) -> Iterator[DeadPage]:
+        hash_attr = self.schema.attr("token_hash")
+        if spend is not None:
+            kwargs["ReturnConsumedCapacity"] = "TOTAL"
+        else:
+            kwargs.update(metrics.dynamodb_capacity_kwargs())
+        while True:
+            with metrics.span("dynamodb_scan"):
+                res = self.table.scan(**kwargs)
+            consumed = res.get("ConsumedCapacity")
+            metrics.add_consumed_capacity(consumed)
+            if spend is not None and consumed:
+                # O Scan cobra pelo que leu, não pelo que passou no filtro:
+                # paga a página lida antes de pedir a próxima.
+                spend(float(consumed.get("CapacityUnits", 0)))
+            token_hashes = [self.schema.decode_hash(item[hash_attr]) for item in res.get("Items", [])]
+            last_key = res.get("LastEvaluatedKey")
+            yield token_hashes, self.schema.decode_hash(last_key[hash_attr]) if last_key else None
+            if not last_key:
+                return
+            kwargs["ExclusiveStartKey"] = last_key
+
+def build_repository():
+    repository = DynamoDBSecretRepository(get_table(), schema=get_schema(os.environ.get("TABLE_SCHEMA", "v1")))
+    legacy_table_name = os.environ.get("LEGACY_TABLE_NAME")
+    if legacy_table_name:
+        from infra.migrating_repository import MigratingSecretRepository
+
+        legacy = DynamoDBSecretRepository(open_table(legacy_table_name), schema=LEGACY_SCHEMA)
+        return MigratingSecretRepository(repository, legacy)
+    return repository
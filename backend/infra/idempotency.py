@@ -0,0 +1,259 @@
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, NamedTuple, Optional, Protocol
+
+from utils import metrics
+
+
+DEFAULT_TTL_SECONDS = 15 * 60
+# Validade do claim enquanto o segredo ainda está sendo gravado: maior que o
+# timeout da Lambda, para um container que morreu no meio não travar a chave.
+DEFAULT_LEASE_SECONDS = 60
+DEFAULT_CACHE_SIZE = 1024
+DEFAULT_STORE_SIZE = 50_000
+
+
+class IdempotencyUnavailable(Exception):
+    # Store inacessível (tabela ausente, throttling, permissão): o POST segue
+    # sem deduplicação em vez de falhar.
+    pass
+
+
+class IdempotencyRecord(NamedTuple):
+    fingerprint: str
+    token_hash: str
+    # Corpo da resposta original cifrado (contém o pwdId em claro); vazio no
+    # claim, preenchido só no complete().
+    key_id: str
+    response: str
+    expires_at: int
+    # False enquanto o dono do claim não confirmou a gravação do segredo.
+    completed: bool = False
+
+
+class IdempotencyStore(Protocol):
+    # Grava se a chave não existe (ou expirou); senão devolve o registro atual.
+    def put_if_absent(self, key: str, record: IdempotencyRecord, now: int) -> Optional[IdempotencyRecord]: ...
+
+    # Troca o claim pelo registro concluído, se ainda for do mesmo dono.
+    def complete(self, key: str, record: IdempotencyRecord) -> None: ...
+
+    def delete(self, key: str) -> None: ...
+
+
+class InMemoryIdempotencyStore:
+    def __init__(self, max_records: int = DEFAULT_STORE_SIZE):
+        self.max_records = max_records
+        self.records: "OrderedDict[str, IdempotencyRecord]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _evict(self, now: int) -> None:
+        # Ordem de inserção ~ ordem de expiração (TTL único): vencidos saem pela
+        # frente; acima do limite, sai o mais antigo mesmo que ainda válido.
+        records = self.records
+        while records:
+            oldest = next(iter(records.values()))
+            if oldest.expires_at > now and len(records) <= self.max_records:
+                break
+            records.popitem(last=False)
+
+    def put_if_absent(self, key: str, record: IdempotencyRecord, now: int) -> Optional[IdempotencyRecord]:
+        with self._lock:
+            existing = self.records.get(key)
+            if existing is not None and existing.expires_at > now:
+                return existing
+            self.records.pop(key, None)
+            self.records[key] = record
+            self._evict(now)
+        return None
+
+    def complete(self, key: str, record: IdempotencyRecord) -> None:
+        with self._lock:
+            existing = self.records.get(key)
+            if existing is not None and existing.token_hash == record.token_hash:
+                self.records[key] = record
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self.records.pop(key, None)
+
+
+def _unavailable(error: Exception) -> IdempotencyUnavailable:
+    # ClientError traz o código do DynamoDB; BotoCoreError (timeout, conexão) não.
+    code = getattr(error, "response", {}).get("Error", {}).get("Code") or type(error).__name__
+    return IdempotencyUnavailable(code)
+
+
+class DynamoDBIdempotencyStore:
+    # Tabela com chave idempotency_key (S) e TTL em expires_at. O TTL do
+    # DynamoDB apaga com atraso, por isso a condição também aceita sobrescrever
+    # registros já vencidos.
+    def __init__(self, table):
+        self.table = table
+
+    def put_if_absent(self, key: str, record: IdempotencyRecord, now: int) -> Optional[IdempotencyRecord]:
+        from botocore.exceptions import BotoCoreError, ClientError
+        from infra.dynamodb_client import decode_item
+        from infra.dynamodb_repository import _is_conditional_failure
+
+        try:
+            with metrics.span("dynamodb_idempotency"):
+                res = self.table.put_item(
+                    Item={"idempotency_key": key, **record._asdict()},
+                    ConditionExpression="attribute_not_exists(idempotency_key) OR expires_at <= :now",
+                    ExpressionAttributeValues={":now": now},
+                    ReturnValuesOnConditionCheckFailure="ALL_OLD",
+                    **metrics.dynamodb_capacity_kwargs(),
+                )
+        except ClientError as e:
+            if not _is_conditional_failure(e):
+                raise _unavailable(e) from e
+            # ALL_OLD vem como AttributeValue cru, tanto no resource quanto no client.
+            if e.response.get("Item"):
+                return _record(decode_item(e.response["Item"]))
+            try:
+                item = self.table.get_item(Key={"idempotency_key": key}, ConsistentRead=True).get("Item")
+            except (ClientError, BotoCoreError) as get_error:
+                raise _unavailable(get_error) from get_error
+            return _record(item) if item else None
+        except BotoCoreError as e:
+            raise _unavailable(e) from e
+        metrics.add_consumed_capacity(res.get("ConsumedCapacity"))
+        return None
+
+    def complete(self, key: str, record: IdempotencyRecord) -> None:
+        from botocore.exceptions import BotoCoreError, ClientError
+        from infra.dynamodb_repository import _is_conditional_failure
+
+        try:
+            with metrics.span("dynamodb_idempotency"):
+                res = self.table.put_item(
+                    Item={"idempotency_key": key, **record._asdict()},
+                    ConditionExpression="token_hash = :token_hash",
+                    ExpressionAttributeValues={":token_hash": record.token_hash},
+                    **metrics.dynamodb_capacity_kwargs(),
+                )
+        except ClientError as e:
+            if _is_conditional_failure(e):
+                return  # o claim venceu e outro container assumiu a chave
+            raise _unavailable(e) from e
+        except BotoCoreError as e:
+            raise _unavailable(e) from e
+        metrics.add_consumed_capacity(res.get("ConsumedCapacity"))
+
+    def delete(self, key: str) -> None:
+        from botocore.exceptions import BotoCoreError, ClientError
+
+        try:
+            self.table.delete_item(Key={"idempotency_key": key})
+        except (ClientError, BotoCoreError) as e:
+            raise _unavailable(e) from e
+
+
+def _record(item: dict) -> IdempotencyRecord:
+    return IdempotencyRecord(
+        fingerprint=item["fingerprint"],
+        token_hash=item["token_hash"],
+        key_id=item["key_id"],
+        response=item["response"],
+        expires_at=int(item["expires_at"]),
+        completed=bool(item.get("completed", False)),
+    )
+
+
+class Idempotency:
+    # LRU local na frente do store: retentativas que caem no mesmo container
+    # respondem sem ir ao DynamoDB.
+    def __init__(
+        self,
+        store: IdempotencyStore,
+        ttl_seconds: int = DEFAULT_TTL_SECONDS,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+        clock: Callable[[], float] = time.time,
+        lease_seconds: int = DEFAULT_LEASE_SECONDS,
+    ):
+        self.store = store
+        self.ttl_seconds = ttl_seconds
+        self.lease_seconds = lease_seconds
+        self.cache_size = cache_size
+        self.clock = clock
+        self.cache: "OrderedDict[str, IdempotencyRecord]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def now(self) -> int:
+        return int(self.clock())
+
+    def lookup(self, key: str) -> Optional[IdempotencyRecord]:
+        with self._lock:
+            record = self.cache.get(key)
+            if record is None:
+                return None
+            if record.expires_at <= self.now():
+                del self.cache[key]
+                return None
+            self.cache.move_to_end(key)
+            return record
+
+    def _remember(self, key: str, record: IdempotencyRecord) -> None:
+        with self._lock:
+            self.cache[key] = record
+            self.cache.move_to_end(key)
+            if len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+
+    def claim(self, key: str, record: IdempotencyRecord) -> Optional[IdempotencyRecord]:
+        # None: a chave é nossa. Senão: registro de quem chegou antes, que
+        # pode ainda estar gravando (completed False). Só concluídos vão ao LRU.
+        existing = self.store.put_if_absent(key, record, self.now())
+        if existing is not None and existing.completed:
+            self._remember(key, existing)
+        return existing
+
+    def complete(self, key: str, record: IdempotencyRecord) -> IdempotencyRecord:
+        completed = record._replace(completed=True, expires_at=self.now() + self.ttl_seconds)
+        self.store.complete(key, completed)
+        self._remember(key, completed)
+        return completed
+
+    def release(self, key: str) -> None:
+        # Best effort: roda no caminho de erro e não pode esconder a exceção
+        # original. Se falhar, o claim vence sozinho em lease_seconds.
+        with self._lock:
+            self.cache.pop(key, None)
+        try:
+            self.store.delete(key)
+        except Exception as e:
+            print(f"idempotency: falha ao liberar a chave: {e!r}", file=sys.stderr)
+
+
+_idempotency = None
+
+
+def get_idempotency() -> Idempotency:
+    global _idempotency
+    if _idempotency is None:
+        backend = os.environ.get("IDEMPOTENCY_STORE", "memory")
+        if backend == "memory":
+            store = InMemoryIdempotencyStore()
+        elif backend == "dynamodb":
+            from infra.dynamodb_repository import open_table
+
+            store = DynamoDBIdempotencyStore(open_table(os.environ.get("IDEMPOTENCY_TABLE", "secure-idempotency")))
+        else:
+            raise RuntimeError(f"IDEMPOTENCY_STORE inválido: {backend}")
+
+        _idempotency = Idempotency(
+            store,
+            ttl_seconds=int(os.environ.get("IDEMPOTENCY_TTL_SECONDS", DEFAULT_TTL_SECONDS)),
+            cache_size=int(os.environ.get("IDEMPOTENCY_CACHE_SIZE", DEFAULT_CACHE_SIZE)),
+            lease_seconds=int(os.environ.get("IDEMPOTENCY_LEASE_SECONDS", DEFAULT_LEASE_SECONDS)),
+        )
+    return _idempotency
+
+
+def reset_idempotency() -> None:
+    global _idempotency
+    _idempotency = None
@@ -0,0 +1,129 @@
+import base64
+import re
+from decimal import Decimal
+from typing import Any, Dict, Optional
+
+
+LOGICAL_ATTRIBUTES = (
+    "token_hash", "ciphertext", "key_id", "expires_at", "max_views", "views_used", "revoked", "revoke_hash",
+)
+
+
+def _plain_value(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return int(value) if value % 1 == 0 else float(value)
+    return value
+
+
+class ItemSchema:
+    # v1: nomes longos, token_hash em hex e ciphertext como token Fernet base64.
+    version = "v1"
+    names = {name: name for name in LOGICAL_ATTRIBUTES}
+
+    def __init__(self):
+        self._expressions: Dict[str, str] = {}
+        renames = {logical: physical for logical, physical in self.names.items() if logical != physical}
+        self._pattern = (
+            re.compile(r"(?<![:#\w])(" + "|".join(renames) + r")\b") if renames else None
+        )
+        self._renames = renames
+
+    def expr(self, expression: str) -> str:
+        cached = self._expressions.get(expression)
+        if cached is None:
+            cached = expression
+            if self._pattern is not None:
+                cached = self._pattern.sub(lambda m: self._renames[m.group(1)], expression)
+            self._expressions[expression] = cached
+        return cached
+
+    def attr(self, logical: str) -> str:
+        return self.names[logical]
+
+    def key(self, token_hash: str) -> dict:
+        return {self.names["token_hash"]: self.encode_hash(token_hash)}
+
+    def encode_hash(self, token_hash: str) -> Any:
+        return token_hash
+
+    def decode_hash(self, stored: Any) -> str:
+        return stored
+
+    def encode_ciphertext(self, ciphertext: str) -> Any:
+        return ciphertext
+
+    def encode_item(self, item: dict) -> dict:
+        return item
+
+    def decode_item(self, stored: Optional[dict]) -> Optional[dict]:
+        if not stored:
+            return stored
+        for name, value in stored.items():
+            stored[name] = _plain_value(value)
+        return stored
+
+
+class CompactItemSchema(ItemSchema):
+    # v2: chave com os 32 bytes do SHA-256 (tipo B), ciphertext Fernet em
+    # binário cru e nomes de atributo de uma letra. Exige tabela própria,
+    # já que o tipo da chave muda.
+    version = "v2"
+    names = {
+        "token_hash": "h",
+        "ciphertext": "c",
+        "key_id": "k",
+        "expires_at": "e",
+        "max_views": "m",
+        "views_used": "v",
+        "revoked": "r",
+        "revoke_hash": "t",
+    }
+
+    def __init__(self):
+        super().__init__()
+        self._logical = {physical: logical for logical, physical in self.names.items()}
+
+    def encode_hash(self, token_hash: str) -> bytes:
+        return bytes.fromhex(token_hash)
+
+    def decode_hash(self, stored: Any) -> str:
+        return bytes(getattr(stored, "value", stored)).hex()
+
+    def encode_ciphertext(self, ciphertext: str) -> bytes:
+        return base64.urlsafe_b64decode(ciphertext)
+
+    def encode_item(self, item: dict) -> dict:
+        stored = {}
+        for logical, value in item.items():
+            if logical == "token_hash":
+                value = self.encode_hash(value)
+            elif logical == "ciphertext":
+                value = self.encode_ciphertext(value)
+            stored[self.names.get(logical, logical)] = value
+        return stored
+
+    def decode_item(self, stored: Optional[dict]) -> Optional[dict]:
+        if not stored:
+            return stored
+        item = {}
+        for physical, value in stored.items():
+            logical = self._logical.get(physical, physical)
+            if logical == "token_hash":
+                value = self.decode_hash(value)
+            elif logical == "ciphertext":
+                value = base64.urlsafe_b64encode(bytes(getattr(value, "value", value))).decode()
+            else:
+                value = _plain_value(value)
+            item[logical] = value
+        return item
+
+
+LEGACY_SCHEMA = ItemSchema()
+COMPACT_SCHEMA = CompactItemSchema()
+SCHEMAS = {schema.version: schema for schema in (LEGACY_SCHEMA, COMPACT_SCHEMA)}
+
+
+def get_schema(version: str) -> ItemSchema:
+    if version not in SCHEMAS:
+        raise RuntimeError(f"TABLE_SCHEMA inválido: {version}")
+    return SCHEMAS[version]
@@ -0,0 +1,102 @@
+from itertools import chain
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from infra.secret_repository import ConsumeStatus, DeadPage, RevokeStatus, SecretRepository, SpendCapacity
+
+
+class MigratingSecretRepository:
+    # Escritas vão só para o esquema novo; leituras caem no legado quando o
+    # token não existe no novo. O legado esvazia sozinho via TTL e sweeper.
+    def __init__(self, primary: SecretRepository, legacy: SecretRepository):
+        self.primary = primary
+        self.legacy = legacy
+        # Tabela de onde o sweeper leu cada hash morto, até ele ser apagado.
+        self._scanned_from: Dict[str, SecretRepository] = {}
+
+    def save(self, item: dict) -> None:
+        self.primary.save(item)
+
+    def bulk_save(self, items: List[dict]) -> List[dict]:
+        return self.primary.bulk_save(items)
+
+    def bulk_delete(self, token_hashes: List[str], spend: Optional[SpendCapacity] = None) -> List[str]:
+        # Hash vindo do scan é apagado só na tabela onde foi lido; origem
+        # desconhecida vai para as duas (cada uma cobra suas próprias WCUs).
+        by_table: Dict[int, Tuple[SecretRepository, List[str]]] = {}
+        for token_hash in token_hashes:
+            origin = self._scanned_from.pop(token_hash, None)
+            for table in (origin,) if origin is not None else (self.primary, self.legacy):
+                by_table.setdefault(id(table), (table, []))[1].append(token_hash)
+        failed = set()
+        for table, hashes in by_table.values():
+            failed.update(table.bulk_delete(hashes, spend))
+        return [token_hash for token_hash in token_hashes if token_hash in failed]
+
+    def get(self, token_hash: str) -> Optional[dict]:
+        item = self.primary.get(token_hash)
+        return item if item is not None else self.legacy.get(token_hash)
+
+    def peek(self, token_hash: str) -> Optional[dict]:
+        item = self.primary.peek(token_hash)
+        return item if item is not None else self.legacy.peek(token_hash)
+
+    def consume(self, token_hash: str) -> Tuple[ConsumeStatus, Dict[str, Any]]:
+        status, item = self.primary.consume(token_hash)
+        if status == "not_found":
+            return self.legacy.consume(token_hash)
+        return status, item
+
+    def revoke(self, token_hash: str) -> bool:
+        return self.primary.revoke(token_hash) or self.legacy.revoke(token_hash)
+
+    def revoke_with_token(self, token_hash: str, revoke_hash: str) -> RevokeStatus:
+        status = self.primary.revoke_with_token(token_hash, revoke_hash)
+        if status == "not_found":
+            return self.legacy.revoke_with_token(token_hash, revoke_hash)
+        return status
+
+    def reencrypt(self, token_hash: str, old_key_id: Optional[str], new_key_id: str, ciphertext: str) -> bool:
+        return (
+            self.primary.reencrypt(token_hash, old_key_id, new_key_id, ciphertext)
+            or self.legacy.reencrypt(token_hash, old_key_id, new_key_id, ciphertext)
+        )
+
+    def iter_live_token_hashes(self) -> Iterator[str]:
+        return chain(self.primary.iter_live_token_hashes(), self.legacy.iter_live_token_hashes())
+
+    def iter_dead_token_hashes(
+        self,
+        segment: int = 0,
+        total_segments: int = 1,
+        page_size: int = 1000,
+        spend: Optional[SpendCapacity] = None,
+    ) -> Iterator[str]:
+        for token_hashes, _ in self.iter_dead_pages(segment, total_segments, page_size, spend):
+            yield from token_hashes
+
+    def iter_dead_pages(
+        self,
+        segment: int = 0,
+        total_segments: int = 1,
+        page_size: int = 1000,
+        spend: Optional[SpendCapacity] = None,
+        cursor: Optional[str] = None,
+    ) -> Iterator[DeadPage]:
+        # Varre o novo e depois o legado; o cursor diz em qual tabela parou
+        # ("primary:<hash>", "legacy:" para começar o legado, "legacy:<hash>").
+        table_name, _, inner = (cursor or "primary:").partition(":")
+        tables = [("primary", self.primary), ("legacy", self.legacy)]
+        if table_name == "legacy":
+            tables = tables[1:]
+        for position, (name, table) in enumerate(tables):
+            pages = table.iter_dead_pages(segment, total_segments, page_size, spend, inner or None)
+            inner = ""
+            for token_hashes, next_cursor in pages:
+                for token_hash in token_hashes:
+                    self._scanned_from[token_hash] = table
+                if next_cursor is not None:
+                    yield token_hashes, f"{name}:{next_cursor}"
+                elif position + 1 < len(tables):
+                    yield token_hashes, f"{tables[position + 1][0]}:"
+                else:
+                    yield token_hashes, None
@@ -1,29 +1,255 @@
-import secrets
+import math
+import os
+import threading
+from functools import lru_cache
+from typing import List, NamedTuple, Tuple
 
 LETTERS = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ"
 DIGITS = "0123456789"
 PUNCTUATION = "!@#$%^&*()-_=+[]{};:,.<>?"
+AMBIGUOUS = "Il1O0o"
+
+MIN_LENGTH = 8
+MAX_LENGTH = 128
+ENTROPY_CHUNK_BYTES = 4096
+MIN_WORDS = 3
+MAX_WORDS = 20
+CAPITALIZE_MODES = ("none", "title", "random")
+POLICY_CACHE_SIZE = 256
+
+
+class PasswordPolicy:
+    __slots__ = ("use_letters", "use_digits", "use_punctuation", "length", "include", "exclude")
+
+    def __init__(
+        self,
+        use_letters: bool = True,
+        use_digits: bool = True,
+        use_punctuation: bool = True,
+        length: int = 16,
+        include: str = "",
+        exclude: str = "",
+    ):
+        set_ = object.__setattr__
+        set_(self, "use_letters", bool(use_letters))
+        set_(self, "use_digits", bool(use_digits))
+        set_(self, "use_punctuation", bool(use_punctuation))
+        set_(self, "length", int(length))
+        set_(self, "include", "".join(sorted(set(include))))
+        set_(self, "exclude", "".join(sorted(set(exclude))))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("PasswordPolicy é imutável")
+
+    def _key(self) -> tuple:
+        return (self.use_letters, self.use_digits, self.use_punctuation, self.length, self.include, self.exclude)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, PasswordPolicy) and self._key() == other._key()
+
+    def __hash__(self) -> int:
+        return hash(self._key())
+
+    def __repr__(self) -> str:
+        return "PasswordPolicy(%r, %r, %r, %r, include=%r, exclude=%r)" % self._key()
+
+    def compile(self) -> "CompiledPolicy":
+        return compile_policy(self)
+
+    def entropy_bits(self) -> float:
+        return compile_policy(self).entropy_bits
 
-def generate_password(use_letters: bool, use_digits: bool, use_punctuation: bool, length: int) -> str:
-    if length < 8 or length > 128:
-        raise ValueError("pass_length deve estar entre 8 e 128")
 
+class CompiledPolicy(NamedTuple):
+    length: int
+    pools: Tuple[str, ...]
+    alphabet: str
+    alphabet_table: tuple
+    pool_tables: Tuple[tuple, ...]
+    entropy_bits: float
+
+
+@lru_cache(maxsize=POLICY_CACHE_SIZE)
+def compile_policy(policy: PasswordPolicy) -> CompiledPolicy:
+    if policy.length < MIN_LENGTH or policy.length > MAX_LENGTH:
+        raise ValueError(f"pass_length deve estar entre {MIN_LENGTH} e {MAX_LENGTH}")
+    if not all(" " < c < "\x7f" for c in policy.include):
+        raise ValueError("pass_include aceita apenas caracteres ASCII imprimíveis")
+
+    excluded = set(policy.exclude)
     pools: list[str] = []
-    if use_letters:
-        pools.append(LETTERS)
-    if use_digits:
-        pools.append(DIGITS)
-    if use_punctuation:
-        pools.append(PUNCTUATION)
+    for enabled, pool in ((policy.use_letters, LETTERS), (policy.use_digits, DIGITS), (policy.use_punctuation, PUNCTUATION)):
+        if enabled:
+            pool = "".join(c for c in pool if c not in excluded)
+            if not pool:
+                raise ValueError("pass_exclude remove todos os caracteres de um dos tipos selecionados")
+            pools.append(pool)
+
+    # include vira um grupo próprio (com um caractere garantido), sem repetir
+    # o que já está no alfabeto para não enviesar a amostragem.
+    seen = set("".join(pools))
+    extra = "".join(c for c in policy.include if c not in seen and c not in excluded)
+    if extra:
+        pools.append(extra)
 
     if not pools:
         raise ValueError("Selecione ao menos um tipo de caractere")
-
-    password_chars = [secrets.choice(pool) for pool in pools]
+    if len(pools) > policy.length:
+        raise ValueError("pass_length menor que o número de grupos de caracteres")
 
     alphabet = "".join(pools)
-    while len(password_chars) < length:
-        password_chars.append(secrets.choice(alphabet))
+    return CompiledPolicy(
+        length=policy.length,
+        pools=tuple(pools),
+        alphabet=alphabet,
+        alphabet_table=_translation(alphabet),
+        pool_tables=tuple(_translation(pool) for pool in pools),
+        entropy_bits=policy.length * math.log2(len(alphabet)),
+    )
+
+
+class PassphrasePolicy(NamedTuple):
+    words: int = 6
+    separator: str = "-"
+    capitalize: str = "none"
+    include_digit: bool = False
+
+    def validate(self) -> None:
+        if self.words < MIN_WORDS or self.words > MAX_WORDS:
+            raise ValueError(f"pass_words deve estar entre {MIN_WORDS} e {MAX_WORDS}")
+        if self.capitalize not in CAPITALIZE_MODES:
+            raise ValueError(f"pass_capitalize deve ser um de: {', '.join(CAPITALIZE_MODES)}")
+        if len(self.separator) > 3:
+            raise ValueError("pass_separator deve ter no máximo 3 caracteres")
+
+    def entropy_bits(self, wordlist_size: int) -> float:
+        bits = self.words * math.log2(wordlist_size)
+        if self.capitalize == "random":
+            bits += self.words
+        if self.include_digit:
+            bits += math.log2(len(DIGITS) * self.words)
+        return bits
+
+
+class _EntropyBuffer:
+    # Lê os.urandom em blocos grandes. Descarta o buffer após fork para que
+    # processos filhos nunca reutilizem os mesmos bytes do pai.
+    def __init__(self, chunk_bytes: int = ENTROPY_CHUNK_BYTES):
+        self.chunk_bytes = chunk_bytes
+        self.data = b""
+        self.pos = 0
+        self.pid = os.getpid()
+
+    def take(self, n: int) -> bytes:
+        if self.pid != os.getpid():
+            self.data, self.pos, self.pid = b"", 0, os.getpid()
+        if self.pos + n > len(self.data):
+            self.data = self.data[self.pos:] + os.urandom(max(n, self.chunk_bytes))
+            self.pos = 0
+        start = self.pos
+        self.pos += n
+        return self.data[start:self.pos]
+
+
+_local = threading.local()
+
+
+def _entropy() -> _EntropyBuffer:
+    buffer = getattr(_local, "entropy", None)
+    if buffer is None:
+        buffer = _local.entropy = _EntropyBuffer()
+    return buffer
+
+
+def _translation(alphabet: str):
+    # Amostragem por rejeição em C: bytes < limit viram alphabet[b % n],
+    # os demais são descartados por bytes.translate.
+    n = len(alphabet)
+    limit = 256 - 256 % n
+    encoded = alphabet.encode("ascii")
+    table = bytes(encoded[b % n] if b < limit else 0 for b in range(256))
+    return table, bytes(range(limit, 256)), limit
+
+
+def _draw(entropy: _EntropyBuffer, translation: tuple, count: int) -> str:
+    table, rejected, limit = translation
+    out = b""
+    while len(out) < count:
+        missing = count - len(out)
+        out += entropy.take(missing * 256 // limit + 8).translate(table, rejected)
+    return out[:count].decode("ascii")
+
+
+def _indices(entropy: _EntropyBuffer, n: int, count: int) -> List[int]:
+    # Índices uniformes em [0, n) para n <= 65536, com rejeição sobre uint16.
+    limit = 65536 - 65536 % n
+    out: List[int] = []
+    while len(out) < count:
+        missing = count - len(out)
+        raw = memoryview(entropy.take((missing * 65536 // limit + 4) * 2)).cast("H")
+        out.extend(v % n for v in raw if v < limit)
+    return out[:count]
+
+
+def _below(entropy: _EntropyBuffer, n: int) -> int:
+    limit = 256 - 256 % n
+    while True:
+        b = entropy.take(1)[0]
+        if b < limit:
+            return b % n
+
+
+def generate_passwords(policy: PasswordPolicy, count: int) -> List[str]:
+    compiled = compile_policy(policy)
+    length = compiled.length
+    entropy = _entropy()
+
+    fillers = _draw(entropy, compiled.alphabet_table, count * length)
+    required = [_draw(entropy, table, count) for table in compiled.pool_tables]
+
+    passwords = []
+    for i in range(count):
+        chars = list(fillers[i * length:(i + 1) * length])
+        # Fisher-Yates parcial (esparso) sobre as posições: cada caractere
+        # obrigatório cai numa posição uniforme e distinta. Como os demais são
+        # i.i.d., isso equivale a embaralhar a senha inteira.
+        swapped = {}
+        for k, pool_chars in enumerate(required):
+            last = length - 1 - k
+            j = _below(entropy, last + 1)
+            chosen = swapped.get(j, j)
+            swapped[j] = swapped.get(last, last)
+            chars[chosen] = pool_chars[i]
+        passwords.append("".join(chars))
+    return passwords
+
+
+def generate_password(use_letters: bool, use_digits: bool, use_punctuation: bool, length: int) -> str:
+    return generate_passwords(PasswordPolicy(use_letters, use_digits, use_punctuation, length), 1)[0]
+
+
+def generate_passphrases(policy: PassphrasePolicy, count: int) -> List[str]:
+    from infra.wordlist import get_wordlist
+
+    policy.validate()
+    wordlist = get_wordlist()
+    entropy = _entropy()
+    n = policy.words
+    indices = _indices(entropy, len(wordlist), count * n)
 
-    secrets.SystemRandom().shuffle(password_chars)
-    return "".join(password_chars)
\ No newline at end of file
+    passphrases = []
+    for i in range(count):
+        words = [wordlist[index] for index in indices[i * n:(i + 1) * n]]
+        if policy.capitalize == "title":
+            words = [word.capitalize() for word in words]
+        elif policy.capitalize == "random":
+            flips = entropy.take((n + 7) // 8)
+            words = [
+                word.capitalize() if flips[k >> 3] & (1 << (k & 7)) else word
+                for k, word in enumerate(words)
+            ]
+        if policy.include_digit:
+            k = _below(entropy, n)
+            words[k] += DIGITS[_below(entropy, len(DIGITS))]
+        passphrases.append(policy.separator.join(words))
+    return passphrases
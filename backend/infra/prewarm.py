@@ -0,0 +1,89 @@
+import os
+import sys
+import time
+
+from utils import metrics
+
+# Trabalho feito no INIT da Lambda (import do handler), antes da primeira
+# requisição: cada função escolhe as etapas em PREWARM, ex. "cipher,dynamodb".
+STEPS = ("cipher", "dynamodb", "rate_limiter", "token_filter", "wordlist")
+# SHA-256 inexistente, válido nos schemas v1 (hex) e v2 (bytes).
+PREWARM_TOKEN_HASH = "0" * 64
+
+_done = False
+
+
+def _cipher() -> None:
+    from infra.crypto_service import get_cipher
+
+    # A primeira cifragem também carrega os caminhos do OpenSSL.
+    cipher = get_cipher()
+    cipher.decrypt(cipher.encrypt(b"prewarm"))
+
+
+def _dynamodb() -> None:
+    from infra.pwd_repository import get_repository
+
+    # GetItem numa chave inexistente: cria o client, resolve o endpoint e deixa
+    # uma conexão TLS aberta no pool (0,5 RCU).
+    get_repository().peek(PREWARM_TOKEN_HASH)
+
+
+def _rate_limiter() -> None:
+    from infra.rate_limiter import get_rate_limiter
+
+    get_rate_limiter()
+
+
+def _token_filter() -> None:
+    from infra.token_filter import get_token_filter
+
+    token_filter = get_token_filter()
+    if token_filter is not None:
+        token_filter.refresh()
+
+
+def _wordlist() -> None:
+    from infra.wordlist import get_wordlist
+
+    wordlist = get_wordlist()
+    wordlist[len(wordlist) - 1]
+
+
+_STEP_FUNCTIONS = {
+    "cipher": _cipher,
+    "dynamodb": _dynamodb,
+    "rate_limiter": _rate_limiter,
+    "token_filter": _token_filter,
+    "wordlist": _wordlist,
+}
+
+
+def configured_steps() -> list:
+    names = [name.strip() for name in os.environ.get("PREWARM", "").split(",") if name.strip()]
+    unknown = [name for name in names if name not in _STEP_FUNCTIONS]
+    if unknown:
+        raise RuntimeError(f"PREWARM inválido: {', '.join(unknown)} (opções: {', '.join(STEPS)})")
+    return names
+
+
+def run() -> None:
+    # Idempotente: no router, cada handler importado depois também chama run().
+    global _done
+    if _done:
+        return
+    _done = True
+
+    for name in configured_steps():
+        start = time.perf_counter()
+        try:
+            _STEP_FUNCTIONS[name]()
+        except Exception as e:
+            # Falha no aquecimento não derruba o INIT; a requisição refaz o trabalho.
+            print(f"prewarm {name} falhou: {e!r}", file=sys.stderr)
+        metrics.add_init_stage(f"prewarm_{name}", (time.perf_counter() - start) * 1000)
+
+
+def reset() -> None:
+    global _done
+    _done = False
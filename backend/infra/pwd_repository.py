@@ -1,79 +1,88 @@
 import os
-from typing import Literal, Tuple, Dict, Any, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
-import boto3
-from botocore.exceptions import ClientError
+from infra.secret_repository import ConsumeStatus, DeadPage, RevokeStatus, SecretRepository, SpendCapacity
 
-from utils.time_utils import now_unix
 
+_repository = None
 
-_dynamodb = boto3.resource("dynamodb")
-_table = None
 
+def get_repository() -> SecretRepository:
+    global _repository
+    if _repository is None:
+        backend = os.environ.get("PWD_BACKEND", "dynamodb")
+        if backend == "dynamodb":
+            from infra.dynamodb_repository import build_repository
 
-def get_table():
-    global _table
-    if _table is None:
-        table_name = os.environ.get("TABLE_NAME")
-        if not table_name:
-            raise RuntimeError("TABLE_NAME não configurada")
-        _table = _dynamodb.Table(table_name)
-    return _table
+            _repository = build_repository()
+        elif backend == "sqlite":
+            from infra.sqlite_repository import SQLiteSecretRepository
+
+            _repository = SQLiteSecretRepository(os.environ.get("SQLITE_PATH", "secrets.db"))
+        else:
+            raise RuntimeError(f"PWD_BACKEND inválido: {backend}")
+    return _repository
+
+
+def set_repository(repository: Optional[SecretRepository]) -> None:
+    global _repository
+    _repository = repository
 
 
 def save_secret(item: dict) -> None:
-    table = get_table()
-    table.put_item(Item=item)
+    get_repository().save(item)
+
+
+def save_secrets(items: List[dict]) -> List[dict]:
+    return get_repository().bulk_save(items)
+
+
+def delete_secrets(token_hashes: List[str], spend: Optional[SpendCapacity] = None) -> List[str]:
+    return get_repository().bulk_delete(token_hashes, spend)
 
 
 def get_secret(token_hash: str) -> Optional[dict]:
-    table = get_table()
-    res = table.get_item(Key={"token_hash": token_hash})
-    return res.get("Item")
+    return get_repository().get(token_hash)
 
 
-ConsumeStatus = Literal[
-    "consumed",
-    "consumed_and_deleted",
-    "not_allowed",
-    "not_found",
-]
+def peek_secret(token_hash: str) -> Optional[dict]:
+    return get_repository().peek(token_hash)
 
 
 def consume_view_and_maybe_delete(token_hash: str) -> Tuple[ConsumeStatus, Dict[str, Any]]:
-    table = get_table()
-
-    item = table.get_item(Key={"token_hash": token_hash}).get("Item")
-    if not item:
-        return "not_found", {}
-
-    try:
-        res = table.update_item(
-            Key={"token_hash": token_hash},
-            UpdateExpression="SET views_used = views_used + :one",
-            ConditionExpression=(
-                "views_used < max_views AND expires_at > :now AND "
-                "(attribute_not_exists(revoked) OR revoked = :false)"
-            ),
-            ExpressionAttributeValues={
-                ":one": 1,
-                ":now": now_unix(),
-                ":false": False,
-            },
-            ReturnValues="ALL_NEW",
-        )
-
-        item = res.get("Attributes") or {}
-        views_used = int(item.get("views_used", 0))
-        max_views = int(item.get("max_views", 0))
-
-        if max_views > 0 and views_used >= max_views:
-            table.delete_item(Key={"token_hash": token_hash})
-            return "consumed_and_deleted", item
-
-        return "consumed", item
-
-    except ClientError as e:
-        if e.response.get("Error", {}).get("Code") == "ConditionalCheckFailedException":
-            return "not_allowed", {}
-        raise
\ No newline at end of file
+    return get_repository().consume(token_hash)
+
+
+def revoke_secret(token_hash: str) -> bool:
+    return get_repository().revoke(token_hash)
+
+
+def revoke_secret_with_token(token_hash: str, revoke_hash: str) -> RevokeStatus:
+    return get_repository().revoke_with_token(token_hash, revoke_hash)
+
+
+def reencrypt_secret(token_hash: str, old_key_id: Optional[str], new_key_id: str, ciphertext: str) -> bool:
+    return get_repository().reencrypt(token_hash, old_key_id, new_key_id, ciphertext)
+
+
+def iter_live_token_hashes() -> Iterator[str]:
+    return get_repository().iter_live_token_hashes()
+
+
+def iter_dead_token_hashes(
+    segment: int = 0,
+    total_segments: int = 1,
+    page_size: int = 1000,
+    spend: Optional[SpendCapacity] = None,
+) -> Iterator[str]:
+    return get_repository().iter_dead_token_hashes(segment, total_segments, page_size, spend)
+
+
+def iter_dead_pages(
+    segment: int = 0,
+    total_segments: int = 1,
+    page_size: int = 1000,
+    spend: Optional[SpendCapacity] = None,
+    cursor: Optional[str] = None,
+) -> Iterator[DeadPage]:
+    return get_repository().iter_dead_pages(segment, total_segments, page_size, spend, cursor)
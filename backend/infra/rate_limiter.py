@@ -0,0 +1,150 @@
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, NamedTuple, Optional, Protocol
+
+from utils import metrics
+
+
+DEFAULT_MAX_KEYS = 50_000
+
+
+class Limit(NamedTuple):
+    capacity: int
+    refill_per_second: float
+
+
+class RateLimitStore(Protocol):
+    # Retorna 0.0 se liberado, senão os segundos até a próxima ficha.
+    def acquire(self, key: str, limit: Limit, now: float) -> float: ...
+
+
+class InMemoryRateLimitStore:
+    def __init__(self, max_keys: int = DEFAULT_MAX_KEYS):
+        self.max_keys = max_keys
+        self.buckets: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def acquire(self, key: str, limit: Limit, now: float) -> float:
+        with self._lock:
+            tokens, updated_at = self.buckets.pop(key, (limit.capacity, now))
+            tokens = min(limit.capacity, tokens + (now - updated_at) * limit.refill_per_second)
+            if tokens >= 1:
+                tokens -= 1
+                retry_after = 0.0
+            else:
+                retry_after = (1 - tokens) / limit.refill_per_second
+            self.buckets[key] = (tokens, now)
+            if len(self.buckets) > self.max_keys:
+                self.buckets.popitem(last=False)
+        return retry_after
+
+
+class DynamoDBRateLimitStore:
+    # Contador atômico por janela fixa: uma janela de capacity/refill segundos
+    # com até capacity requisições aproxima o balde de fichas com um único
+    # UpdateItem. Negações ficam em cache local (LRU) até o fim da janela.
+    def __init__(self, table, max_keys: int = DEFAULT_MAX_KEYS):
+        self.table = table
+        self.max_keys = max_keys
+        self.blocked: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def acquire(self, key: str, limit: Limit, now: float) -> float:
+        from botocore.exceptions import BotoCoreError, ClientError
+
+        window = max(1, math.ceil(limit.capacity / limit.refill_per_second))
+        window_start = int(now // window) * window
+        window_end = window_start + window
+
+        with self._lock:
+            blocked_until = self.blocked.get(key)
+            if blocked_until is not None:
+                if blocked_until > now:
+                    return blocked_until - now
+                del self.blocked[key]
+
+        try:
+            with metrics.span("dynamodb_rate_limit"):
+                res = self.table.update_item(
+                    Key={"bucket_key": f"{key}#{window_start}"},
+                    UpdateExpression="SET expires_at = :expires_at ADD hits :one",
+                    ExpressionAttributeValues={":one": 1, ":expires_at": window_end + window},
+                    ReturnValues="ALL_NEW",
+                    **metrics.dynamodb_capacity_kwargs(),
+                )
+        except (ClientError, BotoCoreError):
+            # Falha no limitador (inclusive timeout/conexão) não derruba a leitura de segredos.
+            return 0.0
+        metrics.add_consumed_capacity(res.get("ConsumedCapacity"))
+
+        if int(res["Attributes"]["hits"]) <= limit.capacity:
+            return 0.0
+        with self._lock:
+            self.blocked[key] = window_end
+            self.blocked.move_to_end(key)
+            if len(self.blocked) > self.max_keys:
+                self.blocked.popitem(last=False)
+        return window_end - now
+
+
+class RateLimiter:
+    def __init__(
+        self,
+        store: RateLimitStore,
+        ip_limit: Limit,
+        token_limit: Limit,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.store = store
+        self.ip_limit = ip_limit
+        self.token_limit = token_limit
+        self.clock = clock
+
+    def check(self, source_ip: Optional[str], token_hash: str) -> float:
+        now = self.clock()
+        if source_ip:
+            retry_after = self.store.acquire(f"ip#{source_ip}", self.ip_limit, now)
+            if retry_after:
+                return retry_after
+        return self.store.acquire(f"token#{token_hash}", self.token_limit, now)
+
+
+def _limit(prefix: str, capacity: int, refill_per_second: float) -> Limit:
+    return Limit(
+        int(os.environ.get(f"{prefix}_CAPACITY", capacity)),
+        float(os.environ.get(f"{prefix}_REFILL_PER_SECOND", refill_per_second)),
+    )
+
+
+_rate_limiter = None
+
+
+def get_rate_limiter() -> Optional[RateLimiter]:
+    global _rate_limiter
+    if os.environ.get("RATE_LIMIT_ENABLED", "").lower() not in ("1", "true"):
+        return None
+    if _rate_limiter is None:
+        backend = os.environ.get("RATE_LIMIT_STORE", "memory")
+        if backend == "memory":
+            store = InMemoryRateLimitStore()
+        elif backend == "dynamodb":
+            from infra.dynamodb_repository import open_table
+
+            store = DynamoDBRateLimitStore(open_table(os.environ.get("RATE_LIMIT_TABLE", "secure-rate-limits")))
+        else:
+            raise RuntimeError(f"RATE_LIMIT_STORE inválido: {backend}")
+
+        _rate_limiter = RateLimiter(
+            store,
+            ip_limit=_limit("RATE_LIMIT_IP", 30, 1.0),
+            token_limit=_limit("RATE_LIMIT_TOKEN", 5, 0.1),
+        )
+    return _rate_limiter
+
+
+def reset_rate_limiter() -> None:
+    global _rate_limiter
+    _rate_limiter = None
@@ -0,0 +1,63 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable
+
+
+DEFAULT_TTL_SECONDS = 10 * 60
+DEFAULT_CACHE_SIZE = 4096
+
+
+class RevokedCache:
+    # Hashes revogados recentemente neste container: novas tentativas de
+    # leitura respondem 410 sem ir ao DynamoDB. Tokens nunca são reutilizados,
+    # então o TTL só limita quanto tempo a entrada ocupa memória.
+    def __init__(
+        self,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.cache_size = cache_size
+        self.clock = clock
+        self.entries: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, token_hash: str) -> None:
+        with self._lock:
+            self.entries[token_hash] = self.clock() + self.ttl_seconds
+            self.entries.move_to_end(token_hash)
+            if len(self.entries) > self.cache_size:
+                self.entries.popitem(last=False)
+
+    def __contains__(self, token_hash: str) -> bool:
+        if not self.entries:
+            return False
+        with self._lock:
+            expires_at = self.entries.get(token_hash)
+            if expires_at is None:
+                return False
+            if expires_at <= self.clock():
+                del self.entries[token_hash]
+                return False
+            return True
+
+
+_revoked_cache = None
+
+
+def get_revoked_cache() -> RevokedCache:
+    global _revoked_cache
+    if _revoked_cache is None:
+        _revoked_cache = RevokedCache(
+            ttl_seconds=float(os.environ.get("REVOKED_CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS)),
+            cache_size=int(os.environ.get("REVOKED_CACHE_SIZE", DEFAULT_CACHE_SIZE)),
+        )
+    return _revoked_cache
+
+
+def reset_revoked_cache() -> None:
+    global _revoked_cache
+    _revoked_cache = None
@@ -0,0 +1,63 @@
+from typing import Any, Callable, Dict, Iterator, List, Literal, Optional, Protocol, Tuple
+
+
+ConsumeStatus = Literal[
+    "consumed",
+    "consumed_and_deleted",
+    "not_allowed",
+    "not_found",
+]
+
+RevokeStatus = Literal[
+    "deleted",
+    "revoked",
+    "forbidden",
+    "not_found",
+]
+
+# Recebe as unidades de capacidade (RCU/WCU) de uma operação em lote; o
+# sweeper usa para respeitar o budget de leitura e escrita da tabela.
+SpendCapacity = Callable[[float], None]
+
+# Uma página do scan de mortos: os hashes e o cursor para continuar depois
+# dela (None quando o segmento terminou).
+DeadPage = Tuple[List[str], Optional[str]]
+
+
+class SecretRepository(Protocol):
+    def save(self, item: dict) -> None: ...
+
+    def bulk_save(self, items: List[dict]) -> List[dict]: ...
+
+    def bulk_delete(self, token_hashes: List[str], spend: Optional[SpendCapacity] = None) -> List[str]: ...
+
+    def get(self, token_hash: str) -> Optional[dict]: ...
+
+    def peek(self, token_hash: str) -> Optional[dict]: ...
+
+    def consume(self, token_hash: str) -> Tuple[ConsumeStatus, Dict[str, Any]]: ...
+
+    def revoke(self, token_hash: str) -> bool: ...
+
+    def revoke_with_token(self, token_hash: str, revoke_hash: str) -> RevokeStatus: ...
+
+    def reencrypt(self, token_hash: str, old_key_id: Optional[str], new_key_id: str, ciphertext: str) -> bool: ...
+
+    def iter_live_token_hashes(self) -> Iterator[str]: ...
+
+    def iter_dead_token_hashes(
+        self,
+        segment: int = 0,
+        total_segments: int = 1,
+        page_size: int = 1000,
+        spend: Optional[SpendCapacity] = None,
+    ) -> Iterator[str]: ...
+
+    def iter_dead_pages(
+        self,
+        segment: int = 0,
+        total_segments: int = 1,
+        page_size: int = 1000,
+        spend: Optional[SpendCapacity] = None,
+        cursor: Optional[str] = None,
+    ) -> Iterator[DeadPage]: ...
@@ -0,0 +1,217 @@
+import sqlite3
+import threading
+import zlib
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from infra.secret_repository import ConsumeStatus, DeadPage, RevokeStatus, SpendCapacity
+from utils.time_utils import now_unix
+
+
+COLUMNS = ("token_hash", "ciphertext", "key_id", "expires_at", "max_views", "views_used", "revoked", "revoke_hash")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS secrets (
+    token_hash TEXT PRIMARY KEY,
+    ciphertext TEXT NOT NULL,
+    key_id TEXT,
+    expires_at INTEGER NOT NULL,
+    max_views INTEGER NOT NULL,
+    views_used INTEGER NOT NULL DEFAULT 0,
+    revoked INTEGER NOT NULL DEFAULT 0,
+    revoke_hash TEXT
+) WITHOUT ROWID
+"""
+
+_INSERT = (
+    f"INSERT OR REPLACE INTO secrets ({', '.join(COLUMNS)}) "
+    f"VALUES ({', '.join('?' for _ in COLUMNS)})"
+)
+
+
+def _row_to_item(row) -> Dict[str, Any]:
+    item = dict(zip(COLUMNS, row))
+    item["revoked"] = bool(item["revoked"])
+    for optional in ("key_id", "revoke_hash"):
+        if item[optional] is None:
+            del item[optional]
+    return item
+
+
+def _item_to_row(item: dict) -> tuple:
+    return (
+        item["token_hash"],
+        item["ciphertext"],
+        item.get("key_id"),
+        int(item["expires_at"]),
+        int(item["max_views"]),
+        int(item.get("views_used", 0)),
+        int(bool(item.get("revoked", False))),
+        item.get("revoke_hash"),
+    )
+
+
+def _add_revoke_hash_column(conn: sqlite3.Connection) -> None:
+    # Bancos criados antes da revogação por token não têm a coluna.
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(secrets)")}
+    if "revoke_hash" not in columns:
+        try:
+            conn.execute("ALTER TABLE secrets ADD COLUMN revoke_hash TEXT")
+        except sqlite3.OperationalError:
+            pass  # outra thread/processo adicionou antes
+
+
+class SQLiteSecretRepository:
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._connect()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, isolation_level=None, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(_SCHEMA)
+            _add_revoke_hash_column(conn)
+            self._local.conn = conn
+        return conn
+
+    def save(self, item: dict) -> None:
+        self._connect().execute(_INSERT, _item_to_row(item))
+
+    def bulk_save(self, items: List[dict]) -> List[dict]:
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(_INSERT, [_item_to_row(item) for item in items])
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        return []
+
+    def get(self, token_hash: str) -> Optional[dict]:
+        row = self._connect().execute(
+            f"SELECT {', '.join(COLUMNS)} FROM secrets WHERE token_hash = ?",
+            (token_hash,),
+        ).fetchone()
+        return _row_to_item(row) if row else None
+
+    def peek(self, token_hash: str) -> Optional[dict]:
+        row = self._connect().execute(
+            "SELECT expires_at, max_views, views_used, revoked FROM secrets WHERE token_hash = ?",
+            (token_hash,),
+        ).fetchone()
+        if row is None:
+            return None
+        return {"expires_at": row[0], "max_views": row[1], "views_used": row[2], "revoked": bool(row[3])}
+
+    def consume(self, token_hash: str) -> Tuple[ConsumeStatus, Dict[str, Any]]:
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "UPDATE secrets SET views_used = views_used + 1 "
+                "WHERE token_hash = ? AND views_used < max_views AND expires_at > ? AND revoked = 0 "
+                f"RETURNING {', '.join(COLUMNS)}",
+                (token_hash, now_unix()),
+            ).fetchone()
+
+            if row is None:
+                exists = conn.execute(
+                    "SELECT 1 FROM secrets WHERE token_hash = ?", (token_hash,)
+                ).fetchone()
+                status: ConsumeStatus = "not_allowed" if exists else "not_found"
+                item: Dict[str, Any] = {}
+            else:
+                item = _row_to_item(row)
+                status = "consumed"
+                if item["max_views"] > 0 and item["views_used"] >= item["max_views"]:
+                    conn.execute("DELETE FROM secrets WHERE token_hash = ?", (token_hash,))
+                    status = "consumed_and_deleted"
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        return status, item
+
+    def revoke(self, token_hash: str) -> bool:
+        cur = self._connect().execute(
+            "UPDATE secrets SET revoked = 1 WHERE token_hash = ?", (token_hash,)
+        )
+        return cur.rowcount > 0
+
+    def revoke_with_token(self, token_hash: str, revoke_hash: str) -> RevokeStatus:
+        conn = self._connect()
+        cur = conn.execute(
+            "DELETE FROM secrets WHERE token_hash = ? AND revoke_hash = ?", (token_hash, revoke_hash)
+        )
+        if cur.rowcount > 0:
+            return "deleted"
+        exists = conn.execute("SELECT 1 FROM secrets WHERE token_hash = ?", (token_hash,)).fetchone()
+        return "forbidden" if exists else "not_found"
+
+    def reencrypt(self, token_hash: str, old_key_id: Optional[str], new_key_id: str, ciphertext: str) -> bool:
+        cur = self._connect().execute(
+            "UPDATE secrets SET ciphertext = ?, key_id = ? "
+            "WHERE token_hash = ? AND key_id IS ? AND views_used < max_views",
+            (ciphertext, new_key_id, token_hash, old_key_id),
+        )
+        return cur.rowcount > 0
+
+    def iter_live_token_hashes(self) -> Iterator[str]:
+        cur = self._connect().execute(
+            "SELECT token_hash FROM secrets WHERE expires_at > ? AND views_used < max_views AND revoked = 0",
+            (now_unix(),),
+        )
+        for (token_hash,) in cur:
+            yield token_hash
+
+    def bulk_delete(self, token_hashes: List[str], spend: Optional[SpendCapacity] = None) -> List[str]:
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany("DELETE FROM secrets WHERE token_hash = ?", [(h,) for h in token_hashes])
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        return []
+
+    def iter_dead_token_hashes(
+        self,
+        segment: int = 0,
+        total_segments: int = 1,
+        page_size: int = 1000,
+        spend: Optional[SpendCapacity] = None,
+    ) -> Iterator[str]:
+        for token_hashes, _ in self.iter_dead_pages(segment, total_segments, page_size, spend):
+            yield from token_hashes
+
+    def iter_dead_pages(
+        self,
+        segment: int = 0,
+        total_segments: int = 1,
+        page_size: int = 1000,
+        spend: Optional[SpendCapacity] = None,
+        cursor: Optional[str] = None,
+    ) -> Iterator[DeadPage]:
+        # SQLite não tem capacidade provisionada: spend é ignorado (aqui e no bulk_delete).
+        # Páginas em ordem de token_hash; o cursor é o último hash lido.
+        conn = self._connect()
+        while True:
+            rows = conn.execute(
+                "SELECT token_hash FROM secrets"
+                " WHERE (expires_at <= ? OR views_used >= max_views OR revoked = 1) AND token_hash > ?"
+                " ORDER BY token_hash LIMIT ?",
+                (now_unix(), cursor or "", page_size),
+            ).fetchall()
+            cursor = rows[-1][0] if len(rows) == page_size else None
+            yield [
+                token_hash
+                for (token_hash,) in rows
+                if total_segments == 1 or zlib.crc32(token_hash.encode()) % total_segments == segment
+            ], cursor
+            if cursor is None:
+                return
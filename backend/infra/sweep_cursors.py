@@ -0,0 +1,68 @@
+import os
+import threading
+from typing import Dict, Optional, Protocol
+
+
+class SweepCursorStore(Protocol):
+    # Onde cada segmento do sweeper parou (cursor opaco do repositório); None
+    # recomeça o scan do início.
+    def load(self, key: str) -> Optional[str]: ...
+
+    def save(self, key: str, cursor: Optional[str]) -> None: ...
+
+
+class InMemorySweepCursorStore:
+    def __init__(self):
+        self.cursors: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def load(self, key: str) -> Optional[str]:
+        with self._lock:
+            return self.cursors.get(key)
+
+    def save(self, key: str, cursor: Optional[str]) -> None:
+        with self._lock:
+            if cursor is None:
+                self.cursors.pop(key, None)
+            else:
+                self.cursors[key] = cursor
+
+
+class DynamoDBSweepCursorStore:
+    # Tabela com chave cursor_key (S); um item por segmento enquanto a
+    # varredura não termina.
+    def __init__(self, table):
+        self.table = table
+
+    def load(self, key: str) -> Optional[str]:
+        item = self.table.get_item(Key={"cursor_key": key}, ConsistentRead=True).get("Item")
+        return item["cursor"] if item else None
+
+    def save(self, key: str, cursor: Optional[str]) -> None:
+        if cursor is None:
+            self.table.delete_item(Key={"cursor_key": key})
+        else:
+            self.table.put_item(Item={"cursor_key": key, "cursor": cursor})
+
+
+_store = None
+
+
+def get_cursor_store() -> SweepCursorStore:
+    global _store
+    if _store is None:
+        backend = os.environ.get("SWEEP_CURSOR_STORE", "memory")
+        if backend == "memory":
+            _store = InMemorySweepCursorStore()
+        elif backend == "dynamodb":
+            from infra.dynamodb_repository import open_table
+
+            _store = DynamoDBSweepCursorStore(open_table(os.environ.get("SWEEP_CURSOR_TABLE", "secure-sweep-cursors")))
+        else:
+            raise RuntimeError(f"SWEEP_CURSOR_STORE inválido: {backend}")
+    return _store
+
+
+def reset_cursor_store() -> None:
+    global _store
+    _store = None
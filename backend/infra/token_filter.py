@@ -0,0 +1,206 @@
+import math
+import os
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Callable, Iterable, Optional
+
+
+DEFAULT_FP_RATE = 0.01
+DEFAULT_MAX_BYTES = 8 * 1024 * 1024
+DEFAULT_REFRESH_SECONDS = 300
+REFRESH_RETRY_SECONDS = 30
+MIN_CAPACITY = 1024
+CAPACITY_HEADROOM = 1.25
+# Scan é eventualmente consistente: itens gravados pouco antes do início do
+# snapshot podem não aparecer nele, então só confiamos no filtro para tokens
+# criados antes dessa margem.
+SNAPSHOT_SAFETY_SECONDS = 10
+CLOCK_SKEW_SECONDS = 60
+MAX_HASHES = 16
+# pwdIds no formato antigo (43 chars) não têm data autenticada e sempre
+# vão à tabela, então quem quiser contornar o filtro só precisa sondar nesse
+# formato. A partir desta data eles passam a ser recusados direto.
+DEFAULT_LEGACY_UNTIL = "2027-01-01"
+
+
+def _parse_date(value: str) -> float:
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+class BloomFilter:
+    __slots__ = ("size_bits", "num_hashes", "bits")
+
+    def __init__(self, size_bits: int, num_hashes: int):
+        self.size_bits = max(8, size_bits)
+        self.num_hashes = num_hashes
+        self.bits = bytearray((self.size_bits + 7) // 8)
+
+    @classmethod
+    def for_capacity(cls, capacity: int, fp_rate: float, max_bytes: int) -> "BloomFilter":
+        capacity = max(capacity, 1)
+        size_bits = math.ceil(-capacity * math.log(fp_rate) / (math.log(2) ** 2))
+        size_bits = min(size_bits, max_bytes * 8)
+        num_hashes = round(size_bits / capacity * math.log(2))
+        return cls(size_bits, min(MAX_HASHES, max(1, num_hashes)))
+
+    def _positions(self, token_hash: str):
+        # token_hash já é um SHA-256: os 128 primeiros bits alimentam o double hashing.
+        h1 = int(token_hash[:16], 16)
+        h2 = int(token_hash[16:32], 16) | 1
+        size = self.size_bits
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % size
+
+    def add(self, token_hash: str) -> None:
+        bits = self.bits
+        for pos in self._positions(token_hash):
+            bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, token_hash: str) -> bool:
+        bits = self.bits
+        for pos in self._positions(token_hash):
+            if not bits[pos >> 3] & (1 << (pos & 7)):
+                return False
+        return True
+
+
+def _spawn_thread(target: Callable[[], None]) -> None:
+    threading.Thread(target=target, name="token-filter-refresh", daemon=True).start()
+
+
+class NegativeLookupFilter:
+    # O Scan nunca roda no caminho da requisição: a carga inicial vem do
+    # prewarm (INIT) e as seguintes numa thread, com o filtro antigo valendo
+    # até a troca. Na Lambda a thread congela entre invocações e continua na
+    # próxima, o que só atrasa a troca.
+    def __init__(
+        self,
+        loader: Callable[[], Iterable[str]],
+        fp_rate: float = DEFAULT_FP_RATE,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        refresh_seconds: float = DEFAULT_REFRESH_SECONDS,
+        clock: Callable[[], float] = time.time,
+        spawn: Callable[[Callable[[], None]], None] = _spawn_thread,
+        legacy_until: float = _parse_date(DEFAULT_LEGACY_UNTIL),
+    ):
+        self.loader = loader
+        self.fp_rate = fp_rate
+        self.max_bytes = max_bytes
+        self.refresh_seconds = refresh_seconds
+        self.clock = clock
+        self.spawn = spawn
+        self.legacy_until = legacy_until
+        self.bloom: Optional[BloomFilter] = None
+        self.snapshot_at = 0.0
+        self.trusted_before = 0.0
+        self.next_refresh_at = 0.0
+        self.refreshing = False
+        self.counters = {"filtered": 0, "passed": 0, "refreshes": 0}
+        self._lock = threading.Lock()
+
+    def refresh(self) -> None:
+        started = self.clock()
+        hashes = list(self.loader())
+        capacity = max(MIN_CAPACITY, int(len(hashes) * CAPACITY_HEADROOM))
+        bloom = BloomFilter.for_capacity(capacity, self.fp_rate, self.max_bytes)
+        for token_hash in hashes:
+            bloom.add(token_hash)
+
+        with self._lock:
+            self.bloom = bloom
+            self.snapshot_at = started
+            self.trusted_before = started - SNAPSHOT_SAFETY_SECONDS
+            self.next_refresh_at = started + self.refresh_seconds
+            self.counters["refreshes"] += 1
+
+    def _refresh_in_background(self) -> None:
+        try:
+            self.refresh()
+        except Exception as e:
+            print(f"token_filter: refresh falhou: {e!r}", file=sys.stderr)
+            with self._lock:
+                self.next_refresh_at = self.clock() + REFRESH_RETRY_SECONDS
+        finally:
+            with self._lock:
+                self.refreshing = False
+
+    def _ensure_fresh(self) -> None:
+        if self.clock() < self.next_refresh_at:
+            return
+        with self._lock:
+            # Um único refresh por vez, mesmo com várias threads/tarefas aqui.
+            if self.refreshing or self.clock() < self.next_refresh_at:
+                return
+            self.refreshing = True
+        self.spawn(self._refresh_in_background)
+
+    def add(self, token_hash: str) -> None:
+        if self.bloom is not None:
+            self.bloom.add(token_hash)
+
+    def might_exist(self, token_hash: str, created_at: Optional[int], legacy: bool = False) -> bool:
+        # created_at só vem de pwdIds com HMAC válido; sem data, só o formato
+        # antigo passa (até legacy_until) e o resto é forjado.
+        self._ensure_fresh()
+
+        if created_at is None:
+            if legacy and self.clock() < self.legacy_until:
+                self.counters["passed"] += 1
+                return True
+            self.counters["filtered"] += 1
+            return False
+
+        if created_at > self.clock() + CLOCK_SKEW_SECONDS:
+            self.counters["filtered"] += 1
+            return False
+
+        bloom = self.bloom
+        # Sem snapshot ainda (carga em andamento): não dá para negar nada.
+        if bloom is None or created_at >= self.trusted_before or token_hash in bloom:
+            self.counters["passed"] += 1
+            return True
+
+        self.counters["filtered"] += 1
+        return False
+
+    def stats(self) -> dict:
+        return {
+            **self.counters,
+            "size_bytes": len(self.bloom.bits) if self.bloom else 0,
+            "num_hashes": self.bloom.num_hashes if self.bloom else 0,
+            "snapshot_at": self.snapshot_at,
+        }
+
+
+_token_filter = None
+
+
+def get_token_filter() -> Optional[NegativeLookupFilter]:
+    global _token_filter
+    if os.environ.get("TOKEN_FILTER_ENABLED", "").lower() not in ("1", "true"):
+        return None
+    if _token_filter is None:
+        from infra.pwd_repository import iter_live_token_hashes
+        from utils.security import token_mac_key
+
+        if token_mac_key() is None:
+            raise RuntimeError("TOKEN_FILTER_ENABLED exige TOKEN_MAC_KEY")
+
+        _token_filter = NegativeLookupFilter(
+            loader=iter_live_token_hashes,
+            fp_rate=float(os.environ.get("TOKEN_FILTER_FP_RATE", DEFAULT_FP_RATE)),
+            max_bytes=int(os.environ.get("TOKEN_FILTER_MAX_BYTES", DEFAULT_MAX_BYTES)),
+            refresh_seconds=float(os.environ.get("TOKEN_FILTER_REFRESH_SECONDS", DEFAULT_REFRESH_SECONDS)),
+            legacy_until=_parse_date(os.environ.get("TOKEN_LEGACY_UNTIL", DEFAULT_LEGACY_UNTIL)),
+        )
+    return _token_filter
+
+
+def reset_token_filter() -> None:
+    global _token_filter
+    _token_filter = None
@@ -0,0 +1,86 @@
+import mmap
+import os
+import struct
+import sys
+import threading
+from typing import Iterable, Optional
+
+# Formato: MAGIC | uint32 count | (count + 1) offsets uint32 | palavras UTF-8
+# concatenadas. A palavra i está em data[offsets[i]:offsets[i + 1]].
+MAGIC = b"PWL1"
+_HEADER = struct.Struct("<4sI")
+_OFFSET = struct.Struct("<I")
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+DEFAULT_WORDLIST_PATH = os.path.join(DATA_DIR, "wordlist.bin")
+
+
+class Wordlist:
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.count = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise RuntimeError(f"Wordlist inválida: {path}")
+        self._offsets_at = _HEADER.size
+        self._words_at = self._offsets_at + (self.count + 1) * _OFFSET.size
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, index: int) -> str:
+        if not 0 <= index < self.count:
+            raise IndexError(index)
+        at = self._offsets_at + index * _OFFSET.size
+        start, end = struct.unpack_from("<II", self._mm, at)
+        return self._mm[self._words_at + start:self._words_at + end].decode()
+
+    def close(self) -> None:
+        self._mm.close()
+
+
+def compile_wordlist(words: Iterable[str], path: str) -> int:
+    encoded = [word.encode() for word in words]
+    offsets = [0]
+    for word in encoded:
+        offsets.append(offsets[-1] + len(word))
+
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, len(encoded)))
+        f.write(struct.pack(f"<{len(offsets)}I", *offsets))
+        f.write(b"".join(encoded))
+    return len(encoded)
+
+
+_wordlist: Optional[Wordlist] = None
+_lock = threading.Lock()
+
+
+def get_wordlist() -> Wordlist:
+    global _wordlist
+    if _wordlist is None:
+        with _lock:
+            if _wordlist is None:
+                _wordlist = Wordlist(os.environ.get("WORDLIST_PATH", DEFAULT_WORDLIST_PATH))
+    return _wordlist
+
+
+def reset_wordlist() -> None:
+    global _wordlist
+    _wordlist = None
+
+
+def main(argv=None) -> int:
+    # python -m infra.wordlist infra/data/wordlist.txt infra/data/wordlist.bin
+    args = sys.argv[1:] if argv is None else argv
+    if len(args) != 2:
+        print("uso: python -m infra.wordlist <origem.txt> <destino.bin>")
+        return 2
+    with open(args[0], encoding="utf-8") as f:
+        words = [line.strip() for line in f if line.strip()]
+    print(f"{compile_wordlist(words, args[1])} palavras gravadas em {args[1]}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
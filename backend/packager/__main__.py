@@ -0,0 +1,36 @@
+import argparse
+import sys
+
+from packager.slim import DEFAULT_OUT_DIR, DEFAULT_SITE_DIR, PROFILES, build, check_python_version, format_report
+
+
+def main(argv=None) -> int:
+    # python -m packager --profile router --use-runtime-sdk
+    parser = argparse.ArgumentParser(prog="python -m packager", description="Pacote enxuto para deploy")
+    parser.add_argument("--profile", action="append", choices=sorted(PROFILES), help="padrão: todos")
+    parser.add_argument("--site-dir", default=DEFAULT_SITE_DIR, help="dependências instaladas (pip install -t)")
+    parser.add_argument("--out-dir", default=DEFAULT_OUT_DIR)
+    parser.add_argument("--use-runtime-sdk", action="store_true", help="não empacota boto3/botocore (usa os do runtime)")
+    parser.add_argument("--strip-sources", action="store_true", help="publica só os .pyc")
+    parser.add_argument("--no-measure", action="store_true", help="não mede o import a frio")
+    args = parser.parse_args(argv)
+
+    warning = check_python_version()
+    if warning:
+        print(warning, file=sys.stderr)
+
+    for profile in args.profile or sorted(PROFILES):
+        report = build(
+            profile,
+            site_dir=args.site_dir,
+            out_dir=args.out_dir,
+            use_runtime_sdk=args.use_runtime_sdk,
+            strip_sources=args.strip_sources,
+            measure=not args.no_measure,
+        )
+        print(format_report(report))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
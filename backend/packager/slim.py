@@ -0,0 +1,224 @@
+import compileall
+import os
+import py_compile
+import shutil
+import subprocess
+import sys
+import sysconfig
+import zipfile
+from modulefinder import ModuleFinder
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from handlers.routes import ROUTES
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_SITE_DIR = os.path.join(BACKEND_DIR, ".serverless", "requirements")
+DEFAULT_OUT_DIR = os.path.join(BACKEND_DIR, "dist")
+LAMBDA_RUNTIME = "python3.11"
+
+# Handlers que cada perfil de deploy publica. routes.load_handler importa por
+# string, então o ModuleFinder não enxerga esses módulos sozinho.
+ROUTE_HANDLERS = sorted({handler.rpartition(".")[0] for _, _, handler in ROUTES})
+PROFILES = {
+    "functions": ROUTE_HANDLERS + ["handlers.sweep_secrets"],
+    "router": ["handlers.router"] + ROUTE_HANDLERS + ["handlers.sweep_secrets"],
+}
+
+# Serviços do botocore/boto3 usados pelo código (infra/ só fala com DynamoDB).
+BOTO_SERVICES = ("dynamodb",)
+# Arquivos de modelo do botocore que o client lê em runtime; examples-1.json e
+# afins só servem para documentação.
+BOTO_MODEL_FILES = ("service-2.json", "endpoint-rule-set-1.json", "paginators-1.json", "waiters-2.json")
+# Importados por string (boto3.utils.lazy_call) ao criar o resource do DynamoDB.
+BOTO_LAZY_MODULES = ("boto3.dynamodb.table", "boto3.dynamodb.transform")
+# Dados que não são módulos mas são lidos em runtime.
+APP_DATA_FILES = {"infra.wordlist": ("infra/data/wordlist.bin",)}
+SITE_DATA_FILES = ("botocore/cacert.pem",)
+# Já vêm no runtime python3.x da Lambda: com use_runtime_sdk não vão no pacote.
+RUNTIME_SDK = ("boto3", "botocore", "s3transfer", "jmespath", "dateutil", "urllib3", "six")
+
+
+class BundleReport(NamedTuple):
+    profile: str
+    files: int
+    bytes: int
+    zip_bytes: int
+    source_bytes: int
+    import_ms: Dict[str, float]
+    missing: List[str]
+
+
+def _stdlib_paths() -> List[str]:
+    paths = sysconfig.get_paths()
+    dynload = os.path.join(paths["stdlib"], "lib-dynload")
+    return [p for p in (paths["stdlib"], paths["platstdlib"], dynload) if os.path.isdir(p)]
+
+
+class _Finder(ModuleFinder):
+    def find_module(self, name, path, parent=None):
+        # O ModuleFinder quebra em namespace packages (loader None), ex. o
+        # diretório de stubs cryptography/.../_rust quando falta o _rust.abi3.so.
+        try:
+            return super().find_module(name, path, parent)
+        except AttributeError:
+            raise ImportError(name)
+
+
+def import_closure(entry_modules: Iterable[str], site_dir: str):
+    # Fechamento estático (inclui imports preguiçosos dentro de funções) sobre
+    # o código do backend + dependências vendorizadas, sem o site-packages local.
+    # Retorna ({módulo: arquivo}, módulos não encontrados do próprio pacote).
+    finder = _Finder(path=[BACKEND_DIR, site_dir] + _stdlib_paths())
+    for name in entry_modules:
+        finder.import_hook(name)
+    modules = {name: module.__file__ for name, module in finder.modules.items() if module.__file__}
+    roots = {name.split(".")[0] for name, path in modules.items() if _is_under(path, site_dir)}
+    missing, _ = finder.any_missing_maybe()
+    return modules, sorted(name for name in missing if name.split(".")[0] in roots)
+
+
+def _is_under(path: str, root: str) -> bool:
+    return os.path.abspath(path).startswith(os.path.abspath(root) + os.sep)
+
+
+def keep_site_data(relpath: str, services: Iterable[str] = BOTO_SERVICES) -> bool:
+    parts = relpath.replace(os.sep, "/").split("/")
+    if parts[:2] == ["botocore", "data"]:
+        if len(parts) == 3:
+            return parts[2].endswith(".json")
+        # botocore/data/<serviço>/<versão>/<modelo>.json[.gz]
+        return parts[2] in services and len(parts) == 5 and parts[4].removesuffix(".gz") in BOTO_MODEL_FILES
+    if parts[:2] == ["boto3", "data"]:
+        return len(parts) > 2 and parts[2] in services
+    return "/".join(parts) in SITE_DATA_FILES
+
+
+def bundle_files(modules: Dict[str, str], site_dir: str, use_runtime_sdk: bool = False) -> Dict[str, str]:
+    # destino relativo no pacote -> arquivo de origem
+    files = {}
+    site_roots = set()
+    for name, path in modules.items():
+        if _is_under(path, site_dir):
+            if use_runtime_sdk and name.split(".")[0] in RUNTIME_SDK:
+                continue
+            files[os.path.relpath(path, site_dir)] = path
+            site_roots.add(name.split(".")[0])
+        elif _is_under(path, BACKEND_DIR) and not _is_under(path, os.path.join(BACKEND_DIR, ".serverless")):
+            files[os.path.relpath(path, BACKEND_DIR)] = path
+            for data in APP_DATA_FILES.get(name, ()):
+                files[data] = os.path.join(BACKEND_DIR, data)
+
+    for root, _, names in os.walk(site_dir):
+        for filename in names:
+            path = os.path.join(root, filename)
+            rel = os.path.relpath(path, site_dir)
+            if rel.split(os.sep)[0] in site_roots and keep_site_data(rel):
+                files[rel] = path
+    return files
+
+
+def _tree_bytes(paths: Iterable[str]) -> int:
+    return sum(os.path.getsize(path) for path in paths)
+
+
+def _write_zip(bundle_dir: str, zip_path: str) -> None:
+    # Ordem e data fixas: o mesmo código gera o mesmo zip (e o mesmo hash no deploy).
+    with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED, compresslevel=9) as zf:
+        for root, dirs, names in os.walk(bundle_dir):
+            dirs.sort()
+            for filename in sorted(names):
+                path = os.path.join(root, filename)
+                info = zipfile.ZipInfo(os.path.relpath(path, bundle_dir), date_time=(1980, 1, 1, 0, 0, 0))
+                info.external_attr = 0o644 << 16
+                info.compress_type = zipfile.ZIP_DEFLATED
+                with open(path, "rb") as f:
+                    zf.writestr(info, f.read(), compresslevel=9)
+
+
+def measure_bundle_imports(bundle_dir: str, modules: Iterable[str]) -> Dict[str, float]:
+    # Import a frio de cada handler só com o pacote e a stdlib no path (-S -E):
+    # se faltar algo no fechamento, o import quebra aqui e não na Lambda.
+    timings = {}
+    for module in modules:
+        result = subprocess.run(
+            [sys.executable, "-S", "-E", "-X", "importtime", "-c", f"import sys; sys.path.insert(0, {bundle_dir!r}); import {module}"],
+            cwd=bundle_dir,
+            capture_output=True,
+            text=True,
+            env={"PATH": os.environ.get("PATH", "")},
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"{module} não importa a partir do pacote:\n{result.stderr[-2000:]}")
+        last = [line for line in result.stderr.splitlines() if line.startswith("import time:")][-1]
+        timings[module] = int(last.split("|")[1]) / 1000
+    return timings
+
+
+def build(
+    profile: str,
+    site_dir: str = DEFAULT_SITE_DIR,
+    out_dir: str = DEFAULT_OUT_DIR,
+    use_runtime_sdk: bool = False,
+    strip_sources: bool = False,
+    measure: bool = True,
+    extra_imports: Iterable[str] = ("boto3", "cryptography.fernet") + BOTO_LAZY_MODULES,
+) -> BundleReport:
+    entry = PROFILES[profile]
+    # boto3/cryptography entram de qualquer forma pelos imports preguiçosos de
+    # infra/, mas listá-los deixa o fechamento explícito.
+    modules, missing = import_closure(list(entry) + list(extra_imports), site_dir)
+    files = bundle_files(modules, site_dir, use_runtime_sdk)
+
+    bundle_dir = os.path.join(out_dir, profile)
+    shutil.rmtree(bundle_dir, ignore_errors=True)
+    for rel, src in sorted(files.items()):
+        dst = os.path.join(bundle_dir, rel)
+        os.makedirs(os.path.dirname(dst), exist_ok=True)
+        shutil.copyfile(src, dst)
+
+    # /var/task é somente leitura: sem .pyc no pacote, todo cold start recompila.
+    # UNCHECKED_HASH evita o stat/comparação de mtime a cada import.
+    mode = py_compile.PycInvalidationMode.UNCHECKED_HASH
+    compileall.compile_dir(bundle_dir, quiet=2, legacy=strip_sources, invalidation_mode=mode, workers=0)
+    if strip_sources:
+        for root, _, names in os.walk(bundle_dir):
+            for filename in names:
+                if filename.endswith(".py"):
+                    os.remove(os.path.join(root, filename))
+
+    zip_path = os.path.join(out_dir, f"{profile}.zip")
+    _write_zip(bundle_dir, zip_path)
+
+    bundled = [os.path.join(root, name) for root, _, names in os.walk(bundle_dir) for name in names]
+    source = [os.path.join(root, name) for root, _, names in os.walk(site_dir) for name in names]
+    return BundleReport(
+        profile=profile,
+        files=len(bundled),
+        bytes=_tree_bytes(bundled),
+        zip_bytes=os.path.getsize(zip_path),
+        source_bytes=_tree_bytes(source) + _tree_bytes(files[rel] for rel in files if not _is_under(files[rel], site_dir)),
+        import_ms=measure_bundle_imports(bundle_dir, list(entry) + ([] if use_runtime_sdk else ["boto3"])) if measure else {},
+        missing=missing,
+    )
+
+
+def format_report(report: BundleReport) -> str:
+    mb = 1024 * 1024
+    lines = [
+        f"perfil {report.profile}: {report.files} arquivos, {report.bytes / mb:.1f} MB "
+        f"(zip {report.zip_bytes / mb:.1f} MB; vendorizado completo {report.source_bytes / mb:.1f} MB)",
+    ]
+    for module, ms in report.import_ms.items():
+        lines.append(f"  import {module:<32} {ms:7.1f} ms")
+    if report.missing:
+        lines.append(f"  não encontrados (imports opcionais ou dependência incompleta): {', '.join(report.missing)}")
+    return "\n".join(lines)
+
+
+def check_python_version(runtime: str = LAMBDA_RUNTIME) -> Optional[str]:
+    # Os .pyc só valem para a mesma versão do runtime da Lambda.
+    local = f"python{sys.version_info.major}.{sys.version_info.minor}"
+    if local != runtime:
+        return f"aviso: .pyc gerados com {local}, mas o runtime é {runtime}"
+    return None
+
@@ -0,0 +1,31 @@
+import argparse
+import os
+import sys
+
+from server.http_server import MODES, serve
+
+
+def main(argv=None) -> int:
+    # python -m server --port 4000 --mode thread|process|asyncio --workers 4
+    parser = argparse.ArgumentParser(prog="python -m server", description="API fora da Lambda")
+    parser.add_argument("--host", default=os.environ.get("HOST", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=int(os.environ.get("PORT", 4000)))
+    parser.add_argument("--mode", choices=MODES + ("asyncio",), default=os.environ.get("SERVER_MODE", "thread"))
+    parser.add_argument("--workers", type=int, default=int(os.environ.get("SERVER_WORKERS", 0)),
+                        help="threads/processos do pool (padrão: núcleos da máquina; no modo asyncio, ASYNC_IO_WORKERS)")
+    parser.add_argument("--connections", type=int, default=int(os.environ.get("SERVER_CONNECTIONS", 0)),
+                        help="threads de conexão (padrão: workers no modo thread, 4x workers no modo process)")
+    args = parser.parse_args(argv)
+    if args.mode == "asyncio":
+        if args.workers:
+            os.environ["ASYNC_IO_WORKERS"] = str(args.workers)
+        from server.async_server import serve as serve_async
+
+        serve_async(args.host, args.port)
+        return 0
+    serve(args.host, args.port, mode=args.mode, workers=args.workers or os.cpu_count() or 2, connections=args.connections)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
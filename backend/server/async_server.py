@@ -0,0 +1,190 @@
+import asyncio
+import os
+import signal
+import sys
+import traceback
+from http import HTTPStatus
+from urllib.parse import urlsplit
+
+from handlers.routes import ASYNC_HANDLERS, COMPILED_ROUTES, load_handler, match_route
+from infra.async_repository import run_blocking, shutdown_io_executor, wait_background
+from server.http_server import KEEPALIVE_SECONDS, MAX_BODY_BYTES, invoke
+from utils.apigw import decode_body, encode_body, http_event
+from utils.http import json_response
+
+MAX_HEADER_BYTES = 64 * 1024
+SHUTDOWN_GRACE_SECONDS = 30
+
+
+class BadRequest(Exception):
+    pass
+
+
+def parse_head(head: bytes):
+    lines = head.decode("latin-1").split("\r\n")
+    try:
+        method, target, version = lines[0].split(" ")
+    except ValueError:
+        raise BadRequest(lines[0])
+    headers = {}
+    for line in lines[1:]:
+        if not line:
+            continue
+        name, sep, value = line.partition(":")
+        if not sep:
+            raise BadRequest(line)
+        name, value = name.strip().lower(), value.strip()
+        headers[name] = f"{headers[name]},{value}" if name in headers else value
+    return method, target, version, headers
+
+
+def wants_keep_alive(version: str, headers: dict) -> bool:
+    connection = headers.get("connection", "").lower()
+    if version == "HTTP/1.0":
+        return connection == "keep-alive"
+    return connection != "close"
+
+
+def render_response(response: dict, keep_alive: bool, head_only: bool = False) -> bytes:
+    body = decode_body(response)
+    status = response.get("statusCode", 200)
+    try:
+        reason = HTTPStatus(status).phrase
+    except ValueError:
+        reason = ""
+    lines = [f"HTTP/1.1 {status} {reason}"]
+    for name, value in (response.get("headers") or {}).items():
+        lines.append(f"{name}: {value}")
+    for cookie in response.get("cookies") or ():
+        lines.append(f"Set-Cookie: {cookie}")
+    lines.append(f"Content-Length: {len(body)}")
+    lines.append("Connection: keep-alive" if keep_alive else "Connection: close")
+    head = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+    return head if head_only else head + body
+
+
+class AsyncLambdaServer:
+    # Um único processo multiplexa as conexões num event loop. Rotas com caso
+    # de uso asyncio (ASYNC_HANDLERS) não ocupam thread enquanto esperam o
+    # banco; as demais rodam o handler síncrono no pool de I/O.
+    def __init__(self, routes=COMPILED_ROUTES, quiet: bool = False):
+        self.routes = routes
+        self.quiet = quiet
+        self.server = None
+        self.closing = False
+        self._connections = set()
+        self._idle = set()
+        self._async_handlers = {}
+
+    async def start(self, host: str, port: int) -> None:
+        self.server = await asyncio.start_server(self._serve_connection, host, port, limit=MAX_HEADER_BYTES, backlog=1024)
+
+    @property
+    def port(self) -> int:
+        return self.server.sockets[0].getsockname()[1]
+
+    def _async_handler(self, handler_spec: str):
+        if handler_spec not in self._async_handlers:
+            target = ASYNC_HANDLERS.get(handler_spec)
+            self._async_handlers[handler_spec] = load_handler(target) if target else None
+        return self._async_handlers[handler_spec]
+
+    async def dispatch(self, method: str, target: str, headers: dict, raw: bytes, source_ip: str) -> dict:
+        url = urlsplit(target)
+        found = match_route(self.routes, method, url.path)
+        if found is None:
+            return json_response(404, {"message": "Not Found"})
+
+        body, is_base64 = encode_body(raw)
+        event = http_event(
+            method,
+            found.route.path,
+            url.path,
+            body=body,
+            path_params=found.path_params,
+            headers=headers,
+            source_ip=source_ip,
+            raw_query_string=url.query,
+            is_base64_encoded=is_base64,
+        )
+        handler = self._async_handler(found.route.handler)
+        if handler is None:
+            return await run_blocking(invoke, found.route.handler, event)
+        try:
+            return await handler(event)
+        except Exception:
+            traceback.print_exc()
+            return json_response(500, {"message": "Internal Server Error"})
+
+    async def _serve_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        task = asyncio.current_task()
+        self._connections.add(task)
+        source_ip = (writer.get_extra_info("peername") or ("",))[0]
+        try:
+            while not self.closing:
+                self._idle.add(task)
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), KEEPALIVE_SECONDS)
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, asyncio.TimeoutError, ConnectionError):
+                    break
+                finally:
+                    self._idle.discard(task)
+
+                try:
+                    method, target, version, headers = parse_head(head)
+                    length = int(headers.get("content-length") or 0)
+                except (BadRequest, ValueError):
+                    writer.write(render_response(json_response(400, {"message": "Bad Request"}), False))
+                    break
+                if length > MAX_BODY_BYTES:
+                    writer.write(render_response(json_response(413, {"message": "Request Entity Too Large"}), False))
+                    break
+
+                raw = await reader.readexactly(length) if length else b""
+                response = await self.dispatch(method, target, headers, raw, source_ip)
+                keep_alive = wants_keep_alive(version, headers) and not self.closing
+                writer.write(render_response(response, keep_alive, head_only=method == "HEAD"))
+                await writer.drain()
+                if not self.quiet:
+                    print(f'{source_ip} "{method} {target} {version}" {response.get("statusCode", 200)}', file=sys.stderr)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._connections.discard(task)
+            writer.close()
+
+    async def drain(self, grace_seconds: float = SHUTDOWN_GRACE_SECONDS) -> None:
+        # Para de aceitar conexões, derruba as keep-alive ociosas e espera as
+        # requisições em andamento (e as tarefas em segundo plano) terminarem.
+        self.closing = True
+        self.server.close()
+        for task in list(self._idle):
+            task.cancel()
+        if self._connections:
+            await asyncio.wait(list(self._connections), timeout=grace_seconds)
+        await self.server.wait_closed()
+        await wait_background()
+
+
+async def _serve(host: str, port: int) -> None:
+    server = AsyncLambdaServer()
+    await server.start(host, port)
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(signum, stop.set)
+
+    print(f"Servindo em http://{host}:{server.port} (modo asyncio, pid {os.getpid()})", flush=True)
+    await stop.wait()
+    await server.drain()
+
+
+def serve(host: str, port: int) -> None:
+    try:
+        asyncio.run(_serve(host, port))
+    finally:
+        shutdown_io_executor()
+        print("Servidor encerrado", file=sys.stderr, flush=True)
@@ -0,0 +1,196 @@
+import multiprocessing
+import os
+import signal
+import sys
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import urlsplit
+
+from handlers.routes import COMPILED_ROUTES, load_handler, match_route
+from utils.apigw import decode_body, encode_body, http_event
+from utils.http import json_response
+
+KEEPALIVE_SECONDS = 5
+# Mesmo limite de payload de uma invocação síncrona de Lambda.
+MAX_BODY_BYTES = 6 * 1024 * 1024
+HANDLER_TIMEOUT_SECONDS = 30
+MODES = ("thread", "process")
+
+_handlers = {}
+
+
+class LocalContext:
+    def __init__(self, function_name: str, timeout_seconds: float = HANDLER_TIMEOUT_SECONDS):
+        self.function_name = function_name
+        self.aws_request_id = uuid.uuid4().hex
+        self.memory_limit_in_mb = 128
+        self._deadline = time.monotonic() + timeout_seconds
+
+    def get_remaining_time_in_millis(self) -> int:
+        return max(0, int((self._deadline - time.monotonic()) * 1000))
+
+
+def invoke(handler_spec: str, event: dict) -> dict:
+    # Roda no processo que atende a requisição ou num worker do pool de
+    # processos; em ambos os casos o handler é importado uma vez por processo.
+    handler = _handlers.get(handler_spec)
+    if handler is None:
+        handler = _handlers[handler_spec] = load_handler(handler_spec)
+    try:
+        return handler(event, LocalContext(handler_spec))
+    except Exception:
+        traceback.print_exc()
+        return json_response(500, {"message": "Internal Server Error"})
+
+
+def _ignore_sigint() -> None:
+    # Ctrl+C chega a todo o grupo de processos; quem encerra os workers é o pai,
+    # depois de drenar as requisições em andamento.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+class RequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    timeout = KEEPALIVE_SECONDS
+    # Cabeçalhos e corpo num único write (handle_one_request faz o flush); sem
+    # isso o delayed ACK do TCP segura cada resposta keep-alive por ~40ms.
+    wbufsize = 64 * 1024
+    disable_nagle_algorithm = True
+    server_version = "secure-password-api"
+    sys_version = ""
+
+    def _dispatch(self) -> None:
+        url = urlsplit(self.path)
+        found = match_route(self.server.routes, self.command, url.path)
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY_BYTES:
+            self.close_connection = True
+            return self._send(json_response(413, {"message": "Request Entity Too Large"}))
+        raw = self.rfile.read(length) if length else b""
+        if found is None:
+            return self._send(json_response(404, {"message": "Not Found"}))
+
+        body, is_base64 = encode_body(raw)
+        headers = {}
+        for name, value in self.headers.items():
+            name = name.lower()
+            headers[name] = f"{headers[name]},{value}" if name in headers else value
+        event = http_event(
+            self.command,
+            found.route.path,
+            url.path,
+            body=body,
+            path_params=found.path_params,
+            headers=headers,
+            source_ip=self.client_address[0],
+            raw_query_string=url.query,
+            is_base64_encoded=is_base64,
+        )
+        self._send(self.server.invoke(found.route.handler, event))
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = do_OPTIONS = do_HEAD = _dispatch
+
+    def _send(self, response: dict) -> None:
+        body = decode_body(response)
+        self.send_response(response.get("statusCode", 200))
+        for name, value in (response.get("headers") or {}).items():
+            self.send_header(name, str(value))
+        for cookie in response.get("cookies") or ():
+            self.send_header("Set-Cookie", cookie)
+        self.send_header("Content-Length", str(len(body)))
+        if self.server.draining.is_set():
+            self.send_header("Connection", "close")
+            self.close_connection = True
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+
+class LambdaHTTPServer(HTTPServer):
+    # Cada conexão (com keep-alive) ocupa uma thread do pool; no modo "process"
+    # os handlers rodam num ProcessPoolExecutor e as threads só fazem I/O.
+    daemon_threads = True
+    allow_reuse_address = True
+    request_queue_size = 128
+
+    def __init__(
+        self,
+        address,
+        mode: str = "thread",
+        workers: int = 8,
+        connections: int = 0,
+        routes=COMPILED_ROUTES,
+        quiet: bool = False,
+    ):
+        if mode not in MODES:
+            raise ValueError(f"mode deve ser um de: {', '.join(MODES)}")
+        self.mode = mode
+        self.routes = routes
+        self.quiet = quiet
+        self.draining = threading.Event()
+        if mode == "process":
+            self.process_pool = ProcessPoolExecutor(
+                max_workers=workers,
+                # spawn: o pai já tem threads de conexão quando os workers sobem.
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_ignore_sigint,
+            )
+            connections = connections or workers * 4
+        else:
+            self.process_pool = None
+            connections = connections or workers
+        self.connection_pool = ThreadPoolExecutor(max_workers=connections, thread_name_prefix="http")
+        super().__init__(address, RequestHandler)
+
+    def invoke(self, handler_spec: str, event: dict) -> dict:
+        if self.process_pool is None:
+            return invoke(handler_spec, event)
+        return self.process_pool.submit(invoke, handler_spec, event).result()
+
+    def process_request(self, request, client_address):
+        self.connection_pool.submit(self._process_request_thread, request, client_address)
+
+    def _process_request_thread(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def drain(self) -> None:
+        # Para de aceitar conexões e espera as requisições em andamento; conexões
+        # keep-alive ociosas encerram em até KEEPALIVE_SECONDS.
+        self.draining.set()
+        self.server_close()
+        self.connection_pool.shutdown(wait=True)
+        if self.process_pool is not None:
+            self.process_pool.shutdown(wait=True)
+
+
+def serve(host: str, port: int, mode: str = "thread", workers: int = 8, connections: int = 0) -> None:
+    server = LambdaHTTPServer((host, port), mode=mode, workers=workers, connections=connections)
+
+    def stop(signum, frame):
+        # shutdown() espera o loop de serve_forever terminar, então não pode
+        # rodar na mesma thread (a principal) que recebe o sinal.
+        threading.Thread(target=server.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    bound_host, bound_port = server.server_address[:2]
+    print(f"Servindo em http://{bound_host}:{bound_port} (modo {mode}, {workers} workers, pid {os.getpid()})", flush=True)
+    try:
+        server.serve_forever()
+    finally:
+        server.drain()
+        print("Servidor encerrado", file=sys.stderr, flush=True)
@@ -0,0 +1,132 @@
+import asyncio
+import json
+import threading
+
+import pytest
+
+from infra import async_repository, crypto_service, pwd_repository
+from infra.sqlite_repository import SQLiteSecretRepository
+from usecases.async_secrets import (
+    create_secret_async,
+    create_secrets_batch_async,
+    get_secret_async,
+    peek_secret_async,
+)
+
+
+def _body(resp):
+    return json.loads(resp.get("body") or "{}")
+
+
+@pytest.fixture(autouse=True)
+def io_executor():
+    yield
+    async_repository.shutdown_io_executor()
+
+
+@pytest.fixture
+def repository(tmp_path, monkeypatch):
+    monkeypatch.setenv("ENCRYPTION_KEY", "_nQF7e7aQoiHjpBMYg99Gwm5_6dpfwnt7_BL4Y7c2Og=")
+    monkeypatch.delenv("ENCRYPTION_KEYS", raising=False)
+    crypto_service.reset_cipher_cache()
+    repository = SQLiteSecretRepository(str(tmp_path / "secrets.db"))
+    pwd_repository.set_repository(repository)
+    yield repository
+    pwd_repository.set_repository(None)
+
+
+def test_create_then_get_and_peek(repository):
+    async def scenario():
+        created = await create_secret_async({"body": json.dumps({"sended_password": "s3cr3t", "pass_view_limit": 2})})
+        pwd_id = _body(created)["pwdId"]
+        event = {"pathParameters": {"pwdId": pwd_id}}
+        return created, await get_secret_async(event), await peek_secret_async(event)
+
+    created, got, meta = asyncio.run(scenario())
+
+    assert created["statusCode"] == 201
+    assert _body(got)["pwd"] == "s3cr3t"
+    assert _body(meta)["view_count"] == 1
+    assert _body(meta)["available"] is True
+
+
+def test_concurrent_gets_consume_each_view_once(repository):
+    async def scenario():
+        created = await create_secret_async({"body": json.dumps({"sended_password": "x", "pass_view_limit": 3})})
+        event = {"pathParameters": {"pwdId": _body(created)["pwdId"]}}
+        return await asyncio.gather(*[get_secret_async(event) for _ in range(10)])
+
+    statuses = sorted(resp["statusCode"] for resp in asyncio.run(scenario()))
+
+    assert statuses.count(200) == 3
+    assert set(statuses[3:]) <= {404, 410}
+
+
+def test_get_reencrypts_in_background(monkeypatch):
+    item = {"ciphertext": "enc:old", "key_id": "k1", "expires_at": 9999, "views_used": 1, "max_views": 3}
+    rewrites = []
+    monkeypatch.setattr("infra.pwd_repository.consume_view_and_maybe_delete", lambda token_hash: ("consumed", item))
+    monkeypatch.setattr("infra.pwd_repository.reencrypt_secret", lambda *args: rewrites.append(args) or True)
+    monkeypatch.setattr("usecases.async_secrets.screen_request", lambda *args: None)
+    monkeypatch.setattr("usecases.async_secrets.decrypt", lambda c, key_id=None: "plain")
+    monkeypatch.setattr("usecases.async_secrets.needs_reencryption", lambda key_id: key_id != "k2")
+    monkeypatch.setattr("usecases.async_secrets.encrypt_with_key_id", lambda s: ("k2", f"enc2:{s}"))
+    monkeypatch.setattr("usecases.async_secrets.sha256_hex", lambda s: "hash:tok")
+
+    async def scenario():
+        resp = await get_secret_async({"pathParameters": {"pwdId": "tok"}})
+        await async_repository.wait_background()
+        return resp
+
+    resp = asyncio.run(scenario())
+
+    assert _body(resp)["pwd"] == "plain"
+    assert rewrites == [("hash:tok", "k1", "k2", "enc2:plain")]
+
+
+def test_batch_saves_first_chunk_while_encrypting_the_rest(monkeypatch, make_event):
+    encrypted = []
+    seen_by_save = []
+    lock = threading.Lock()
+
+    def encrypt(secret):
+        with lock:
+            encrypted.append(secret)
+        return "k1", f"enc:{secret}"
+
+    def save(items):
+        with lock:
+            seen_by_save.append(len(encrypted))
+        return [item for item in items if item["ciphertext"] == "enc:senha7"]
+
+    monkeypatch.setattr("usecases.create_secret.encrypt_with_key_id", encrypt)
+    monkeypatch.setattr("infra.pwd_repository.save_secrets", save)
+
+    specs = [{"sended_password": f"senha{i}"} for i in range(60)]
+    resp = asyncio.run(create_secrets_batch_async(make_event({"items": specs})))
+
+    assert resp["statusCode"] == 207
+    results = _body(resp)["results"]
+    assert "gravar" in results[7]["message"]
+    assert sum("pwdId" in r for r in results) == 59
+    assert len(seen_by_save) == 3
+    assert min(seen_by_save) < 60
+
+
+def test_batch_async_reports_a_failed_chunk_per_entry(monkeypatch, make_event):
+    monkeypatch.setattr("usecases.create_secret.encrypt_with_key_id", lambda s: ("k1", f"enc:{s}"))
+
+    def save(items):
+        if items[0]["ciphertext"] == "enc:senha0":
+            raise RuntimeError("dynamodb fora")
+        return []
+
+    monkeypatch.setattr("infra.pwd_repository.save_secrets", save)
+
+    specs = [{"sended_password": f"senha{i}"} for i in range(30)]
+    resp = asyncio.run(create_secrets_batch_async(make_event({"items": specs})))
+
+    assert resp["statusCode"] == 207
+    results = _body(resp)["results"]
+    assert all("gravar" in r["message"] for r in results[:25])
+    assert all("pwdId" in r for r in results[25:])
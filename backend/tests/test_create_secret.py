@@ -1,5 +1,6 @@
 import json
 
+from infra.password_generator import PasswordPolicy
 from usecases.create_secret import create_secret
 
 
@@ -28,7 +29,7 @@ def test_create_secret_rejects_view_limit_zero(make_event):
 def test_create_secret_accepts_sended_password_and_saves_item(monkeypatch, make_event):
     saved = {}
 
-    monkeypatch.setattr("usecases.create_secret.encrypt", lambda s: f"enc:{s}")
+    monkeypatch.setattr("usecases.create_secret.encrypt_with_key_id", lambda s: ("k1", f"enc:{s}"))
     monkeypatch.setattr("usecases.create_secret.now_unix", lambda: 1000)
     monkeypatch.setattr("usecases.create_secret.sha256_hex", lambda t: f"hash:{t}")
 
@@ -51,6 +52,7 @@ def test_create_secret_accepts_sended_password_and_saves_item(monkeypatch, make_
     assert isinstance(body["pwdId"], str) and body["pwdId"]
 
     assert saved["ciphertext"] == "enc:MinhaSenha123"
+    assert saved["key_id"] == "k1"
     assert saved["expires_at"] == 1060
     assert saved["max_views"] == 2
     assert saved["views_used"] == 0
@@ -62,15 +64,15 @@ def test_create_secret_generates_password_when_not_sent(monkeypatch, make_event)
     saved = {}
     calls = {}
 
-    monkeypatch.setattr("usecases.create_secret.encrypt", lambda s: f"enc:{s}")
+    monkeypatch.setattr("usecases.create_secret.encrypt_with_key_id", lambda s: ("k1", f"enc:{s}"))
     monkeypatch.setattr("usecases.create_secret.now_unix", lambda: 2000)
     monkeypatch.setattr("usecases.create_secret.sha256_hex", lambda t: f"hash:{t}")
 
-    def fake_generate_password(use_letters, use_digits, use_punctuation, pass_length):
-        calls["args"] = (use_letters, use_digits, use_punctuation, pass_length)
-        return "GERADA_ABC123!"
+    def fake_generate_passwords(policy, count):
+        calls["args"] = (policy, count)
+        return ["GERADA_ABC123!"]
 
-    monkeypatch.setattr("usecases.create_secret.generate_password", fake_generate_password)
+    monkeypatch.setattr("usecases.create_secret.generate_passwords", fake_generate_passwords)
 
     def fake_save_secret(item):
         saved.update(item)
@@ -89,16 +91,16 @@ def test_create_secret_generates_password_when_not_sent(monkeypatch, make_event)
     resp = create_secret(event)
 
     assert resp["statusCode"] == 201
-    assert calls["args"] == (True, True, True, 16)
+    assert calls["args"] == (PasswordPolicy(True, True, True, 16), 1)
     assert saved["ciphertext"] == "enc:GERADA_ABC123!"
     assert saved["expires_at"] == 2120
 
 
 def test_create_secret_returns_400_when_generator_raises(monkeypatch, make_event):
-    def fake_generate_password(*args, **kwargs):
+    def fake_generate_passwords(*args, **kwargs):
         raise ValueError("policy inválida")
 
-    monkeypatch.setattr("usecases.create_secret.generate_password", fake_generate_password)
+    monkeypatch.setattr("usecases.create_secret.generate_passwords", fake_generate_passwords)
 
     event = make_event({
         "expiration_in_seconds": 10,
@@ -112,4 +114,59 @@ def test_create_secret_returns_400_when_generator_raises(monkeypatch, make_event
     resp = create_secret(event)
 
     assert resp["statusCode"] == 400
-    assert _body(resp)["message"] == "policy inválida"
\ No newline at end of file
+    assert _body(resp)["message"] == "policy inválida"
+
+def test_create_secret_generates_passphrase_and_reports_entropy(monkeypatch, make_event):
+    saved = {}
+
+    monkeypatch.setattr("usecases.create_secret.encrypt_with_key_id", lambda s: ("k1", f"enc:{s}"))
+    monkeypatch.setattr("usecases.create_secret.save_secret", lambda item: saved.update(item))
+
+    event = make_event({
+        "expiration_in_seconds": 60,
+        "pass_view_limit": 1,
+        "pass_mode": "passphrase",
+        "pass_words": 5,
+        "pass_separator": ".",
+    })
+
+    resp = create_secret(event)
+
+    assert resp["statusCode"] == 201
+    assert len(saved["ciphertext"].removeprefix("enc:").split(".")) == 5
+    assert _body(resp)["entropy_bits"] == 64.6
+
+
+def test_create_secret_rejects_invalid_passphrase_policy(make_event):
+    event = make_event({
+        "expiration_in_seconds": 60,
+        "pass_view_limit": 1,
+        "pass_mode": "passphrase",
+        "pass_words": 2,
+    })
+
+    resp = create_secret(event)
+
+    assert resp["statusCode"] == 400
+    assert "pass_words" in _body(resp)["message"]
+
+
+def test_create_secret_honours_exclude_ambiguous(monkeypatch, make_event):
+    saved = {}
+
+    monkeypatch.setattr("usecases.create_secret.encrypt_with_key_id", lambda s: ("k1", s))
+    monkeypatch.setattr("usecases.create_secret.save_secret", lambda item: saved.update(item))
+
+    event = make_event({
+        "expiration_in_seconds": 60,
+        "pass_view_limit": 1,
+        "pass_length": 64,
+        "pass_exclude_ambiguous": True,
+        "pass_include": "~",
+    })
+
+    resp = create_secret(event)
+
+    assert resp["statusCode"] == 201
+    assert "~" in saved["ciphertext"]
+    assert not set("Il1O0o") & set(saved["ciphertext"])
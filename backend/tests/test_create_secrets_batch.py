@@ -0,0 +1,90 @@
+import json
+
+from botocore.exceptions import ClientError
+
+from usecases.create_secrets_batch import create_secrets_batch
+
+
+def _body(resp):
+    return json.loads(resp.get("body") or "{}")
+
+
+def _patch_crypto(monkeypatch):
+    monkeypatch.setattr("usecases.create_secret.encrypt_with_key_id", lambda s: ("k1", f"enc:{s}"))
+    monkeypatch.setattr("usecases.create_secret.now_unix", lambda: 1000)
+
+
+def test_batch_rejects_empty_or_non_list_body(make_event):
+    assert create_secrets_batch(make_event({"items": []}))["statusCode"] == 400
+    assert create_secrets_batch(make_event({"items": "x"}))["statusCode"] == 400
+
+
+def test_batch_rejects_too_many_items(make_event):
+    resp = create_secrets_batch(make_event({"items": [{}] * 501}))
+
+    assert resp["statusCode"] == 400
+
+
+def test_batch_writes_in_chunks_and_returns_pwd_ids(monkeypatch, make_event):
+    _patch_crypto(monkeypatch)
+    chunks = []
+    monkeypatch.setattr(
+        "usecases.create_secrets_batch.save_secrets",
+        lambda items: chunks.append(items) or [],
+    )
+
+    specs = [{"sended_password": f"senha{i}", "pass_view_limit": 2} for i in range(60)]
+    resp = create_secrets_batch(make_event({"items": specs}))
+
+    assert resp["statusCode"] == 201
+    results = _body(resp)["results"]
+    assert [r["index"] for r in results] == list(range(60))
+    assert all(r["pwdId"] for r in results)
+    assert sorted(len(chunk) for chunk in chunks) == [10, 25, 25]
+    saved = {item["ciphertext"] for chunk in chunks for item in chunk}
+    assert saved == {f"enc:senha{i}" for i in range(60)}
+
+
+def test_batch_reports_per_entry_validation_and_write_errors(monkeypatch, make_event):
+    _patch_crypto(monkeypatch)
+    monkeypatch.setattr(
+        "usecases.create_secrets_batch.save_secrets",
+        lambda items: [item for item in items if item["ciphertext"] == "enc:falha"],
+    )
+
+    specs = [
+        {"sended_password": "ok"},
+        {"sended_password": "ok", "pass_view_limit": 0},
+        {"sended_password": "falha"},
+        {"pass_length": 4},
+    ]
+    resp = create_secrets_batch(make_event(specs))
+
+    assert resp["statusCode"] == 207
+    results = _body(resp)["results"]
+    assert "pwdId" in results[0]
+    assert "pass_view_limit" in results[1]["message"]
+    assert "gravar" in results[2]["message"]
+    assert "pass_length" in results[3]["message"]
+
+
+def test_batch_reports_a_failed_chunk_per_entry_and_keeps_the_others(monkeypatch, make_event):
+    _patch_crypto(monkeypatch)
+    saved = []
+
+    def save(items):
+        if items[0]["ciphertext"] == "enc:senha25":
+            raise ClientError({"Error": {"Code": "ProvisionedThroughputExceededException"}}, "BatchWriteItem")
+        saved.extend(items)
+        return []
+
+    monkeypatch.setattr("usecases.create_secrets_batch.save_secrets", save)
+
+    specs = [{"sended_password": f"senha{i}"} for i in range(60)]
+    resp = create_secrets_batch(make_event({"items": specs}))
+
+    assert resp["statusCode"] == 207
+    results = _body(resp)["results"]
+    assert all("gravar" in r["message"] for r in results[25:50])
+    assert all("pwdId" in r for r in results[:25] + results[50:])
+    assert len(saved) == 35
@@ -0,0 +1,86 @@
+import pytest
+from cryptography.fernet import Fernet
+
+from infra import crypto_service
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cipher(monkeypatch):
+    monkeypatch.delenv("ENCRYPTION_KEYS", raising=False)
+    monkeypatch.setenv("ENCRYPTION_KEY", Fernet.generate_key().decode())
+    crypto_service.reset_cipher_cache()
+    yield
+    crypto_service.reset_cipher_cache()
+
+
+def test_encrypt_decrypt_roundtrip():
+    assert crypto_service.decrypt(crypto_service.encrypt("segredo")) == "segredo"
+
+
+def test_cipher_is_built_once_per_key_config():
+    for _ in range(5):
+        crypto_service.encrypt("x")
+
+    metrics = crypto_service.get_cipher_metrics()
+    assert metrics["rebuilds"] == 1
+    assert metrics["hits"] == 4
+
+
+def test_cipher_is_rebuilt_when_key_config_changes(monkeypatch):
+    crypto_service.encrypt("x")
+    monkeypatch.setenv("ENCRYPTION_KEY", Fernet.generate_key().decode())
+    crypto_service.encrypt("x")
+
+    assert crypto_service.get_cipher_metrics()["rebuilds"] == 2
+
+
+def test_multiple_keys_decrypt_ciphertext_from_older_key(monkeypatch):
+    old_key = Fernet.generate_key().decode()
+    new_key = Fernet.generate_key().decode()
+    old_ciphertext = Fernet(old_key.encode()).encrypt(b"antigo").decode()
+
+    monkeypatch.setenv("ENCRYPTION_KEYS", f"k2:{new_key},k1:{old_key}")
+
+    assert crypto_service.decrypt(old_ciphertext) == "antigo"
+    new_ciphertext = crypto_service.encrypt("novo")
+    assert Fernet(new_key.encode()).decrypt(new_ciphertext.encode()) == b"novo"
+
+
+def test_decrypt_uses_the_key_stamped_on_the_item(monkeypatch):
+    old_key = Fernet.generate_key().decode()
+    new_key = Fernet.generate_key().decode()
+    monkeypatch.setenv("ENCRYPTION_KEYS", f"k1:{old_key}")
+    key_id, ciphertext = crypto_service.encrypt_with_key_id("segredo")
+
+    monkeypatch.setenv("ENCRYPTION_KEYS", f"k2:{new_key},k1:{old_key}")
+
+    assert key_id == "k1"
+    assert crypto_service.current_key_id() == "k2"
+    assert crypto_service.needs_reencryption(key_id)
+    assert crypto_service.decrypt(ciphertext, key_id) == "segredo"
+
+
+def test_legacy_items_without_key_id_use_the_legacy_key(monkeypatch):
+    legacy_key = Fernet.generate_key().decode()
+    ciphertext = Fernet(legacy_key.encode()).encrypt(b"legado").decode()
+    monkeypatch.setenv("ENCRYPTION_KEYS", f"k1:{Fernet.generate_key().decode()},k0:{legacy_key}")
+
+    assert crypto_service.needs_reencryption(None)
+    assert crypto_service.decrypt(ciphertext, None) == "legado"
+
+
+def test_decrypt_rejects_unknown_key_id():
+    with pytest.raises(RuntimeError):
+        crypto_service.decrypt("x", "k9")
+
+
+def test_single_encryption_key_is_the_legacy_key():
+    assert crypto_service.current_key_id() == crypto_service.LEGACY_KEY_ID
+    assert not crypto_service.needs_reencryption(None)
+
+
+def test_missing_key_config_raises(monkeypatch):
+    monkeypatch.delenv("ENCRYPTION_KEY")
+
+    with pytest.raises(RuntimeError):
+        crypto_service.encrypt("x")
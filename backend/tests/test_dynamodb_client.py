@@ -0,0 +1,178 @@
+import boto3
+import pytest
+from botocore.stub import ANY, Stubber
+
+from infra import dynamodb_repository
+from infra.dynamodb_repository import DynamoDBSecretRepository
+from infra.dynamodb_client import ClientTable, decode_item, encode_item
+
+
+@pytest.fixture
+def stubbed_repository():
+    client = boto3.client(
+        "dynamodb",
+        region_name="us-east-1",
+        aws_access_key_id="test",
+        aws_secret_access_key="test",
+    )
+    repository = DynamoDBSecretRepository(ClientTable(client, "secure-secrets"))
+    with Stubber(client) as stubber:
+        yield repository, stubber
+        stubber.assert_no_pending_responses()
+
+
+def _stored(views_used, max_views, expires_at=9999):
+    return {
+        "token_hash": {"S": "hash"},
+        "ciphertext": {"S": "c"},
+        "key_id": {"S": "k1"},
+        "expires_at": {"N": str(expires_at)},
+        "max_views": {"N": str(max_views)},
+        "views_used": {"N": str(views_used)},
+        "revoked": {"BOOL": False},
+    }
+
+
+def test_encode_and_decode_item_roundtrip():
+    item = {
+        "token_hash": "hash",
+        "ciphertext": "c",
+        "key_id": "k1",
+        "expires_at": 9999,
+        "max_views": 3,
+        "views_used": 0,
+        "revoked": False,
+    }
+
+    encoded = encode_item(item)
+
+    assert encoded["expires_at"] == {"N": "9999"}
+    assert encoded["revoked"] == {"BOOL": False}
+    assert decode_item(encoded) == item
+
+
+def test_client_save_secret_sends_attribute_value_map(stubbed_repository):
+    repository, stubber = stubbed_repository
+    stubber.add_response(
+        "put_item",
+        {},
+        {"TableName": "secure-secrets", "Item": _stored(0, 1)},
+    )
+
+    repository.save({
+        "token_hash": "hash",
+        "ciphertext": "c",
+        "key_id": "k1",
+        "expires_at": 9999,
+        "max_views": 1,
+        "views_used": 0,
+        "revoked": False,
+    })
+
+
+def test_client_consume_returns_plain_python_values(stubbed_repository):
+    repository, stubber = stubbed_repository
+    stubber.add_client_error(
+        "delete_item",
+        service_error_code="ConditionalCheckFailedException",
+        modeled_fields={"Item": _stored(0, 3, expires_at=4102444800)},
+    )
+    stubber.add_response(
+        "update_item",
+        {"Attributes": _stored(1, 3)},
+        {
+            "TableName": "secure-secrets",
+            "Key": {"token_hash": {"S": "hash"}},
+            "UpdateExpression": ANY,
+            "ConditionExpression": ANY,
+            "ExpressionAttributeValues": {
+                ":one": {"N": "1"},
+                ":now": ANY,
+                ":false": {"BOOL": False},
+            },
+            "ReturnValues": "ALL_NEW",
+            "ReturnValuesOnConditionCheckFailure": "ALL_OLD",
+        },
+    )
+
+    status, item = repository.consume("hash")
+
+    assert status == "consumed"
+    assert item["views_used"] == 1
+    assert item["max_views"] == 3
+    assert item["revoked"] is False
+
+
+def test_client_consume_deletes_on_final_view(stubbed_repository):
+    repository, stubber = stubbed_repository
+    stubber.add_response(
+        "delete_item",
+        {"Attributes": _stored(0, 1)},
+        {
+            "TableName": "secure-secrets",
+            "Key": {"token_hash": {"S": "hash"}},
+            "ConditionExpression": ANY,
+            "ExpressionAttributeValues": {
+                ":now": ANY,
+                ":false": {"BOOL": False},
+                ":one": {"N": "1"},
+            },
+            "ReturnValues": "ALL_OLD",
+            "ReturnValuesOnConditionCheckFailure": "ALL_OLD",
+        },
+    )
+
+    status, item = repository.consume("hash")
+
+    assert status == "consumed_and_deleted"
+    assert item["views_used"] == 1 and item["ciphertext"] == "c"
+
+
+def test_client_consume_distinguishes_not_found_and_not_allowed(stubbed_repository):
+    repository, stubber = stubbed_repository
+    stubber.add_client_error("delete_item", service_error_code="ConditionalCheckFailedException")
+    stubber.add_client_error(
+        "delete_item",
+        service_error_code="ConditionalCheckFailedException",
+        modeled_fields={"Item": _stored(1, 1)},
+    )
+
+    assert repository.consume("hash")[0] == "not_found"
+    assert repository.consume("hash")[0] == "not_allowed"
+
+
+def test_get_table_selects_client_path_by_config(monkeypatch):
+    monkeypatch.setenv("TABLE_NAME", "secure-secrets")
+    monkeypatch.setenv("DYNAMODB_API", "client")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    dynamodb_repository.reset_table_cache()
+
+    try:
+        table = dynamodb_repository.get_table()
+        assert isinstance(table, ClientTable)
+        assert table.name == "secure-secrets"
+    finally:
+        dynamodb_repository.reset_table_cache()
+
+
+def test_client_batch_write_encodes_requests_and_decodes_unprocessed(stubbed_repository):
+    repository, stubber = stubbed_repository
+    stubber.add_response(
+        "batch_write_item",
+        {"UnprocessedItems": {"secure-secrets": [{"PutRequest": {"Item": _stored(0, 1)}}]}},
+        {"RequestItems": {"secure-secrets": [{"PutRequest": {"Item": _stored(0, 1)}}]}},
+    )
+    stubber.add_response("batch_write_item", {"UnprocessedItems": {}})
+    repository._sleep = lambda seconds: None
+
+    failed = repository.bulk_save([{
+        "token_hash": "hash",
+        "ciphertext": "c",
+        "key_id": "k1",
+        "expires_at": 9999,
+        "max_views": 1,
+        "views_used": 0,
+        "revoked": False,
+    }])
+
+    assert failed == []
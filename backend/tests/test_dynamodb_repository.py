@@ -0,0 +1,272 @@
+from botocore.exceptions import ClientError
+import pytest
+
+from infra.dynamodb_repository import DynamoDBSecretRepository
+
+
+def _conditional_failure(operation, item=None):
+    response = {"Error": {"Code": "ConditionalCheckFailedException"}}
+    if item is not None:
+        response["Item"] = item
+    return ClientError(response, operation)
+
+
+class FakeTable:
+    def __init__(self, update_result=None, update_error=None, delete_error=None, delete_results=()):
+        self.update_result = update_result
+        self.update_error = update_error
+        self.delete_error = delete_error
+        # Respostas (ou exceções) de cada delete_item, em ordem; depois valem delete_error/{}.
+        self.delete_results = list(delete_results)
+        self.calls = []
+
+    def get_item(self, **kwargs):
+        self.calls.append(("get_item", kwargs))
+        raise AssertionError("consume não deve fazer get_item")
+
+    def update_item(self, **kwargs):
+        self.calls.append(("update_item", kwargs))
+        if self.update_error:
+            raise self.update_error
+        return {"Attributes": self.update_result}
+
+    def delete_item(self, **kwargs):
+        self.calls.append(("delete_item", kwargs))
+        if self.delete_results:
+            result = self.delete_results.pop(0)
+            if isinstance(result, Exception):
+                raise result
+            return result
+        if self.delete_error:
+            raise self.delete_error
+        return {}
+
+
+def _stored(views_used, max_views, expires_at=4102444800):
+    # Item como vem no ALL_OLD de uma condição que falhou (AttributeValue cru).
+    return {
+        "token_hash": {"S": "hash"},
+        "views_used": {"N": str(views_used)},
+        "max_views": {"N": str(max_views)},
+        "expires_at": {"N": str(expires_at)},
+    }
+
+
+def test_consume_deletes_a_single_view_secret_in_a_single_call():
+    table = FakeTable(delete_results=[{"Attributes": {"views_used": 0, "max_views": 1, "ciphertext": "c"}}])
+    repository = DynamoDBSecretRepository(table)
+
+    status, item = repository.consume("hash")
+
+    assert status == "consumed_and_deleted"
+    assert item["ciphertext"] == "c" and item["views_used"] == 1
+    assert [name for name, _ in table.calls] == ["delete_item"]
+    kwargs = table.calls[0][1]
+    assert kwargs["ReturnValues"] == kwargs["ReturnValuesOnConditionCheckFailure"] == "ALL_OLD"
+    assert "attribute_exists(token_hash)" in kwargs["ConditionExpression"]
+    assert kwargs["ConditionExpression"].endswith("AND max_views = :one")
+
+
+def test_consume_increments_a_multi_view_secret_after_the_delete_attempt():
+    table = FakeTable(
+        delete_results=[_conditional_failure("DeleteItem", _stored(0, 3))],
+        update_result={"views_used": 1, "max_views": 3, "ciphertext": "c"},
+    )
+    repository = DynamoDBSecretRepository(table)
+
+    status, item = repository.consume("hash")
+
+    assert status == "consumed"
+    assert item["ciphertext"] == "c"
+    assert [name for name, _ in table.calls] == ["delete_item", "update_item"]
+    assert table.calls[1][1]["ReturnValuesOnConditionCheckFailure"] == "ALL_OLD"
+
+
+def test_consume_final_view_of_a_multi_view_secret_is_a_conditional_delete():
+    table = FakeTable(delete_results=[
+        _conditional_failure("DeleteItem", _stored(2, 3)),
+        {"Attributes": {"views_used": 2, "max_views": 3, "ciphertext": "c"}},
+    ])
+    repository = DynamoDBSecretRepository(table)
+
+    status, item = repository.consume("hash")
+
+    assert status == "consumed_and_deleted"
+    assert item["views_used"] == 3
+    assert [name for name, _ in table.calls] == ["delete_item", "delete_item"]
+    kwargs = table.calls[1][1]
+    assert kwargs["ConditionExpression"].endswith("AND views_used = :seen")
+    assert kwargs["ExpressionAttributeValues"][":seen"] == 2
+
+
+def test_consume_ignores_concurrent_delete_on_final_view():
+    # Outra leitura levou a penúltima visualização entre o delete e o incremento.
+    table = FakeTable(
+        delete_results=[_conditional_failure("DeleteItem", _stored(1, 3))],
+        update_result={"views_used": 3, "max_views": 3},
+        delete_error=_conditional_failure("DeleteItem"),
+    )
+    repository = DynamoDBSecretRepository(table)
+
+    status, _ = repository.consume("hash")
+
+    assert status == "consumed_and_deleted"
+    assert [name for name, _ in table.calls] == ["delete_item", "update_item", "delete_item"]
+    assert table.calls[2][1]["ConditionExpression"] == "views_used >= max_views"
+
+
+def test_consume_returns_not_found_when_condition_fails_without_item():
+    table = FakeTable(delete_error=_conditional_failure("DeleteItem"))
+    repository = DynamoDBSecretRepository(table)
+
+    status, item = repository.consume("hash")
+
+    assert status == "not_found"
+    assert item == {}
+    assert [name for name, _ in table.calls] == ["delete_item"]
+
+
+@pytest.mark.parametrize("stored", [_stored(1, 1), _stored(0, 3, expires_at=1)])
+def test_consume_returns_not_allowed_when_condition_fails_with_item(stored):
+    table = FakeTable(delete_error=_conditional_failure("DeleteItem", stored))
+    repository = DynamoDBSecretRepository(table)
+
+    status, item = repository.consume("hash")
+
+    assert status == "not_allowed"
+    assert item == {}
+    assert [name for name, _ in table.calls] == ["delete_item"]
+
+
+def test_reencrypt_secret_is_conditional_on_the_old_key():
+    table = FakeTable(update_result={})
+    repository = DynamoDBSecretRepository(table)
+
+    assert repository.reencrypt("hash", "k1", "k2", "novo") is True
+
+    kwargs = table.calls[0][1]
+    assert "key_id = :old_key_id" in kwargs["ConditionExpression"]
+    assert kwargs["ExpressionAttributeValues"][":new_key_id"] == "k2"
+    assert kwargs["ExpressionAttributeValues"][":ciphertext"] == "novo"
+
+
+def test_reencrypt_secret_handles_legacy_items_and_lost_races():
+    table = FakeTable(update_error=_conditional_failure("UpdateItem"))
+    repository = DynamoDBSecretRepository(table)
+
+    assert repository.reencrypt("hash", None, "k2", "novo") is False
+    assert "attribute_not_exists(key_id)" in table.calls[0][1]["ConditionExpression"]
+
+
+def test_reencrypt_secret_raises_other_client_errors():
+    table = FakeTable(update_error=ClientError({"Error": {"Code": "ProvisionedThroughputExceededException"}}, "UpdateItem"))
+    repository = DynamoDBSecretRepository(table)
+
+    with pytest.raises(ClientError):
+        repository.reencrypt("hash", "k1", "k2", "novo")
+
+
+def test_revoke_flags_existing_item():
+    table = FakeTable(update_result={})
+    repository = DynamoDBSecretRepository(table)
+
+    assert repository.revoke("hash") is True
+    assert table.calls[0][1]["UpdateExpression"] == "SET revoked = :true"
+
+
+def test_revoke_returns_false_for_unknown_token():
+    table = FakeTable(update_error=_conditional_failure("UpdateItem"))
+    repository = DynamoDBSecretRepository(table)
+
+    assert repository.revoke("hash") is False
+
+
+def test_revoke_with_token_flags_the_item_when_the_delete_fails():
+    throttled = ClientError({"Error": {"Code": "ProvisionedThroughputExceededException"}}, "DeleteItem")
+    table = FakeTable(update_result={}, delete_error=throttled)
+    repository = DynamoDBSecretRepository(table)
+
+    assert repository.revoke_with_token("hash", "rh") == "revoked"
+    update = table.calls[1][1]
+    assert update["UpdateExpression"] == "SET revoked = :true"
+    assert update["ConditionExpression"] == table.calls[0][1]["ConditionExpression"]
+    assert update["ExpressionAttributeValues"][":revoke_hash"] == "rh"
+
+
+def test_revoke_with_token_reports_wrong_token_and_unknown_secret():
+    repository = DynamoDBSecretRepository(FakeTable(delete_error=_conditional_failure("DeleteItem", {"token_hash": {"S": "hash"}})))
+    assert repository.revoke_with_token("hash", "rh") == "forbidden"
+
+    repository = DynamoDBSecretRepository(FakeTable(delete_error=_conditional_failure("DeleteItem")))
+    assert repository.revoke_with_token("hash", "rh") == "not_found"
+
+
+class FakeBatchClient:
+    def __init__(self, unprocessed_rounds=0):
+        self.unprocessed_rounds = unprocessed_rounds
+        self.requests = []
+
+    def batch_write_item(self, RequestItems):
+        requests = RequestItems["secure-secrets"]
+        self.requests.append(len(requests))
+        if self.unprocessed_rounds:
+            self.unprocessed_rounds -= 1
+            return {"UnprocessedItems": {"secure-secrets": requests[-1:]}}
+        return {"UnprocessedItems": {}}
+
+
+class FakeMeta:
+    def __init__(self, client):
+        self.client = client
+
+
+def test_bulk_save_writes_in_chunks_of_25():
+    table = FakeTable()
+    table.name = "secure-secrets"
+    table.meta = FakeMeta(FakeBatchClient())
+    repository = DynamoDBSecretRepository(table, sleep=lambda s: None)
+
+    failed = repository.bulk_save([{"token_hash": str(i)} for i in range(60)])
+
+    assert failed == []
+    assert table.meta.client.requests == [25, 25, 10]
+
+
+def test_bulk_save_retries_unprocessed_items_with_backoff():
+    sleeps = []
+    table = FakeTable()
+    table.name = "secure-secrets"
+    table.meta = FakeMeta(FakeBatchClient(unprocessed_rounds=2))
+    repository = DynamoDBSecretRepository(table, sleep=sleeps.append)
+
+    failed = repository.bulk_save([{"token_hash": str(i)} for i in range(3)])
+
+    assert failed == []
+    assert table.meta.client.requests == [3, 1, 1]
+    assert len(sleeps) == 2
+
+
+def test_bulk_save_returns_items_still_unprocessed_after_retries():
+    table = FakeTable()
+    table.name = "secure-secrets"
+    table.meta = FakeMeta(FakeBatchClient(unprocessed_rounds=100))
+    repository = DynamoDBSecretRepository(table, sleep=lambda s: None)
+
+    failed = repository.bulk_save([{"token_hash": "a"}, {"token_hash": "b"}])
+
+    assert failed == [{"token_hash": "b"}]
+
+
+def test_resource_decimals_are_converted_once_in_the_repository():
+    from decimal import Decimal
+
+    table = FakeTable(
+        delete_results=[_conditional_failure("DeleteItem", _stored(0, 3))],
+        update_result={"views_used": Decimal("1"), "max_views": Decimal("3"), "expires_at": Decimal("9999")},
+    )
+    repository = DynamoDBSecretRepository(table)
+
+    _, item = repository.consume("hash")
+
+    assert item == {"views_used": 1, "max_views": 3, "expires_at": 9999}
+    assert all(type(value) is int for value in item.values())
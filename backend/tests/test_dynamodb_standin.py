@@ -0,0 +1,103 @@
+import boto3
+import pytest
+
+from benchmarks.dynamodb_standin import endpoint_url, start_standin
+from infra.dynamodb_client import ClientTable
+from infra.dynamodb_repository import DynamoDBSecretRepository
+
+
+@pytest.fixture(scope="module")
+def standin():
+    server, standin = start_standin()
+    yield server, standin
+    server.shutdown()
+
+
+def _boto_kwargs(server):
+    return {
+        "endpoint_url": endpoint_url(server),
+        "region_name": "us-east-1",
+        "aws_access_key_id": "test",
+        "aws_secret_access_key": "test",
+    }
+
+
+@pytest.fixture(params=["resource", "client"])
+def repository(request, standin):
+    server, _ = standin
+    if request.param == "client":
+        table = ClientTable(boto3.client("dynamodb", **_boto_kwargs(server)), "secure-secrets")
+    else:
+        table = boto3.resource("dynamodb", **_boto_kwargs(server)).Table("secure-secrets")
+    return DynamoDBSecretRepository(table, sleep=lambda seconds: None)
+
+
+def _item(token_hash, max_views=2, expires_at=4102444800):
+    return {
+        "token_hash": token_hash,
+        "ciphertext": "c",
+        "key_id": "k1",
+        "expires_at": expires_at,
+        "max_views": max_views,
+        "views_used": 0,
+        "revoked": False,
+    }
+
+
+def test_consume_lifecycle_against_standin(repository):
+    repository.save(_item("lifecycle"))
+
+    assert repository.consume("lifecycle")[0] == "consumed"
+    assert repository.consume("lifecycle")[0] == "consumed_and_deleted"
+    assert repository.get("lifecycle") is None
+    assert repository.consume("lifecycle")[0] == "not_found"
+
+
+def test_expired_and_revoked_items_are_not_allowed(repository):
+    repository.save(_item("expired", expires_at=1))
+    repository.save(_item("revoked"))
+    repository.revoke("revoked")
+
+    assert repository.consume("expired")[0] == "not_allowed"
+    assert repository.consume("revoked")[0] == "not_allowed"
+    assert repository.revoke("missing") is False
+
+
+def test_revoke_with_token_deletes_only_with_the_right_token(repository):
+    repository.save({**_item("revocable"), "revoke_hash": "rh"})
+    repository.save(_item("legacy"))
+
+    assert repository.revoke_with_token("revocable", "outro") == "forbidden"
+    assert repository.revoke_with_token("legacy", "rh") == "forbidden"
+    assert repository.revoke_with_token("revocable", "rh") == "deleted"
+    assert repository.get("revocable") is None
+    assert repository.revoke_with_token("revocable", "rh") == "not_found"
+
+
+def test_reencrypt_and_bulk_save_against_standin(repository):
+    assert repository.bulk_save([_item(f"bulk-{i}") for i in range(30)]) == []
+
+    assert repository.reencrypt("bulk-3", "k1", "k2", "novo") is True
+    assert repository.reencrypt("bulk-3", "k1", "k2", "outro") is False
+    assert int(repository.get("bulk-3")["views_used"]) == 0
+    assert repository.get("bulk-3")["key_id"] == "k2"
+
+
+def test_iter_live_token_hashes_skips_dead_items(repository, standin):
+    _, stub = standin
+    stub.tables["secure-secrets"].clear()
+    for i in range(5):
+        repository.save(_item(f"live-{i}"))
+    repository.save(_item("dead", expires_at=1))
+
+    assert sorted(repository.iter_live_token_hashes()) == [f"live-{i}" for i in range(5)]
+
+
+def test_peek_projects_metadata_only(repository, standin):
+    repository.save(_item("peek"))
+
+    meta = repository.peek("peek")
+
+    assert meta == {"expires_at": 4102444800, "max_views": 2, "views_used": 0, "revoked": False}
+    assert repository.get("peek")["views_used"] == 0
+    assert repository.peek("missing") is None
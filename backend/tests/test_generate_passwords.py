@@ -0,0 +1,42 @@
+import json
+
+from infra.password_generator import DIGITS
+from usecases.generate_passwords import generate_passwords
+
+
+def _event(body, count=None):
+    event = {"body": json.dumps(body)}
+    if count is not None:
+        event["queryStringParameters"] = {"count": str(count)}
+    return event
+
+
+def test_generate_returns_requested_count():
+    resp = generate_passwords(_event({"use_letters": False, "use_punctuation": False, "pass_length": 10}, 25))
+
+    passwords = json.loads(resp["body"])["passwords"]
+    assert resp["statusCode"] == 200
+    assert len(passwords) == 25
+    assert all(len(p) == 10 and set(p) <= set(DIGITS) for p in passwords)
+
+
+def test_generate_defaults_to_a_single_password():
+    resp = generate_passwords(_event({}))
+
+    assert len(json.loads(resp["body"])["passwords"]) == 1
+
+
+def test_generate_rejects_invalid_count_and_policy():
+    assert generate_passwords(_event({}, 0))["statusCode"] == 400
+    assert generate_passwords(_event({}, "abc"))["statusCode"] == 400
+    assert generate_passwords(_event({}, 1001))["statusCode"] == 400
+    assert generate_passwords(_event({"pass_length": 3}, 2))["statusCode"] == 400
+
+
+def test_generate_passphrases_reports_entropy():
+    resp = generate_passwords(_event({"pass_mode": "passphrase", "pass_words": 4}, 3))
+
+    body = json.loads(resp["body"])
+    assert resp["statusCode"] == 200
+    assert [len(p.split("-")) for p in body["passwords"]] == [4, 4, 4]
+    assert body["entropy_bits"] == 51.7
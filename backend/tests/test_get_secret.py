@@ -59,7 +59,8 @@ def test_get_secret_success_decrypts_and_returns_remaining_views(monkeypatch):
     "usecases.get_secret.consume_view_and_maybe_delete",
     lambda token_hash: ("consumed", item),
 )
-    monkeypatch.setattr("usecases.get_secret.decrypt", lambda c: "MEU_SEGREDO")
+    monkeypatch.setattr("usecases.get_secret.decrypt", lambda c, key_id=None: "MEU_SEGREDO")
+    monkeypatch.setattr("usecases.get_secret.needs_reencryption", lambda key_id: False)
 
     resp = get_secret({"pathParameters": {"pwdId": "tok123"}})
 
@@ -69,4 +70,78 @@ def test_get_secret_success_decrypts_and_returns_remaining_views(monkeypatch):
     assert body["pwdId"] == "tok123"
     assert body["pwd"] == "MEU_SEGREDO"
     assert body["expiration_date"] == 9999
-    assert body["view_count"] == 2
\ No newline at end of file
+    assert body["view_count"] == 2
+
+def test_get_secret_reencrypts_item_on_old_key_when_views_remain(monkeypatch):
+    monkeypatch.setattr("usecases.get_secret.get_path_param", lambda event, key: "tok123")
+    monkeypatch.setattr("usecases.get_secret.sha256_hex", lambda s: "hash:tok123")
+
+    item = {"ciphertext": "enc:old", "key_id": "k1", "expires_at": 9999, "views_used": 1, "max_views": 3}
+    rewrites = []
+
+    monkeypatch.setattr(
+        "usecases.get_secret.consume_view_and_maybe_delete",
+        lambda token_hash: ("consumed", item),
+    )
+    monkeypatch.setattr("usecases.get_secret.decrypt", lambda c, key_id=None: f"plain:{key_id}")
+    monkeypatch.setattr("usecases.get_secret.needs_reencryption", lambda key_id: key_id != "k2")
+    monkeypatch.setattr("usecases.get_secret.encrypt_with_key_id", lambda s: ("k2", f"enc2:{s}"))
+    monkeypatch.setattr(
+        "usecases.get_secret.reencrypt_secret",
+        lambda *args: rewrites.append(args) or True,
+    )
+
+    resp = get_secret({"pathParameters": {"pwdId": "tok123"}})
+
+    assert resp["statusCode"] == 200
+    assert _body(resp)["pwd"] == "plain:k1"
+    assert rewrites == [("hash:tok123", "k1", "k2", "enc2:plain:k1")]
+
+
+def test_get_secret_does_not_reencrypt_deleted_item(monkeypatch):
+    monkeypatch.setattr("usecases.get_secret.get_path_param", lambda event, key: "tok123")
+    monkeypatch.setattr("usecases.get_secret.sha256_hex", lambda s: "hash:tok123")
+
+    item = {"ciphertext": "enc:old", "expires_at": 9999, "views_used": 1, "max_views": 1}
+
+    monkeypatch.setattr(
+        "usecases.get_secret.consume_view_and_maybe_delete",
+        lambda token_hash: ("consumed_and_deleted", item),
+    )
+    monkeypatch.setattr("usecases.get_secret.decrypt", lambda c, key_id=None: "MEU_SEGREDO")
+    monkeypatch.setattr("usecases.get_secret.needs_reencryption", lambda key_id: True)
+
+    rewrites = []
+    monkeypatch.setattr("usecases.get_secret.reencrypt_secret", lambda *args: rewrites.append(args))
+
+    resp = get_secret({"pathParameters": {"pwdId": "tok123"}})
+
+    assert resp["statusCode"] == 200
+    assert _body(resp)["view_count"] == 0
+    # Item apagado não é recriptografado.
+    assert rewrites == []
+
+
+def test_get_secret_returns_the_secret_when_reencrypt_fails(monkeypatch):
+    monkeypatch.setattr("usecases.get_secret.get_path_param", lambda event, key: "tok123")
+    monkeypatch.setattr("usecases.get_secret.sha256_hex", lambda s: "hash:tok123")
+
+    item = {"ciphertext": "enc:old", "key_id": "k1", "expires_at": 9999, "views_used": 1, "max_views": 3}
+
+    monkeypatch.setattr(
+        "usecases.get_secret.consume_view_and_maybe_delete",
+        lambda token_hash: ("consumed", item),
+    )
+    monkeypatch.setattr("usecases.get_secret.decrypt", lambda c, key_id=None: "MEU_SEGREDO")
+    monkeypatch.setattr("usecases.get_secret.needs_reencryption", lambda key_id: True)
+    monkeypatch.setattr("usecases.get_secret.encrypt_with_key_id", lambda s: ("k2", f"enc2:{s}"))
+
+    def throttled(*args):
+        raise RuntimeError("ProvisionedThroughputExceededException")
+
+    monkeypatch.setattr("usecases.get_secret.reencrypt_secret", throttled)
+
+    resp = get_secret({"pathParameters": {"pwdId": "tok123"}})
+
+    assert resp["statusCode"] == 200
+    assert _body(resp)["pwd"] == "MEU_SEGREDO"
@@ -0,0 +1,43 @@
+import importlib
+import json
+import sys
+
+import pytest
+
+from utils import http
+
+
+def test_json_response_uses_premerged_headers():
+    resp = http.json_response(201, {"pwdId": "abc"})
+
+    assert resp["statusCode"] == 201
+    assert json.loads(resp["body"]) == {"pwdId": "abc"}
+    assert resp["headers"]["Content-Type"] == "application/json"
+    assert resp["headers"]["Access-Control-Allow-Origin"] == http.CORS_HEADERS["Access-Control-Allow-Origin"]
+
+    resp["headers"]["X-Extra"] = "1"
+    assert "X-Extra" not in http.RESPONSE_HEADERS
+    with pytest.raises(TypeError):
+        http.RESPONSE_HEADERS["X-Extra"] = "1"
+
+
+def test_constant_response_reuses_encoded_body():
+    not_found = http.constant_response(404, {"message": "Link inválido"})
+
+    first, second = not_found(), not_found()
+
+    assert first == second
+    assert first is not second
+    assert first["body"] is second["body"]
+    assert json.loads(first["body"]) == {"message": "Link inválido"}
+
+
+def test_stdlib_fallback_when_fast_encoder_missing(monkeypatch):
+    monkeypatch.setitem(sys.modules, "orjson", None)
+    try:
+        fallback = importlib.reload(http)
+        assert fallback.orjson is None
+        assert json.loads(fallback.json_response(200, {"pwd": "ção"})["body"]) == {"pwd": "ção"}
+    finally:
+        monkeypatch.undo()
+        importlib.reload(http)
@@ -0,0 +1,132 @@
+import asyncio
+import http.client
+import json
+import os
+import signal
+import subprocess
+import sys
+import threading
+
+import pytest
+
+from infra import crypto_service, pwd_repository
+from server.http_server import LambdaHTTPServer
+from utils.apigw import http_event
+
+BACKEND_DIR = os.path.join(os.path.dirname(__file__), "..")
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    monkeypatch.setenv("PWD_BACKEND", "sqlite")
+    monkeypatch.setenv("SQLITE_PATH", str(tmp_path / "secrets.db"))
+    monkeypatch.setenv("ENCRYPTION_KEY", "_nQF7e7aQoiHjpBMYg99Gwm5_6dpfwnt7_BL4Y7c2Og=")
+    monkeypatch.delenv("ENCRYPTION_KEYS", raising=False)
+    pwd_repository.set_repository(None)
+    crypto_service.reset_cipher_cache()
+
+    srv = LambdaHTTPServer(("127.0.0.1", 0), workers=2, quiet=True)
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    yield srv
+    srv.shutdown()
+    srv.drain()
+    pwd_repository.set_repository(None)
+
+
+def _request(conn, method, path, body=None):
+    headers = {"Content-Type": "application/json"} if body is not None else {}
+    conn.request(method, path, body=json.dumps(body) if body is not None else None, headers=headers)
+    response = conn.getresponse()
+    return response.status, response.getheaders(), response.read()
+
+
+def test_http_event_translates_query_string_and_cookies():
+    event = http_event(
+        "POST", "/pwd/generate", "/pwd/generate",
+        headers={"Cookie": "a=1; b=2", "X-Test": "x"},
+        raw_query_string="count=3&tag=a&tag=b",
+    )
+
+    assert event["routeKey"] == "POST /pwd/generate"
+    assert event["queryStringParameters"] == {"count": "3", "tag": "a,b"}
+    assert event["cookies"] == ["a=1", "b=2"]
+    assert event["headers"] == {"x-test": "x"}
+
+
+def test_create_and_get_over_one_keep_alive_connection(server):
+    conn = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=5)
+
+    status, _, body = _request(conn, "POST", "/pwd", {
+        "sended_password": "s3cr3t", "expiration_in_seconds": 300, "pass_view_limit": 1,
+    })
+    assert status == 201
+    pwd_id = json.loads(body)["pwdId"]
+
+    status, _, body = _request(conn, "GET", f"/pwd/{pwd_id}")
+    assert status == 200
+    assert json.loads(body)["pwd"] == "s3cr3t"
+
+    status, _, _ = _request(conn, "GET", f"/pwd/{pwd_id}")
+    assert status == 404
+    conn.close()
+
+
+def test_unknown_route_and_query_string(server):
+    conn = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=5)
+
+    status, _, body = _request(conn, "GET", "/nope")
+    assert status == 404
+    assert json.loads(body) == {"message": "Not Found"}
+
+    status, _, body = _request(conn, "POST", "/pwd/generate?count=3", {"pass_length": 12})
+    assert status == 200
+    assert len(json.loads(body)["passwords"]) == 3
+    conn.close()
+
+
+def test_asyncio_server_keeps_connection_alive():
+    from server.async_server import AsyncLambdaServer
+
+    async def scenario():
+        srv = AsyncLambdaServer(quiet=True)
+        await srv.start("127.0.0.1", 0)
+        reader, writer = await asyncio.open_connection("127.0.0.1", srv.port)
+        responses = []
+        for path in ("/health", "/nope", "/health"):
+            writer.write(f"GET {path} HTTP/1.1\r\nHost: x\r\n\r\n".encode())
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = int(head.split(b"Content-Length: ")[1].split(b"\r\n")[0])
+            responses.append((head.split(b" ")[1], await reader.readexactly(length)))
+        writer.close()
+        await srv.drain(grace_seconds=1)
+        return responses
+
+    responses = asyncio.run(scenario())
+
+    assert [status for status, _ in responses] == [b"200", b"404", b"200"]
+    assert json.loads(responses[0][1]) == {"status": "ok"}
+
+
+@pytest.mark.parametrize("mode", ["process", "asyncio"])
+def test_server_mode_serves_and_stops_on_sigterm(mode):
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "server", "--port", "0", "--mode", mode, "--workers", "1"],
+        cwd=BACKEND_DIR,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    try:
+        port = int(proc.stdout.readline().split("http://127.0.0.1:")[1].split()[0])
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+        status, _, body = _request(conn, "GET", "/health")
+        assert status == 200
+        assert json.loads(body) == {"status": "ok"}
+        conn.close()
+
+        proc.send_signal(signal.SIGTERM)
+        assert proc.wait(timeout=15) == 0
+    finally:
+        if proc.poll() is None:
+            proc.kill()
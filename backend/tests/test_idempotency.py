@@ -0,0 +1,308 @@
+import asyncio
+import json
+
+import boto3
+import pytest
+from botocore.config import Config
+
+from benchmarks.dynamodb_standin import DynamoDBStandIn, endpoint_url, start_standin
+from infra import async_repository, crypto_service
+from infra.dynamodb_client import ClientTable
+from infra.idempotency import (
+    DynamoDBIdempotencyStore,
+    Idempotency,
+    IdempotencyRecord,
+    IdempotencyUnavailable,
+    InMemoryIdempotencyStore,
+)
+from usecases.async_secrets import create_secret_async
+from usecases.create_secret import create_secret
+
+
+class FakeClock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def _record(fingerprint="fp", expires_at=1_000_900):
+    return IdempotencyRecord(fingerprint, "hash", "k1", "enc", expires_at)
+
+
+def test_claim_keeps_pending_records_out_of_the_cache_until_completed():
+    store = InMemoryIdempotencyStore()
+    idempotency = Idempotency(store, clock=FakeClock())
+
+    assert idempotency.claim("k", _record("a")) is None
+    pending = idempotency.claim("k", _record("b"))
+    assert pending.fingerprint == "a" and not pending.completed
+    assert idempotency.lookup("k") is None
+
+    idempotency.complete("k", _record("a"))
+    assert idempotency.claim("k", _record("b")).completed
+    assert idempotency.lookup("k").fingerprint == "a"
+    assert store.records["k"].expires_at == 1_000_000 + idempotency.ttl_seconds
+
+    idempotency.release("k")
+    assert idempotency.lookup("k") is None
+    assert store.records == {}
+
+
+def test_lookup_drops_expired_entries_and_evicts_lru():
+    clock = FakeClock()
+    idempotency = Idempotency(InMemoryIdempotencyStore(), ttl_seconds=900, cache_size=2, clock=clock)
+    for key in ("a", "b"):
+        idempotency.claim(key, _record())
+        idempotency.complete(key, _record())
+    idempotency.lookup("a")
+    idempotency.claim("c", _record())
+    idempotency.complete("c", _record())
+
+    assert list(idempotency.cache) == ["a", "c"]
+
+    clock.now = 1_000_900
+    assert idempotency.lookup("a") is None
+    # Expirado também no store: a chave pode ser reutilizada.
+    assert idempotency.claim("a", _record("novo", expires_at=1_001_800)) is None
+
+
+def test_in_memory_store_drops_expired_records_and_stays_bounded():
+    store = InMemoryIdempotencyStore(max_records=3)
+    store.put_if_absent("a", _record(expires_at=100), 0)
+    store.put_if_absent("b", _record(expires_at=200), 0)
+
+    store.put_if_absent("c", _record(expires_at=300), 150)
+    assert list(store.records) == ["b", "c"]
+
+    for key in ("d", "e", "f"):
+        store.put_if_absent(key, _record(expires_at=400), 160)
+    assert list(store.records) == ["d", "e", "f"]
+
+
+@pytest.fixture
+def dynamodb_table():
+    server, standin = start_standin(DynamoDBStandIn(tables={"secure-idempotency": "idempotency_key"}))
+    client = boto3.client(
+        "dynamodb",
+        endpoint_url=endpoint_url(server),
+        region_name="us-east-1",
+        aws_access_key_id="test",
+        aws_secret_access_key="test",
+    )
+    yield ClientTable(client, "secure-idempotency"), standin
+    server.shutdown()
+
+
+def test_dynamodb_store_is_conditional_and_returns_the_winner(dynamodb_table):
+    table, standin = dynamodb_table
+    store = DynamoDBIdempotencyStore(table)
+
+    assert store.put_if_absent("k", _record("a"), 1_000_000) is None
+    assert store.put_if_absent("k", _record("b"), 1_000_000) == _record("a")
+    assert store.put_if_absent("k", _record("c", 1_002_000), 1_000_900) is None
+    assert store.put_if_absent("k", _record("d"), 1_001_000).fingerprint == "c"
+    assert standin.calls["PutItem"] == 4
+
+    store.complete("k", _record("c", 1_002_000)._replace(completed=True))
+    assert store.put_if_absent("k", _record("d"), 1_001_000).completed
+    # Outro dono (token_hash diferente): não sobrescreve.
+    store.complete("k", IdempotencyRecord("x", "outro", "k1", "enc", 1_003_000, True))
+    assert store.put_if_absent("k", _record("d"), 1_001_000).fingerprint == "c"
+
+    store.delete("k")
+    assert store.put_if_absent("k", _record("e"), 1_001_000) is None
+
+
+def test_dynamodb_store_reports_a_missing_table_as_unavailable(dynamodb_table):
+    table, _ = dynamodb_table
+    store = DynamoDBIdempotencyStore(ClientTable(table.client, "tabela-inexistente"))
+
+    with pytest.raises(IdempotencyUnavailable):
+        store.put_if_absent("k", _record(), 1_000_000)
+
+
+def test_dynamodb_store_reports_timeouts_as_unavailable():
+    # Nada escuta na porta 9: erro de conexão (BotoCoreError), não ClientError.
+    client = boto3.client(
+        "dynamodb",
+        endpoint_url="http://127.0.0.1:9",
+        region_name="us-east-1",
+        aws_access_key_id="test",
+        aws_secret_access_key="test",
+        config=Config(connect_timeout=0.2, retries={"max_attempts": 1}),
+    )
+    store = DynamoDBIdempotencyStore(ClientTable(client, "secure-idempotency"))
+
+    for call in (
+        lambda: store.put_if_absent("k", _record(), 1_000_000),
+        lambda: store.complete("k", _record()),
+        lambda: store.delete("k"),
+    ):
+        with pytest.raises(IdempotencyUnavailable):
+            call()
+
+
+@pytest.fixture
+def fresh_idempotency(monkeypatch):
+    monkeypatch.setenv("ENCRYPTION_KEY", "_nQF7e7aQoiHjpBMYg99Gwm5_6dpfwnt7_BL4Y7c2Og=")
+    monkeypatch.delenv("ENCRYPTION_KEYS", raising=False)
+    crypto_service.reset_cipher_cache()
+    idempotency = Idempotency(InMemoryIdempotencyStore())
+    monkeypatch.setattr("usecases.create_secret.get_idempotency", lambda: idempotency)
+    return idempotency
+
+
+def _event(body, key="chave-1"):
+    return {"body": json.dumps(body), "headers": {"Idempotency-Key": key}}
+
+
+def test_retry_replays_the_original_response_without_writing(monkeypatch, fresh_idempotency):
+    saved = []
+    monkeypatch.setattr("usecases.create_secret.save_secret", saved.append)
+    body = {"expiration_in_seconds": 60, "pass_view_limit": 1}
+
+    first = create_secret(_event(body))
+    retry = create_secret(_event(body))
+
+    assert first["statusCode"] == retry["statusCode"] == 201
+    assert json.loads(retry["body"]) == json.loads(first["body"])
+    assert retry["headers"]["Idempotent-Replayed"] == "true"
+    assert "Idempotent-Replayed" not in first["headers"]
+    assert len(saved) == 1
+
+
+def test_concurrent_retry_in_other_container_replays_from_the_store(monkeypatch, fresh_idempotency):
+    saved = []
+    monkeypatch.setattr("usecases.create_secret.save_secret", saved.append)
+    body = {"expiration_in_seconds": 60, "pass_view_limit": 1}
+
+    first = create_secret(_event(body))
+    fresh_idempotency.cache.clear()
+    # O claim perde para o registro existente antes de montar/cifrar o segredo.
+    for name in ("build_item", "parse_create_spec", "encrypt_with_key_id"):
+        monkeypatch.setattr(
+            f"usecases.create_secret.{name}",
+            lambda *args: (_ for _ in ()).throw(AssertionError("não deveria gerar nem cifrar nada")),
+        )
+    retry = create_secret(_event(body))
+
+    assert json.loads(retry["body"]) == json.loads(first["body"])
+    assert len(saved) == 1
+
+
+def test_claim_carries_no_response_until_the_save_completes(monkeypatch, fresh_idempotency):
+    claims = []
+
+    def save(item):
+        claims.append(next(iter(fresh_idempotency.store.records.values())))
+
+    monkeypatch.setattr("usecases.create_secret.save_secret", save)
+    first = create_secret(_event({"expiration_in_seconds": 60, "pass_view_limit": 1}))
+
+    assert claims[0].response == "" and not claims[0].completed
+    completed = next(iter(fresh_idempotency.store.records.values()))
+    assert completed.completed and completed.response
+    assert json.loads(first["body"])["pwdId"]
+
+
+def test_invalid_body_releases_the_claim(fresh_idempotency):
+    resp = create_secret(_event({"expiration_in_seconds": 0}))
+
+    assert resp["statusCode"] == 400
+    assert fresh_idempotency.store.records == {}
+
+
+def test_retry_while_the_first_save_runs_gets_409(monkeypatch, fresh_idempotency):
+    body = {"expiration_in_seconds": 60, "pass_view_limit": 1}
+    during_save = []
+
+    def slow_save(item):
+        during_save.append(create_secret(_event(body)))
+
+    monkeypatch.setattr("usecases.create_secret.save_secret", slow_save)
+
+    first = create_secret(_event(body))
+
+    assert during_save[0]["statusCode"] == 409
+    assert during_save[0]["headers"]["Retry-After"] == "1"
+    assert first["statusCode"] == 201
+    assert create_secret(_event(body))["body"] == first["body"]
+
+
+def test_same_key_with_another_body_is_rejected(monkeypatch, fresh_idempotency):
+    monkeypatch.setattr("usecases.create_secret.save_secret", lambda item: None)
+    create_secret(_event({"expiration_in_seconds": 60, "pass_view_limit": 1}))
+
+    resp = create_secret(_event({"expiration_in_seconds": 60, "pass_view_limit": 2}))
+
+    assert resp["statusCode"] == 422
+    assert "Idempotency-Key" in json.loads(resp["body"])["message"]
+
+
+def test_failed_save_releases_the_key(monkeypatch, fresh_idempotency):
+    def failing_save(item):
+        raise RuntimeError("dynamodb fora")
+
+    monkeypatch.setattr("usecases.create_secret.save_secret", failing_save)
+    body = {"expiration_in_seconds": 60, "pass_view_limit": 1}
+
+    with pytest.raises(RuntimeError):
+        create_secret(_event(body))
+    assert fresh_idempotency.lookup("chave-1") is None
+    assert fresh_idempotency.store.records == {}
+
+    saved = []
+    monkeypatch.setattr("usecases.create_secret.save_secret", saved.append)
+    assert create_secret(_event(body))["statusCode"] == 201
+    assert len(saved) == 1
+
+
+def test_failed_release_keeps_the_original_error(monkeypatch, fresh_idempotency):
+    def failing_save(item):
+        raise RuntimeError("dynamodb fora")
+
+    def failing_delete(key):
+        raise IdempotencyUnavailable("RequestTimeout")
+
+    monkeypatch.setattr("usecases.create_secret.save_secret", failing_save)
+    monkeypatch.setattr(fresh_idempotency.store, "delete", failing_delete)
+
+    with pytest.raises(RuntimeError, match="dynamodb fora"):
+        create_secret(_event({"expiration_in_seconds": 60, "pass_view_limit": 1}))
+
+
+def test_unavailable_store_creates_without_deduplication(monkeypatch, fresh_idempotency):
+    def unavailable(*args):
+        raise IdempotencyUnavailable("ResourceNotFoundException")
+
+    saved = []
+    monkeypatch.setattr("usecases.create_secret.save_secret", saved.append)
+    monkeypatch.setattr(fresh_idempotency.store, "put_if_absent", unavailable)
+    monkeypatch.setattr(fresh_idempotency.store, "delete", unavailable)
+    body = {"expiration_in_seconds": 60, "pass_view_limit": 1}
+
+    assert create_secret(_event(body))["statusCode"] == 201
+    assert create_secret(_event(body))["statusCode"] == 201
+    assert len(saved) == 2
+
+
+def test_invalid_key_is_rejected(fresh_idempotency):
+    resp = create_secret(_event({"expiration_in_seconds": 60, "pass_view_limit": 1}, key="x" * 256))
+
+    assert resp["statusCode"] == 400
+    assert fresh_idempotency.cache == {}
+
+
+def test_async_create_honours_the_key(monkeypatch, fresh_idempotency):
+    saved = []
+    monkeypatch.setattr("usecases.create_secret.save_secret", saved.append)
+    body = {"expiration_in_seconds": 60, "pass_view_limit": 1}
+
+    first = asyncio.run(create_secret_async(_event(body)))
+    retry = asyncio.run(create_secret_async(_event(body)))
+
+    assert json.loads(retry["body"]) == json.loads(first["body"])
+    assert len(saved) == 1
+    async_repository.shutdown_io_executor()
@@ -0,0 +1,23 @@
+import pytest
+
+from benchmarks.import_time_report import MODULE_BUDGETS, handler_modules, heavy_modules, imported_modules
+
+
+# Cada handler roteado (e o router) num interpretador limpo: o import a frio
+# não pode carregar boto3/botocore/cryptography nem passar do teto de módulos
+# de MODULE_BUDGETS. Checar sys.modules em vez de medir tempo evita falhas por
+# ruído da máquina.
+HANDLER_MODULES = handler_modules()
+
+
+def test_every_routed_handler_is_covered():
+    assert {"handlers.create_pwd_batch", "handlers.generate_pwd"} <= set(HANDLER_MODULES)
+    assert set(HANDLER_MODULES) <= set(MODULE_BUDGETS)
+
+
+@pytest.mark.parametrize("module", HANDLER_MODULES)
+def test_handler_import_stays_within_the_cold_start_budget(module):
+    loaded = imported_modules(module)
+
+    assert heavy_modules(loaded) == []
+    assert len(loaded) <= MODULE_BUDGETS[module], sorted(loaded)
@@ -0,0 +1,116 @@
+import boto3
+import pytest
+from cryptography.fernet import Fernet
+
+from benchmarks.dynamodb_standin import DynamoDBStandIn, endpoint_url, start_standin
+from benchmarks.item_size_report import compare, item_size
+from infra.dynamodb_client import ClientTable
+from infra.dynamodb_repository import DynamoDBSecretRepository
+from infra.item_schema import COMPACT_SCHEMA, LEGACY_SCHEMA
+from infra.migrating_repository import MigratingSecretRepository
+
+
+TOKEN_HASH = "ab" * 32
+
+
+def _item(token_hash=TOKEN_HASH, **extra):
+    return {
+        "token_hash": token_hash,
+        "ciphertext": Fernet(Fernet.generate_key()).encrypt(b"segredo").decode(),
+        "key_id": "k1",
+        "expires_at": 4102444800,
+        "max_views": 2,
+        "views_used": 0,
+        "revoked": False,
+        **extra,
+    }
+
+
+def test_compact_schema_roundtrip_uses_binary_and_short_names():
+    item = _item(revoke_hash="cd" * 32)
+
+    stored = COMPACT_SCHEMA.encode_item(dict(item))
+
+    assert set(stored) == {"h", "c", "k", "e", "m", "v", "r", "t"}
+    assert stored["h"] == bytes.fromhex(TOKEN_HASH)
+    assert isinstance(stored["c"], bytes)
+    assert COMPACT_SCHEMA.decode_item(stored) == item
+    assert item_size(stored) < item_size(LEGACY_SCHEMA.encode_item(dict(item)))
+
+
+def test_compact_schema_renames_attributes_but_not_placeholders():
+    expression = "SET ciphertext = :ciphertext, key_id = :new_key_id"
+
+    assert COMPACT_SCHEMA.expr(expression) == "SET c = :ciphertext, k = :new_key_id"
+    assert LEGACY_SCHEMA.expr(expression) == expression
+
+
+def test_size_report_shows_fewer_bytes_per_item():
+    report = compare(700, Fernet(Fernet.generate_key()))
+
+    assert report["saved_bytes"] > 0
+    assert report["v2_wcu"] < report["v1_wcu"]
+
+
+@pytest.fixture
+def tables():
+    server, _ = start_standin(DynamoDBStandIn(tables={"secure-secrets": "token_hash", "secure-secrets-v2": "h"}))
+    client = boto3.client(
+        "dynamodb",
+        endpoint_url=endpoint_url(server),
+        region_name="us-east-1",
+        aws_access_key_id="test",
+        aws_secret_access_key="test",
+    )
+    resource = boto3.resource(
+        "dynamodb",
+        endpoint_url=endpoint_url(server),
+        region_name="us-east-1",
+        aws_access_key_id="test",
+        aws_secret_access_key="test",
+    )
+    yield client, resource
+    server.shutdown()
+
+
+@pytest.mark.parametrize("api", ["resource", "client"])
+def test_compact_repository_lifecycle(tables, api):
+    client, resource = tables
+    table = ClientTable(client, "secure-secrets-v2") if api == "client" else resource.Table("secure-secrets-v2")
+    repository = DynamoDBSecretRepository(table, schema=COMPACT_SCHEMA)
+    item = _item()
+    repository.save(item)
+
+    assert repository.peek(TOKEN_HASH)["views_used"] == 0
+    assert repository.reencrypt(TOKEN_HASH, "k1", "k2", item["ciphertext"]) is True
+    assert list(repository.iter_live_token_hashes()) == [TOKEN_HASH]
+
+    status, consumed = repository.consume(TOKEN_HASH)
+    assert status == "consumed"
+    assert consumed["ciphertext"] == item["ciphertext"]
+    assert consumed["key_id"] == "k2"
+    assert repository.consume(TOKEN_HASH)[0] == "consumed_and_deleted"
+    assert repository.get(TOKEN_HASH) is None
+
+
+def test_migrating_repository_reads_legacy_items_and_writes_compact(tables):
+    client, _ = tables
+    primary = DynamoDBSecretRepository(ClientTable(client, "secure-secrets-v2"), schema=COMPACT_SCHEMA)
+    legacy = DynamoDBSecretRepository(ClientTable(client, "secure-secrets"))
+    repository = MigratingSecretRepository(primary, legacy)
+    legacy_hash, new_hash = "cd" * 32, "ef" * 32
+    legacy.save(_item(legacy_hash))
+
+    repository.save(_item(new_hash))
+
+    assert legacy.get(new_hash) is None
+    assert primary.get(new_hash) is not None
+    assert repository.peek(legacy_hash)["max_views"] == 2
+    assert repository.consume(legacy_hash)[0] == "consumed"
+    assert repository.revoke(legacy_hash) is True
+    assert repository.revoke_with_token(new_hash, "errado") == "forbidden"
+    assert repository.revoke_with_token("00" * 32, "rh") == "not_found"
+    assert repository.consume(legacy_hash)[0] == "not_allowed"
+    assert sorted(repository.iter_live_token_hashes()) == sorted([legacy_hash, new_hash])
+    assert repository.bulk_delete([legacy_hash, new_hash]) == []
+    assert repository.get(legacy_hash) is None and repository.get(new_hash) is None
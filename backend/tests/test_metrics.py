@@ -0,0 +1,124 @@
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from infra import async_repository
+from utils import metrics
+
+
+@pytest.fixture
+def enabled_metrics(monkeypatch):
+    monkeypatch.setattr(metrics, "_enabled", True)
+    monkeypatch.setattr(metrics, "_cold_start", True)
+
+
+def _emitted(capsys):
+    return [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+
+
+def test_disabled_metrics_are_noops(monkeypatch, capsys):
+    monkeypatch.setattr(metrics, "_enabled", False)
+
+    with metrics.request("get_pwd"):
+        with metrics.span("sha256") as span:
+            pass
+        metrics.add_consumed_capacity({"CapacityUnits": 1.0})
+
+    assert span is metrics._NOOP_SPAN
+    assert metrics.dynamodb_capacity_kwargs() == {}
+    assert capsys.readouterr().out == ""
+
+
+def test_request_emits_emf_line_with_stages_and_cold_start(enabled_metrics, capsys):
+    @metrics.timed("decrypt")
+    def decrypt():
+        return "x"
+
+    for _ in range(2):
+        with metrics.request("get_pwd"):
+            with metrics.span("sha256"):
+                pass
+            decrypt()
+            metrics.add_consumed_capacity({"TableName": "secure-secrets", "CapacityUnits": 1.0})
+            metrics.add_consumed_capacity([{"CapacityUnits": 0.5}])
+
+    first, second = _emitted(capsys)
+
+    assert first["ColdStart"] == 1
+    assert second["ColdStart"] == 0
+    assert first["Function"] == "get_pwd"
+    assert first["DynamoDBCapacityUnits"] == 1.5
+    assert {"sha256_ms", "decrypt_ms", "total_ms"} <= set(first)
+    directive = first["_aws"]["CloudWatchMetrics"][0]
+    assert directive["Dimensions"] == [["Function"]]
+    assert {m["Name"] for m in directive["Metrics"]} >= {"ColdStart", "sha256_ms", "DynamoDBCapacityUnits"}
+
+
+def test_get_secret_records_each_stage(enabled_metrics, capsys, monkeypatch):
+    from handlers import get_pwd
+
+    monkeypatch.setattr(
+        "usecases.get_secret.consume_view_and_maybe_delete",
+        lambda token_hash: ("consumed", {"ciphertext": "c", "expires_at": 1, "views_used": 1, "max_views": 2}),
+    )
+    monkeypatch.setattr("usecases.get_secret.decrypt", lambda c, key_id=None: "segredo")
+    monkeypatch.setattr("usecases.get_secret.needs_reencryption", lambda key_id: False)
+
+    get_pwd.handler({"pathParameters": {"pwdId": "abc"}}, None)
+
+    (record,) = _emitted(capsys)
+    assert {"sha256_ms", "consume_ms", "decrypt_ms", "response_ms", "total_ms"} <= set(record)
+
+
+def test_first_invocation_carries_init_stages(enabled_metrics, capsys, monkeypatch):
+    monkeypatch.setattr(metrics, "_init_stages", {})
+    metrics.add_init_stage("prewarm_cipher", 12.5)
+
+    for _ in range(2):
+        with metrics.request("get_pwd"):
+            pass
+
+    first, second = _emitted(capsys)
+
+    assert first["prewarm_cipher_ms"] == 12.5
+    assert first["first_invocation_ms"] == first["total_ms"]
+    assert "first_invocation_ms" not in second
+    assert "prewarm_cipher_ms" not in second
+
+
+def test_spans_from_worker_threads_reach_the_request(enabled_metrics, capsys):
+    def work(_):
+        with metrics.span("build_items"):
+            pass
+        metrics.add_consumed_capacity({"CapacityUnits": 1.0})
+
+    with metrics.request("create_pwd_batch"):
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            list(pool.map(metrics.propagate(work), range(8)))
+
+    (record,) = _emitted(capsys)
+    assert "build_items_ms" in record
+    assert record["DynamoDBCapacityUnits"] == 8.0
+
+
+def test_concurrent_async_requests_keep_their_own_stages(enabled_metrics, capsys):
+    def save(name):
+        with metrics.span(name):
+            pass
+
+    async def handle(name):
+        with metrics.request(name):
+            await async_repository.run_blocking(save, f"save_{name}")
+            await asyncio.sleep(0)
+
+    async def main():
+        await asyncio.gather(handle("a"), handle("b"))
+
+    asyncio.run(main())
+    async_repository.shutdown_io_executor()
+
+    records = {record["Function"]: record for record in _emitted(capsys)}
+    assert "save_a_ms" in records["a"] and "save_b_ms" not in records["a"]
+    assert "save_b_ms" in records["b"] and "save_a_ms" not in records["b"]
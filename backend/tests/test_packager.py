@@ -0,0 +1,56 @@
+import os
+import zipfile
+
+import pytest
+
+from packager.slim import DEFAULT_SITE_DIR, build, import_closure, keep_site_data, measure_bundle_imports
+
+needs_site_dir = pytest.mark.skipif(
+    not os.path.isdir(os.path.join(DEFAULT_SITE_DIR, "botocore")),
+    reason="dependências vendorizadas ausentes",
+)
+
+
+@pytest.mark.parametrize("relpath,kept", [
+    ("botocore/data/endpoints.json", True),
+    ("botocore/data/dynamodb/2012-08-10/service-2.json.gz", True),
+    ("botocore/data/dynamodb/2012-08-10/examples-1.json", False),
+    ("botocore/data/s3/2006-03-01/service-2.json.gz", False),
+    ("boto3/data/dynamodb/2012-08-10/resources-1.json", True),
+    ("boto3/data/s3/2006-03-01/resources-1.json", False),
+    ("botocore/cacert.pem", True),
+    ("dateutil/zoneinfo/dateutil-zoneinfo.tar.gz", False),
+])
+def test_keep_site_data(relpath, kept):
+    assert keep_site_data(relpath) is kept
+
+
+@needs_site_dir
+def test_closure_follows_lazy_imports_but_not_unused_handlers():
+    health, _ = import_closure(["handlers.health"], DEFAULT_SITE_DIR)
+    get_pwd, _ = import_closure(["handlers.get_pwd"], DEFAULT_SITE_DIR)
+
+    assert "boto3" not in health
+    assert {"infra.dynamodb_repository", "boto3", "botocore.client"} <= set(get_pwd)
+    assert not [name for name in get_pwd if name.startswith(("server", "benchmarks", "tests"))]
+
+
+@needs_site_dir
+def test_build_router_bundle(tmp_path):
+    report = build("router", out_dir=str(tmp_path), measure=False)
+    bundle = tmp_path / "router"
+
+    assert (bundle / "handlers" / "router.py").exists()
+    assert (bundle / "handlers" / "__pycache__").is_dir()
+    assert (bundle / "infra" / "data" / "wordlist.bin").exists()
+    assert not (bundle / "infra" / "data" / "wordlist.txt").exists()
+    assert not (bundle / "server").exists()
+    services = os.listdir(bundle / "botocore" / "data")
+    assert "dynamodb" in services and "s3" not in services
+    assert report.bytes < report.source_bytes / 2
+
+    with zipfile.ZipFile(tmp_path / "router.zip") as zf:
+        assert "handlers/router.py" in zf.namelist()
+
+    timings = measure_bundle_imports(str(bundle), ["handlers.router"])
+    assert timings["handlers.router"] > 0
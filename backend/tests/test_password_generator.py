@@ -0,0 +1,132 @@
+import os
+from collections import Counter
+
+import pytest
+
+from infra import password_generator
+from infra.password_generator import (
+    AMBIGUOUS,
+    DIGITS,
+    LETTERS,
+    PUNCTUATION,
+    PassphrasePolicy,
+    PasswordPolicy,
+    compile_policy,
+    generate_passphrases,
+    generate_password,
+    generate_passwords,
+)
+from infra.wordlist import get_wordlist
+
+
+def test_generate_passwords_keeps_one_char_per_pool():
+    passwords = generate_passwords(PasswordPolicy(True, True, True, 8), 500)
+
+    assert len(passwords) == 500
+    for password in passwords:
+        assert len(password) == 8
+        assert any(c in LETTERS for c in password)
+        assert any(c in DIGITS for c in password)
+        assert any(c in PUNCTUATION for c in password)
+
+
+def test_generate_passwords_only_uses_selected_pools():
+    passwords = generate_passwords(PasswordPolicy(False, True, False, 12), 50)
+
+    assert all(set(password) <= set(DIGITS) for password in passwords)
+
+
+def test_required_chars_land_uniformly_across_positions():
+    passwords = generate_passwords(PasswordPolicy(True, True, False, 8), 8000)
+    # Com um único dígito obrigatório e letras no resto, a contagem por posição
+    # deve ser praticamente uniforme.
+    positions = Counter(i for p in passwords for i, c in enumerate(p) if c in DIGITS)
+
+    expected = sum(positions.values()) / 8
+    assert all(abs(count - expected) < expected * 0.15 for count in positions.values())
+
+
+def test_generate_password_validates_policy():
+    with pytest.raises(ValueError, match="pass_length"):
+        generate_password(True, True, True, 4)
+    with pytest.raises(ValueError, match="ao menos um"):
+        generate_password(False, False, False, 16)
+
+
+def test_entropy_buffer_is_discarded_after_fork(monkeypatch):
+    buffer = password_generator._EntropyBuffer(chunk_bytes=64)
+    first = buffer.take(8)
+    monkeypatch.setattr(os, "getpid", lambda: buffer.pid + 1)
+
+    second = buffer.take(8)
+
+    assert buffer.pos == 8
+    assert second == buffer.data[:8]
+    assert second != first
+
+
+def test_generate_passphrases_uses_wordlist_and_options():
+    wordlist = get_wordlist()
+    words = {wordlist[i] for i in range(len(wordlist))}
+    policy = PassphrasePolicy(words=4, separator=" ", capitalize="title", include_digit=True)
+
+    for passphrase in generate_passphrases(policy, 50):
+        parts = passphrase.split(" ")
+        assert len(parts) == 4
+        assert all(part[0].isupper() for part in parts)
+        assert sum(part[-1] in DIGITS for part in parts) == 1
+        assert all(part.rstrip(DIGITS).lower() in words for part in parts)
+
+
+def test_passphrase_entropy_estimate():
+    assert PassphrasePolicy(words=6).entropy_bits(7776) == pytest.approx(77.55, abs=0.01)
+    assert PassphrasePolicy(words=6, capitalize="random").entropy_bits(7776) == pytest.approx(83.55, abs=0.01)
+    assert PasswordPolicy(False, True, False, 10).entropy_bits() == pytest.approx(33.22, abs=0.01)
+
+
+def test_passphrase_policy_validation():
+    with pytest.raises(ValueError, match="pass_capitalize"):
+        generate_passphrases(PassphrasePolicy(capitalize="upper"), 1)
+    with pytest.raises(ValueError, match="pass_words"):
+        generate_passphrases(PassphrasePolicy(words=50), 1)
+
+
+def test_password_policy_is_an_immutable_hashable_value():
+    a = PasswordPolicy(True, True, False, 12, include="ba", exclude="xx")
+    b = PasswordPolicy(True, True, False, 12, include="ab", exclude="x")
+
+    assert a == b and hash(a) == hash(b)
+    assert {a: 1}[b] == 1
+    assert not hasattr(a, "__dict__")
+    with pytest.raises(AttributeError):
+        a.length = 20
+
+
+def test_compiled_policy_is_cached_per_policy():
+    compile_policy.cache_clear()
+
+    first = compile_policy(PasswordPolicy(True, False, True, 20))
+    second = compile_policy(PasswordPolicy(True, False, True, 20))
+
+    assert first is second
+    assert compile_policy.cache_info().hits == 1
+    assert first.alphabet == LETTERS + PUNCTUATION
+    assert len(first.pool_tables) == 2
+
+
+def test_exclude_and_include_sets():
+    policy = PasswordPolicy(True, True, False, 16, include="_~a", exclude=AMBIGUOUS)
+    compiled = compile_policy(policy)
+
+    assert not set(AMBIGUOUS) & set(compiled.alphabet)
+    assert compiled.pools[-1] == "_~"
+    for password in generate_passwords(policy, 200):
+        assert not set(AMBIGUOUS) & set(password)
+        assert set("_~") & set(password)
+
+
+def test_exclude_cannot_empty_a_selected_pool():
+    with pytest.raises(ValueError, match="pass_exclude"):
+        generate_passwords(PasswordPolicy(False, True, False, 10, exclude=DIGITS), 1)
+    with pytest.raises(ValueError, match="ASCII"):
+        generate_passwords(PasswordPolicy(include="é"), 1)
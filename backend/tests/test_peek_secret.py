@@ -0,0 +1,46 @@
+import json
+
+from usecases.peek_secret import peek_secret
+
+
+def _body(resp):
+    return json.loads(resp.get("body") or "{}")
+
+
+def test_peek_secret_returns_metadata_without_decrypting(monkeypatch):
+    monkeypatch.setattr("usecases.peek_secret.now_unix", lambda: 1000)
+    monkeypatch.setattr(
+        "usecases.peek_secret.peek_item",
+        lambda token_hash: {"expires_at": 2000, "max_views": 3, "views_used": 1, "revoked": False},
+    )
+
+    resp = peek_secret({"pathParameters": {"pwdId": "tok"}})
+
+    assert resp["statusCode"] == 200
+    assert _body(resp) == {
+        "pwdId": "tok",
+        "expiration_date": 2000,
+        "view_count": 2,
+        "revoked": False,
+        "available": True,
+    }
+
+
+def test_peek_secret_reports_unavailable_links(monkeypatch):
+    monkeypatch.setattr("usecases.peek_secret.now_unix", lambda: 3000)
+    monkeypatch.setattr(
+        "usecases.peek_secret.peek_item",
+        lambda token_hash: {"expires_at": 2000, "max_views": 3, "views_used": 1, "revoked": True},
+    )
+
+    body = _body(peek_secret({"pathParameters": {"pwdId": "tok"}}))
+
+    assert body["revoked"] is True
+    assert body["available"] is False
+
+
+def test_peek_secret_returns_404_when_missing(monkeypatch):
+    monkeypatch.setattr("usecases.peek_secret.peek_item", lambda token_hash: None)
+
+    assert peek_secret({"pathParameters": {"pwdId": "tok"}})["statusCode"] == 404
+    assert peek_secret({"pathParameters": {}})["statusCode"] == 400
@@ -0,0 +1,75 @@
+import os
+
+import pytest
+
+from infra import crypto_service, prewarm, pwd_repository
+from utils import metrics
+
+
+@pytest.fixture(autouse=True)
+def fresh(monkeypatch):
+    prewarm.reset()
+    monkeypatch.setattr(metrics, "_init_stages", {})
+    yield
+    prewarm.reset()
+
+
+def test_no_prewarm_configured_is_a_noop(monkeypatch):
+    monkeypatch.delenv("PREWARM", raising=False)
+
+    prewarm.run()
+
+    assert metrics._init_stages == {}
+
+
+def test_unknown_step_is_rejected(monkeypatch):
+    monkeypatch.setenv("PREWARM", "cipher,tls")
+
+    with pytest.raises(RuntimeError, match="tls"):
+        prewarm.configured_steps()
+
+
+def test_runs_steps_once_and_survives_failures(monkeypatch, capsys):
+    calls = []
+
+    def fail():
+        raise ConnectionError("sem rede")
+
+    monkeypatch.setenv("PREWARM", "cipher, dynamodb")
+    monkeypatch.setitem(prewarm._STEP_FUNCTIONS, "cipher", lambda: calls.append("cipher"))
+    monkeypatch.setitem(prewarm._STEP_FUNCTIONS, "dynamodb", fail)
+
+    prewarm.run()
+    prewarm.run()
+
+    assert calls == ["cipher"]
+    assert set(metrics._init_stages) == {"prewarm_cipher", "prewarm_dynamodb"}
+    assert "prewarm dynamodb falhou" in capsys.readouterr().err
+
+
+def test_cipher_and_repository_steps_touch_the_real_objects(tmp_path, monkeypatch):
+    monkeypatch.setenv("PREWARM", "cipher,dynamodb")
+    monkeypatch.setenv("ENCRYPTION_KEY", "_nQF7e7aQoiHjpBMYg99Gwm5_6dpfwnt7_BL4Y7c2Og=")
+    monkeypatch.delenv("ENCRYPTION_KEYS", raising=False)
+    monkeypatch.setenv("PWD_BACKEND", "sqlite")
+    monkeypatch.setenv("SQLITE_PATH", str(tmp_path / "secrets.db"))
+    crypto_service.reset_cipher_cache()
+    pwd_repository.set_repository(None)
+
+    prewarm.run()
+
+    assert crypto_service.get_cipher_metrics()["rebuilds"] == 1
+    assert pwd_repository._repository is not None
+    pwd_repository.set_repository(None)
+
+
+@pytest.mark.parametrize("config", ["serverless.yml", "serverless.router.yml"])
+def test_deploy_profiles_only_use_known_steps(config, monkeypatch):
+    yaml = pytest.importorskip("yaml")
+    with open(os.path.join(os.path.dirname(__file__), "..", config), encoding="utf-8") as f:
+        functions = yaml.safe_load(f)["functions"]
+
+    for function in functions.values():
+        if isinstance(function, dict) and "PREWARM" in function.get("environment", {}):
+            monkeypatch.setenv("PREWARM", function["environment"]["PREWARM"])
+            assert prewarm.configured_steps()
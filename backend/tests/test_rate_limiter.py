@@ -0,0 +1,131 @@
+import json
+
+import boto3
+import pytest
+from botocore.config import Config
+
+from benchmarks.dynamodb_standin import DynamoDBStandIn, endpoint_url, start_standin
+from infra import rate_limiter
+from infra.dynamodb_client import ClientTable
+from infra.rate_limiter import DynamoDBRateLimitStore, InMemoryRateLimitStore, Limit, RateLimiter
+from usecases.get_secret import get_secret
+
+
+class FakeClock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_in_memory_bucket_allows_burst_then_refills():
+    store = InMemoryRateLimitStore()
+    limit = Limit(capacity=3, refill_per_second=0.5)
+
+    assert [store.acquire("k", limit, 100.0) for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert store.acquire("k", limit, 100.0) == pytest.approx(2.0)
+    assert store.acquire("k", limit, 102.0) == 0.0
+
+
+def test_in_memory_store_evicts_least_recently_used_keys():
+    store = InMemoryRateLimitStore(max_keys=2)
+    limit = Limit(1, 1.0)
+
+    for key in ("a", "b", "c"):
+        store.acquire(key, limit, 0.0)
+
+    assert list(store.buckets) == ["b", "c"]
+
+
+def test_rate_limiter_checks_ip_before_token():
+    clock = FakeClock()
+    limiter = RateLimiter(InMemoryRateLimitStore(), Limit(1, 0.1), Limit(10, 1.0), clock=clock)
+
+    assert limiter.check("1.2.3.4", "h1") == 0.0
+    assert limiter.check("1.2.3.4", "h2") > 0
+    assert "token#h2" not in limiter.store.buckets
+    assert limiter.check(None, "h2") == 0.0
+
+
+@pytest.fixture
+def dynamodb_table():
+    server, standin = start_standin(DynamoDBStandIn(tables={"secure-rate-limits": "bucket_key"}))
+    client = boto3.client(
+        "dynamodb",
+        endpoint_url=endpoint_url(server),
+        region_name="us-east-1",
+        aws_access_key_id="test",
+        aws_secret_access_key="test",
+    )
+    yield ClientTable(client, "secure-rate-limits"), standin
+    server.shutdown()
+
+
+def test_dynamodb_store_counts_per_window_and_caches_denials(dynamodb_table):
+    table, standin = dynamodb_table
+    store = DynamoDBRateLimitStore(table)
+    limit = Limit(capacity=2, refill_per_second=0.2)
+
+    assert store.acquire("ip#x", limit, 1000.0) == 0.0
+    assert store.acquire("ip#x", limit, 1001.0) == 0.0
+    assert store.acquire("ip#x", limit, 1002.0) == pytest.approx(8.0)
+    assert store.acquire("ip#x", limit, 1003.0) == pytest.approx(7.0)
+    assert standin.calls["UpdateItem"] == 3
+
+    assert store.acquire("ip#x", limit, 1010.0) == 0.0
+
+
+def test_dynamodb_store_fails_open_on_connection_errors():
+    client = boto3.client(
+        "dynamodb",
+        endpoint_url="http://127.0.0.1:9",
+        region_name="us-east-1",
+        aws_access_key_id="test",
+        aws_secret_access_key="test",
+        config=Config(connect_timeout=0.2, retries={"max_attempts": 1}),
+    )
+    store = DynamoDBRateLimitStore(ClientTable(client, "secure-rate-limits"))
+
+    assert store.acquire("ip#x", Limit(capacity=1, refill_per_second=0.1), 1000.0) == 0.0
+
+
+def test_dynamodb_store_keeps_the_denial_cache_bounded(dynamodb_table):
+    table, _ = dynamodb_table
+    store = DynamoDBRateLimitStore(table, max_keys=2)
+    limit = Limit(capacity=1, refill_per_second=0.1)
+
+    for key in ("ip#a", "ip#b", "ip#c"):
+        store.acquire(key, limit, 1000.0)
+        store.acquire(key, limit, 1000.0)
+
+    assert list(store.blocked) == ["ip#b", "ip#c"]
+
+
+def test_get_secret_returns_429_without_touching_the_table(monkeypatch):
+    limiter = RateLimiter(InMemoryRateLimitStore(), Limit(1, 0.5), Limit(10, 1.0), clock=FakeClock())
+    monkeypatch.setattr("usecases.get_secret.get_rate_limiter", lambda: limiter)
+    monkeypatch.setattr(
+        "usecases.get_secret.consume_view_and_maybe_delete",
+        lambda token_hash: ("not_found", None),
+    )
+    event = {"pathParameters": {"pwdId": "abc"}, "requestContext": {"http": {"sourceIp": "9.9.9.9"}}}
+
+    assert get_secret(event)["statusCode"] == 404
+
+    monkeypatch.setattr(
+        "usecases.get_secret.consume_view_and_maybe_delete",
+        lambda token_hash: (_ for _ in ()).throw(AssertionError("não deveria consultar a tabela")),
+    )
+    resp = get_secret(event)
+
+    assert resp["statusCode"] == 429
+    assert resp["headers"]["Retry-After"] == "2"
+    assert "requisições" in json.loads(resp["body"])["message"]
+
+
+def test_get_rate_limiter_is_disabled_by_default(monkeypatch):
+    monkeypatch.delenv("RATE_LIMIT_ENABLED", raising=False)
+    rate_limiter.reset_rate_limiter()
+
+    assert rate_limiter.get_rate_limiter() is None
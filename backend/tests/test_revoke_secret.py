@@ -0,0 +1,95 @@
+import json
+
+import pytest
+
+from infra import crypto_service, pwd_repository, revoked_cache
+from infra.revoked_cache import RevokedCache
+from infra.sqlite_repository import SQLiteSecretRepository
+from usecases.create_secret import create_secret
+from usecases.get_secret import get_secret
+from usecases.peek_secret import peek_secret
+from usecases.revoke_secret import revoke_secret
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def repository(tmp_path, monkeypatch):
+    monkeypatch.setenv("ENCRYPTION_KEY", "_nQF7e7aQoiHjpBMYg99Gwm5_6dpfwnt7_BL4Y7c2Og=")
+    monkeypatch.delenv("ENCRYPTION_KEYS", raising=False)
+    crypto_service.reset_cipher_cache()
+    revoked_cache.reset_revoked_cache()
+    repository = SQLiteSecretRepository(str(tmp_path / "secrets.db"))
+    pwd_repository.set_repository(repository)
+    yield repository
+    pwd_repository.set_repository(None)
+    revoked_cache.reset_revoked_cache()
+
+
+def _create():
+    resp = create_secret({"body": json.dumps({"sended_password": "s3cr3t", "pass_view_limit": 3})})
+    return json.loads(resp["body"])
+
+
+def _event(pwd_id, revoke_token=None):
+    headers = {"authorization": f"Bearer {revoke_token}"} if revoke_token else {}
+    return {"pathParameters": {"pwdId": pwd_id}, "headers": headers}
+
+
+def test_revoke_deletes_the_secret_and_short_circuits_later_reads(repository, monkeypatch):
+    created = _create()
+
+    resp = revoke_secret(_event(created["pwdId"], created["revokeToken"]))
+
+    assert resp["statusCode"] == 200
+    assert json.loads(resp["body"]) == {"pwdId": created["pwdId"], "revoked": True}
+
+    monkeypatch.setattr(
+        "usecases.get_secret.consume_view_and_maybe_delete",
+        lambda token_hash: (_ for _ in ()).throw(AssertionError("não deveria consultar a tabela")),
+    )
+    for usecase in (get_secret, peek_secret):
+        resp = usecase(_event(created["pwdId"]))
+        assert resp["statusCode"] == 410
+        assert json.loads(resp["body"])["message"] == "Link revogado"
+
+    # Retentativa do DELETE responde o 410 do GET pelo cache, sem ir ao
+    # repositório, com qualquer token: o 200 fica só para quem revogou.
+    monkeypatch.setattr(
+        "usecases.revoke_secret.revoke_secret_with_token",
+        lambda *args: (_ for _ in ()).throw(AssertionError("não deveria consultar a tabela")),
+    )
+    for revoke_token in (created["revokeToken"], "outro-token"):
+        resp = revoke_secret(_event(created["pwdId"], revoke_token))
+        assert resp["statusCode"] == 410
+        assert json.loads(resp["body"])["message"] == "Link revogado"
+
+
+def test_revoke_requires_the_creator_token(repository):
+    created = _create()
+
+    assert revoke_secret(_event(created["pwdId"]))["statusCode"] == 401
+    assert revoke_secret(_event(created["pwdId"], "outro-token"))["statusCode"] == 403
+    assert revoke_secret(_event("desconhecido", created["revokeToken"]))["statusCode"] == 404
+    assert get_secret(_event(created["pwdId"]))["statusCode"] == 200
+
+
+def test_revoked_cache_expires_and_evicts_oldest():
+    clock = FakeClock()
+    cache = RevokedCache(ttl_seconds=60, cache_size=2, clock=clock)
+    cache.add("a")
+    cache.add("b")
+    cache.add("c")
+
+    assert "a" not in cache
+    assert "b" in cache and "c" in cache
+
+    clock.now += 60
+    assert "c" not in cache
+    assert cache.entries == {"b": 1060.0}
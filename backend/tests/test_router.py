@@ -0,0 +1,69 @@
+import json
+import os
+
+import pytest
+
+from benchmarks.import_time_report import measure_imports
+from handlers import router
+from handlers.routes import ROUTES
+from utils.apigw import http_event
+
+ROUTER_YML = os.path.join(os.path.dirname(__file__), "..", "serverless.router.yml")
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    calls = []
+
+    def fake_load(spec):
+        return lambda event, context: calls.append((spec, event.get("pathParameters"))) or {"statusCode": 200}
+
+    monkeypatch.setattr("handlers.router.load_handler", fake_load)
+    monkeypatch.setattr("handlers.router._handlers", {})
+    return calls
+
+
+def test_dispatches_on_route_key(calls):
+    event = http_event("GET", "/pwd/{pwdId}/meta", "/pwd/abc/meta", path_params={"pwdId": "abc"})
+
+    assert router.handler(event, None)["statusCode"] == 200
+    assert calls == [("handlers.get_pwd_meta.handler", {"pwdId": "abc"})]
+
+
+def test_default_route_falls_back_to_raw_path(calls):
+    event = http_event("GET", "$default", "/pwd/abc")
+    event["routeKey"] = "$default"
+
+    router.handler(event, None)
+
+    assert calls == [("handlers.get_pwd.handler", {"pwdId": "abc"})]
+
+
+def test_unknown_route_returns_404(calls):
+    event = http_event("GET", "$default", "/nope")
+    event["routeKey"] = "$default"
+
+    resp = router.handler(event, None)
+
+    assert resp["statusCode"] == 404
+    assert json.loads(resp["body"]) == {"message": "Not Found"}
+    assert calls == []
+
+
+def test_router_profile_routes_every_http_event_to_the_router():
+    yaml = pytest.importorskip("yaml")
+    with open(ROUTER_YML, encoding="utf-8") as f:
+        config = yaml.safe_load(f)
+
+    api = config["functions"]["api"]
+    declared = {(e["httpApi"]["method"].upper(), e["httpApi"]["path"]) for e in api["events"]}
+
+    assert api["handler"] == "handlers.router.handler"
+    assert declared == {(method, path) for method, path, _ in ROUTES}
+
+
+def test_router_import_does_not_load_route_modules():
+    timings = measure_imports("handlers.router")
+
+    loaded = [name for name in timings if name.startswith(("usecases", "infra."))]
+    assert loaded == ["infra.prewarm"]
@@ -0,0 +1,44 @@
+import os
+
+import pytest
+
+from handlers.routes import COMPILED_ROUTES, ROUTES, load_handler, match_route
+
+SERVERLESS_YML = os.path.join(os.path.dirname(__file__), "..", "serverless.yml")
+
+
+def test_routes_mirror_serverless_yml():
+    yaml = pytest.importorskip("yaml")
+    with open(SERVERLESS_YML, encoding="utf-8") as f:
+        config = yaml.safe_load(f)
+
+    declared = set()
+    for function in config["functions"].values():
+        for event in function.get("events", []):
+            if "httpApi" in event:
+                http = event["httpApi"]
+                declared.add((http["method"].upper(), http["path"], function["handler"]))
+
+    assert set(ROUTES) == declared
+
+
+def test_every_route_handler_is_importable():
+    for _, _, handler in ROUTES:
+        assert callable(load_handler(handler))
+
+
+def test_static_route_wins_over_path_parameter():
+    found = match_route(COMPILED_ROUTES, "POST", "/pwd/batch")
+    assert found.route.handler == "handlers.create_pwd_batch.handler"
+    assert found.path_params is None
+
+
+def test_path_parameters_are_extracted():
+    found = match_route(COMPILED_ROUTES, "GET", "/pwd/abc-123/meta")
+    assert found.route.path == "/pwd/{pwdId}/meta"
+    assert found.path_params == {"pwdId": "abc-123"}
+
+
+@pytest.mark.parametrize("method,path", [("GET", "/nope"), ("PUT", "/pwd/abc"), ("DELETE", "/pwd/abc/meta"), ("GET", "/pwd/a/b")])
+def test_unknown_routes_do_not_match(method, path):
+    assert match_route(COMPILED_ROUTES, method, path) is None
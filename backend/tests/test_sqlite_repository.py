@@ -0,0 +1,138 @@
+import threading
+
+import pytest
+
+from infra import pwd_repository
+from infra.sqlite_repository import SQLiteSecretRepository
+
+
+@pytest.fixture
+def repository(tmp_path, monkeypatch):
+    monkeypatch.setattr("infra.sqlite_repository.now_unix", lambda: 1000)
+    return SQLiteSecretRepository(str(tmp_path / "secrets.db"))
+
+
+def _item(token_hash="hash", max_views=2, expires_at=2000, **extra):
+    return {
+        "token_hash": token_hash,
+        "ciphertext": "c",
+        "key_id": "k1",
+        "expires_at": expires_at,
+        "max_views": max_views,
+        "views_used": 0,
+        "revoked": False,
+        **extra,
+    }
+
+
+def test_save_and_get(repository):
+    repository.save(_item())
+
+    assert repository.get("hash") == _item()
+    assert repository.get("missing") is None
+
+
+def test_consume_counts_views_and_deletes_on_last(repository):
+    repository.save(_item(max_views=2))
+
+    status, item = repository.consume("hash")
+    assert status == "consumed"
+    assert item["views_used"] == 1
+
+    status, item = repository.consume("hash")
+    assert status == "consumed_and_deleted"
+    assert item["views_used"] == 2
+    assert repository.get("hash") is None
+
+
+def test_consume_distinguishes_not_found_and_not_allowed(repository):
+    repository.save(_item(token_hash="expired", expires_at=1000))
+    repository.save(_item(token_hash="revoked", revoked=True))
+
+    assert repository.consume("missing") == ("not_found", {})
+    assert repository.consume("expired") == ("not_allowed", {})
+    assert repository.consume("revoked") == ("not_allowed", {})
+
+
+def test_revoke_blocks_further_views(repository):
+    repository.save(_item())
+
+    assert repository.revoke("hash") is True
+    assert repository.revoke("missing") is False
+    assert repository.consume("hash")[0] == "not_allowed"
+
+
+def test_revoke_with_token_deletes_only_with_the_right_token(repository):
+    repository.save(_item(revoke_hash="rh"))
+
+    assert repository.get("hash")["revoke_hash"] == "rh"
+    assert repository.revoke_with_token("hash", "outro") == "forbidden"
+    assert repository.revoke_with_token("hash", "rh") == "deleted"
+    assert repository.revoke_with_token("hash", "rh") == "not_found"
+
+
+def test_old_databases_gain_the_revoke_hash_column(tmp_path):
+    import sqlite3
+
+    path = str(tmp_path / "old.db")
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE secrets (token_hash TEXT PRIMARY KEY, ciphertext TEXT NOT NULL, key_id TEXT, "
+        "expires_at INTEGER NOT NULL, max_views INTEGER NOT NULL, views_used INTEGER NOT NULL DEFAULT 0, "
+        "revoked INTEGER NOT NULL DEFAULT 0) WITHOUT ROWID"
+    )
+    conn.execute("INSERT INTO secrets VALUES ('old', 'c', 'k1', 2000, 1, 0, 0)")
+    conn.commit()
+    conn.close()
+
+    repository = SQLiteSecretRepository(path)
+
+    assert "revoke_hash" not in repository.get("old")
+    assert repository.revoke_with_token("old", "rh") == "forbidden"
+
+
+def test_bulk_save_and_reencrypt(repository):
+    assert repository.bulk_save([_item(token_hash=str(i)) for i in range(30)]) == []
+
+    assert repository.reencrypt("7", "k1", "k2", "novo") is True
+    assert repository.reencrypt("7", "k1", "k2", "outro") is False
+    assert repository.get("7")["key_id"] == "k2"
+    assert repository.get("7")["ciphertext"] == "novo"
+
+
+def test_concurrent_consume_never_exceeds_max_views(repository):
+    repository.save(_item(max_views=5))
+    statuses = []
+
+    def worker():
+        statuses.append(repository.consume("hash")[0])
+
+    threads = [threading.Thread(target=worker) for _ in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert statuses.count("consumed") == 4
+    assert statuses.count("consumed_and_deleted") == 1
+    assert statuses.count("not_found") + statuses.count("not_allowed") == 15
+
+
+def test_pwd_repository_selects_sqlite_backend(tmp_path, monkeypatch):
+    monkeypatch.setenv("PWD_BACKEND", "sqlite")
+    monkeypatch.setenv("SQLITE_PATH", str(tmp_path / "facade.db"))
+    pwd_repository.set_repository(None)
+
+    try:
+        pwd_repository.save_secret(_item(expires_at=4102444800))
+        assert pwd_repository.consume_view_and_maybe_delete("hash")[0] == "consumed"
+    finally:
+        pwd_repository.set_repository(None)
+
+
+def test_peek_returns_metadata_without_consuming(repository):
+    repository.save(_item())
+
+    assert repository.peek("hash") == {"expires_at": 2000, "max_views": 2, "views_used": 0, "revoked": False}
+    assert repository.get("hash")["views_used"] == 0
+    assert repository.peek("missing") is None
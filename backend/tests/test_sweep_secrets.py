@@ -0,0 +1,263 @@
+import json
+
+import boto3
+import pytest
+
+from benchmarks.dynamodb_standin import DynamoDBStandIn, endpoint_url, start_standin
+from handlers import sweep_secrets as sweep_handler
+from infra import pwd_repository
+from infra.dynamodb_client import ClientTable
+from infra.dynamodb_repository import DynamoDBSecretRepository
+from infra.item_schema import COMPACT_SCHEMA
+from infra.migrating_repository import MigratingSecretRepository
+from infra.sqlite_repository import SQLiteSecretRepository
+from infra.sweep_cursors import InMemorySweepCursorStore, reset_cursor_store
+from usecases import sweep_secrets
+from usecases.sweep_secrets import CapacityBudget, sweep
+from utils import metrics
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def _item(token_hash, expires_at=4102444800, max_views=2, views_used=0, revoked=False):
+    return {
+        "token_hash": token_hash,
+        "ciphertext": "c",
+        "key_id": "k1",
+        "expires_at": expires_at,
+        "max_views": max_views,
+        "views_used": views_used,
+        "revoked": revoked,
+    }
+
+
+def test_capacity_budget_waits_when_exhausted():
+    clock = FakeClock()
+    budget = CapacityBudget(10, clock=clock, sleep=clock.sleep)
+
+    budget.spend(10)
+    budget.spend(5)
+
+    assert clock.sleeps == [pytest.approx(0.5)]
+
+
+def test_capacity_budget_lets_a_large_spend_through_and_delays_the_next():
+    clock = FakeClock()
+    budget = CapacityBudget(10, clock=clock, sleep=clock.sleep)
+
+    budget.spend(25)
+    budget.spend(5)
+
+    assert clock.sleeps == [pytest.approx(2.0)]
+
+
+@pytest.fixture(params=["sqlite", "dynamodb"])
+def repository(request, tmp_path):
+    if request.param == "sqlite":
+        repository = SQLiteSecretRepository(str(tmp_path / "secrets.db"))
+        server = None
+    else:
+        server, _ = start_standin()
+        client = boto3.client(
+            "dynamodb",
+            endpoint_url=endpoint_url(server),
+            region_name="us-east-1",
+            aws_access_key_id="test",
+            aws_secret_access_key="test",
+        )
+        repository = DynamoDBSecretRepository(ClientTable(client, "secure-secrets"), sleep=lambda s: None)
+    pwd_repository.set_repository(repository)
+    yield repository
+    pwd_repository.set_repository(None)
+    if server:
+        server.shutdown()
+
+
+def test_sweep_deletes_only_dead_secrets_across_segments(repository):
+    live = [f"live-{i}" for i in range(10)]
+    for token_hash in live:
+        repository.save(_item(token_hash))
+    for i in range(30):
+        repository.save(_item(f"expired-{i}", expires_at=1))
+    repository.save(_item("exhausted", max_views=1, views_used=1))
+    repository.save(_item("revoked", revoked=True))
+
+    report = sweep(segments=3, write_capacity_per_second=10_000, page_size=7)
+
+    assert report["found"] == report["deleted"] == 32
+    assert report["failed"] == 0
+    assert report["items_per_second"] > 0
+    assert sorted(repository.iter_live_token_hashes()) == sorted(live)
+    assert list(repository.iter_dead_token_hashes()) == []
+
+
+class TickingClock:
+    # Avança um segundo a cada leitura: o deadline vence depois de N checagens.
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        self.now += 1
+        return self.now
+
+
+def test_sweep_stops_at_the_deadline_and_resumes_from_the_saved_cursor(repository, monkeypatch):
+    for i in range(60):
+        repository.save(_item(f"expired-{i:02d}", expires_at=1))
+    started_from = []
+    iter_dead_pages = sweep_secrets.iter_dead_pages
+
+    def record_cursor(segment, total_segments, page_size, spend, cursor):
+        started_from.append(cursor)
+        return iter_dead_pages(segment, total_segments, page_size, spend, cursor)
+
+    monkeypatch.setattr(sweep_secrets, "iter_dead_pages", record_cursor)
+    cursors = InMemorySweepCursorStore()
+
+    partial = sweep(
+        segments=1, write_capacity_per_second=10_000, page_size=10, deadline=3, cursors=cursors, clock=TickingClock()
+    )
+
+    assert partial["complete"] is False
+    assert 0 < partial["deleted"] == partial["found"] < 60
+    saved = cursors.load("1:0")
+    assert saved is not None
+
+    report = sweep(segments=1, write_capacity_per_second=10_000, page_size=10, cursors=cursors)
+
+    assert started_from == [None, saved]
+    assert report["complete"] is True
+    assert partial["deleted"] + report["deleted"] == 60
+    assert list(repository.iter_dead_token_hashes()) == []
+    assert cursors.load("1:0") is None
+
+
+def test_sweep_stopped_mid_page_rereads_that_page(repository):
+    for i in range(60):
+        repository.save(_item(f"expired-{i:02d}", expires_at=1))
+    cursors = InMemorySweepCursorStore()
+
+    # Página de 50 itens = 2 lotes de delete; o deadline vence entre os dois.
+    partial = sweep(
+        segments=1, write_capacity_per_second=10_000, page_size=50, deadline=2, cursors=cursors, clock=TickingClock()
+    )
+
+    assert partial["deleted"] == 25 and partial["complete"] is False
+    assert cursors.load("1:0") is None  # nenhuma página terminou: recomeça do início
+    report = sweep(segments=1, write_capacity_per_second=10_000, page_size=50, cursors=cursors)
+    assert report["deleted"] == 35 and report["complete"] is True
+
+
+def test_migrating_cursor_moves_from_the_primary_to_the_legacy_table(tmp_path):
+    primary = SQLiteSecretRepository(str(tmp_path / "v2.db"))
+    legacy = SQLiteSecretRepository(str(tmp_path / "legacy.db"))
+    repository = MigratingSecretRepository(primary, legacy)
+    for i in range(3):
+        primary.save(_item(f"p{i}", expires_at=1))
+        legacy.save(_item(f"l{i}", expires_at=1))
+
+    pages = list(repository.iter_dead_pages(page_size=2))
+    assert pages == [(["p0", "p1"], "primary:p1"), (["p2"], "legacy:"), (["l0", "l1"], "legacy:l1"), (["l2"], None)]
+
+    assert list(repository.iter_dead_pages(page_size=2, cursor="legacy:")) == pages[2:]
+    assert list(repository.iter_dead_pages(page_size=2, cursor="legacy:l1")) == pages[3:]
+
+
+def test_main_prints_report(monkeypatch, capsys):
+    monkeypatch.setattr(sweep_secrets, "sweep", lambda *args: {"deleted": 3, "failed": 0})
+
+    assert sweep_secrets.main(["--segments", "2"]) == 0
+    assert '"deleted": 3' in capsys.readouterr().out
+
+
+def _client(server):
+    return boto3.client(
+        "dynamodb",
+        endpoint_url=endpoint_url(server),
+        region_name="us-east-1",
+        aws_access_key_id="test",
+        aws_secret_access_key="test",
+    )
+
+
+def test_scan_reads_and_deletes_in_both_tables_are_charged():
+    server, _ = start_standin(DynamoDBStandIn(tables={"secure-secrets": "token_hash", "secure-secrets-v2": "h"}))
+    client = _client(server)
+    primary = DynamoDBSecretRepository(ClientTable(client, "secure-secrets-v2"), schema=COMPACT_SCHEMA)
+    legacy = DynamoDBSecretRepository(ClientTable(client, "secure-secrets"))
+    repository = MigratingSecretRepository(primary, legacy)
+    for i in range(5):
+        legacy.save(_item(f"{i:064x}", expires_at=1))
+    for i in range(5, 8):
+        primary.save({**_item(f"{i:064x}"), "ciphertext": "Y2lwaGVydGV4dA=="})
+    for i in range(8, 10):
+        primary.save({**_item(f"{i:064x}", expires_at=1), "ciphertext": "Y2lwaGVydGV4dA=="})
+
+    reads = []
+    dead = list(repository.iter_dead_token_hashes(page_size=2, spend=reads.append))
+    # Paga cada página lida, inclusive as que o filtro descartou inteiras.
+    assert len(dead) == 7
+    assert len(reads) == 3 + 3 and all(units > 0 for units in reads)
+
+    writes = []
+    assert repository.bulk_delete(dead, spend=writes.append) == []
+    # Cada hash só é apagado na tabela de onde o scan o leu.
+    assert sum(writes) == len(dead)
+    assert list(primary.iter_dead_token_hashes()) == list(legacy.iter_dead_token_hashes()) == []
+    assert len(list(primary.iter_live_token_hashes())) == 3
+    server.shutdown()
+
+
+class FakeLambdaContext:
+    def __init__(self, remaining_ms):
+        self.remaining_ms = remaining_ms
+
+    def get_remaining_time_in_millis(self):
+        return self.remaining_ms
+
+
+def test_handler_returns_the_report_and_emits_counts(monkeypatch, capsys, tmp_path):
+    monkeypatch.setattr(metrics, "_enabled", True)
+    monkeypatch.delenv("SWEEP_CURSOR_STORE", raising=False)
+    reset_cursor_store()
+    repository = SQLiteSecretRepository(str(tmp_path / "secrets.db"))
+    repository.save(_item("expired", expires_at=1))
+    pwd_repository.set_repository(repository)
+
+    report = sweep_handler.handler({}, FakeLambdaContext(900_000))
+    pwd_repository.set_repository(None)
+    reset_cursor_store()
+
+    assert report["deleted"] == 1 and report["complete"] is True
+    (record,) = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert record["Function"] == "sweep_secrets"
+    assert (record["SweepFound"], record["SweepDeleted"], record["SweepFailed"]) == (1, 1, 0)
+
+
+def test_handler_out_of_time_returns_a_partial_report(monkeypatch, capsys, tmp_path):
+    monkeypatch.setattr(metrics, "_enabled", True)
+    monkeypatch.delenv("SWEEP_CURSOR_STORE", raising=False)
+    reset_cursor_store()
+    repository = SQLiteSecretRepository(str(tmp_path / "secrets.db"))
+    repository.save(_item("expired", expires_at=1))
+    pwd_repository.set_repository(repository)
+
+    # Menos tempo restante que a margem: para antes do primeiro delete.
+    report = sweep_handler.handler({}, FakeLambdaContext(1_000))
+    pwd_repository.set_repository(None)
+    reset_cursor_store()
+
+    assert (report["deleted"], report["complete"]) == (0, False)
+    (record,) = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert record["SweepDeleted"] == 0
@@ -0,0 +1,227 @@
+import hashlib
+import json
+
+import pytest
+
+from infra import token_filter
+from infra.token_filter import BloomFilter, NegativeLookupFilter, SNAPSHOT_SAFETY_SECONDS
+from usecases.get_secret import get_secret
+from utils.security import is_legacy_token, new_token, token_created_at
+
+
+def _hash(value):
+    return hashlib.sha256(value.encode()).hexdigest()
+
+
+def _inline(target):
+    target()
+
+
+class FakeClock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_bloom_filter_has_no_false_negatives_and_bounded_false_positives():
+    bloom = BloomFilter.for_capacity(2000, 0.01, 1024 * 1024)
+    stored = [_hash(f"stored-{i}") for i in range(2000)]
+    for token_hash in stored:
+        bloom.add(token_hash)
+
+    assert all(token_hash in bloom for token_hash in stored)
+    false_positives = sum(_hash(f"probe-{i}") in bloom for i in range(10000))
+    assert false_positives < 300
+
+
+def test_bloom_filter_respects_max_bytes():
+    bloom = BloomFilter.for_capacity(1_000_000, 0.001, 4096)
+
+    assert len(bloom.bits) == 4096
+
+
+@pytest.fixture(autouse=True)
+def mac_key(monkeypatch):
+    monkeypatch.setenv("TOKEN_MAC_KEY", "chave-de-teste")
+    monkeypatch.delenv("TOKEN_MAC_PREVIOUS_KEYS", raising=False)
+
+
+def test_new_token_embeds_an_authenticated_creation_time(monkeypatch):
+    token = new_token(1_700_000_000)
+
+    assert len(token) == 48
+    assert token_created_at(token) == 1_700_000_000
+    # A data vai mascarada: o mesmo segundo gera prefixos diferentes.
+    assert new_token(1_700_000_000)[:8] != token[:8]
+    assert token_created_at("a" * 43) is None
+    assert token_created_at("!" * 48) is None
+
+    # Trocar um byte (ou a chave) invalida o HMAC.
+    forged = token[:32] + ("A" if token[32] != "A" else "B") + token[33:]
+    assert token_created_at(forged) is None
+    monkeypatch.setenv("TOKEN_MAC_KEY", "outra-chave")
+    assert token_created_at(token) is None
+
+
+def test_rotated_mac_key_turns_its_tokens_into_legacy(monkeypatch):
+    token = new_token(1_700_000_000)
+    monkeypatch.setenv("TOKEN_MAC_KEY", "chave-nova")
+
+    assert token_created_at(token) is None
+    assert not is_legacy_token(token)
+
+    monkeypatch.setenv("TOKEN_MAC_PREVIOUS_KEYS", "outra, chave-de-teste")
+    assert token_created_at(token) is None
+    assert is_legacy_token(token)
+    assert not is_legacy_token(new_token(1_700_000_000))
+
+
+def test_without_mac_key_tokens_are_legacy(monkeypatch):
+    monkeypatch.delenv("TOKEN_MAC_KEY")
+
+    token = new_token(1_700_000_000)
+
+    assert len(token) == 43
+    assert token_created_at(token) is None
+
+
+def test_filter_rejects_old_unknown_tokens_and_passes_known_ones():
+    clock = FakeClock()
+    live = _hash("live")
+    filt = NegativeLookupFilter(lambda: [live], clock=clock, spawn=_inline)
+
+    old = int(clock.now) - 3600
+    assert filt.might_exist(live, old) is True
+    assert filt.might_exist(_hash("probe"), old) is False
+    assert filt.counters == {"filtered": 1, "passed": 1, "refreshes": 1}
+
+
+def test_filter_trusts_only_tokens_older_than_snapshot_margin():
+    clock = FakeClock()
+    filt = NegativeLookupFilter(lambda: [], clock=clock)
+    filt.refresh()
+
+    recent = int(clock.now) - SNAPSHOT_SAFETY_SECONDS + 1
+    assert filt.might_exist(_hash("recent"), recent) is True
+    assert filt.might_exist(_hash("future"), int(clock.now) + 3600) is False
+
+
+def test_filter_passes_legacy_tokens_until_the_cutoff_and_rejects_forged_ones():
+    clock = FakeClock()
+    filt = NegativeLookupFilter(lambda: [], clock=clock, legacy_until=clock.now + 60)
+    filt.refresh()
+
+    assert filt.might_exist(_hash("legado"), None, legacy=True) is True
+    assert filt.might_exist(_hash("forjado"), None) is False
+
+    clock.now += 60
+    assert filt.might_exist(_hash("legado"), None, legacy=True) is False
+
+
+def test_filter_refreshes_after_interval_and_keeps_local_adds():
+    clock = FakeClock()
+    loads = []
+    filt = NegativeLookupFilter(lambda: loads.append(1) or [], refresh_seconds=60, clock=clock, spawn=_inline)
+    old = int(clock.now) - 3600
+
+    filt.might_exist(_hash("x"), old)
+    filt.add(_hash("created-here"))
+    assert filt.might_exist(_hash("created-here"), old) is True
+
+    clock.now += 61
+    filt.might_exist(_hash("x"), old)
+    assert len(loads) == 2
+
+
+def test_refresh_runs_off_the_request_path_and_only_once():
+    clock = FakeClock()
+    pending = []
+    snapshots = [[], [_hash("novo")]]
+    filt = NegativeLookupFilter(lambda: snapshots.pop(0), refresh_seconds=60, clock=clock, spawn=pending.append)
+    old = int(clock.now) - 3600
+
+    # Sem snapshot: nada é negado e a carga fica para a thread.
+    assert filt.might_exist(_hash("x"), old) is True
+    assert filt.might_exist(_hash("y"), old) is True
+    assert len(pending) == 1
+    pending.pop()()
+    assert filt.might_exist(_hash("x"), old) is False
+
+    # Filtro vencido: continua servindo o antigo enquanto recarrega.
+    clock.now += 61
+    assert filt.might_exist(_hash("novo"), old) is False
+    assert filt.might_exist(_hash("novo"), old) is False
+    assert len(pending) == 1
+    pending.pop()()
+    assert filt.might_exist(_hash("novo"), old) is True
+    assert pending == []
+
+
+def test_failed_background_refresh_keeps_the_old_filter_and_retries_later():
+    clock = FakeClock()
+    calls = []
+
+    def loader():
+        calls.append(1)
+        if len(calls) > 1:
+            raise RuntimeError("scan falhou")
+        return []
+
+    filt = NegativeLookupFilter(loader, refresh_seconds=60, clock=clock, spawn=_inline)
+    old = int(clock.now) - 3600
+    filt.might_exist(_hash("x"), old)
+
+    clock.now += 61
+    assert filt.might_exist(_hash("x"), old) is False
+    assert filt.might_exist(_hash("x"), old) is False
+    assert len(calls) == 2 and not filt.refreshing
+
+
+def test_get_secret_short_circuits_filtered_tokens(monkeypatch):
+    clock = FakeClock()
+    filt = NegativeLookupFilter(lambda: [], clock=clock, spawn=_inline)
+    monkeypatch.setattr("usecases.get_secret.get_token_filter", lambda: filt)
+    monkeypatch.setattr(
+        "usecases.get_secret.consume_view_and_maybe_delete",
+        lambda token_hash: (_ for _ in ()).throw(AssertionError("não deveria consultar a tabela")),
+    )
+    pwd_id = new_token(int(clock.now) - 3600)
+
+    resp = get_secret({"pathParameters": {"pwdId": pwd_id}})
+
+    assert resp["statusCode"] == 404
+    assert json.loads(resp["body"])["message"] == "Link inválido"
+
+
+def test_get_secret_filters_forged_tokens_but_not_legacy_ones(monkeypatch):
+    filt = NegativeLookupFilter(lambda: [], spawn=_inline)
+    monkeypatch.setattr("usecases.get_secret.get_token_filter", lambda: filt)
+    monkeypatch.setattr("usecases.get_secret.consume_view_and_maybe_delete", lambda token_hash: ("not_found", None))
+
+    assert get_secret({"pathParameters": {"pwdId": "a" * 48}})["statusCode"] == 404
+    assert get_secret({"pathParameters": {"pwdId": "a" * 49}})["statusCode"] == 404
+    assert get_secret({"pathParameters": {"pwdId": "a" * 43}})["statusCode"] == 404
+    assert filt.counters["filtered"] == 2 and filt.counters["passed"] == 1
+
+
+def test_get_token_filter_is_disabled_by_default(monkeypatch):
+    monkeypatch.delenv("TOKEN_FILTER_ENABLED", raising=False)
+    token_filter.reset_token_filter()
+
+    assert token_filter.get_token_filter() is None
+
+
+def test_get_token_filter_requires_a_mac_key(monkeypatch):
+    monkeypatch.setenv("TOKEN_FILTER_ENABLED", "true")
+    monkeypatch.delenv("TOKEN_MAC_KEY")
+    token_filter.reset_token_filter()
+
+    with pytest.raises(RuntimeError, match="TOKEN_MAC_KEY"):
+        token_filter.get_token_filter()
+
+    monkeypatch.setenv("TOKEN_MAC_KEY", "chave-de-teste")
+    monkeypatch.setenv("TOKEN_LEGACY_UNTIL", "2027-01-01")
+    assert token_filter.get_token_filter().legacy_until == 1798761600
+    token_filter.reset_token_filter()
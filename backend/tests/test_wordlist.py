@@ -0,0 +1,36 @@
+import pytest
+
+from infra import wordlist
+from infra.wordlist import DATA_DIR, Wordlist, compile_wordlist
+
+
+def test_compiled_wordlist_roundtrip(tmp_path):
+    path = str(tmp_path / "words.bin")
+    compile_wordlist(["alfa", "bravo", "çarpa"], path)
+
+    words = Wordlist(path)
+
+    assert len(words) == 3
+    assert [words[i] for i in range(3)] == ["alfa", "bravo", "çarpa"]
+    with pytest.raises(IndexError):
+        words[3]
+
+
+def test_rejects_files_without_magic(tmp_path):
+    path = tmp_path / "words.bin"
+    path.write_bytes(b"XXXX\x00\x00\x00\x00")
+
+    with pytest.raises(RuntimeError, match="Wordlist inválida"):
+        Wordlist(str(path))
+
+
+def test_shipped_binary_matches_source_list():
+    with open(f"{DATA_DIR}/wordlist.txt", encoding="utf-8") as f:
+        source = [line.strip() for line in f if line.strip()]
+    wordlist.reset_wordlist()
+
+    shipped = wordlist.get_wordlist()
+
+    assert len(shipped) == len(source) == 7776
+    assert [shipped[i] for i in range(len(shipped))] == source
+    assert len(set(source)) == len(source)
@@ -0,0 +1,120 @@
+import asyncio
+import json
+import sys
+from typing import Optional
+
+from infra import async_repository
+from infra.async_repository import run_blocking, run_in_background
+from infra.crypto_service import decrypt, encrypt_with_key_id, needs_reencryption
+from usecases.create_secret import IDEMPOTENCY_HEADER, build_item, create_secret, created_response, parse_create_spec
+from usecases.create_secrets_batch import WRITE_CHUNK_SIZE, batch_response, failed_chunk, parse_batch
+from usecases.get_secret import MISSING_PWD_ID, NOT_ALLOWED, NOT_FOUND, screen_request, secret_response
+from usecases.peek_secret import meta_response
+from utils.http import json_response
+from utils.security import get_header, get_path_param, sha256_hex
+
+# Variantes asyncio dos casos de uso para o servidor de longa duração
+# (server/async_server.py). As regras são as mesmas das versões síncronas, que
+# continuam sendo as usadas na Lambda; aqui o I/O no banco e a criptografia
+# rodam fora do event loop e trabalhos independentes se sobrepõem.
+
+
+async def create_secret_async(event: dict):
+    # Com Idempotency-Key o fluxo (claim, gravação, liberação em caso de erro)
+    # é o mesmo da Lambda; roda inteiro fora do event loop.
+    if get_header(event, IDEMPOTENCY_HEADER) is not None:
+        return await run_blocking(create_secret, event)
+
+    body = json.loads(event.get("body") or "{}")
+
+    try:
+        expiration, max_views, secret_plain, entropy_bits = parse_create_spec(body)
+    except ValueError as e:
+        return json_response(400, {"message": str(e)})
+
+    built = await run_blocking(build_item, expiration, max_views, secret_plain)
+    await async_repository.save_secret(built.item)
+    return created_response(built, entropy_bits)
+
+
+def _build_chunk(entries: list) -> list:
+    return [build_item(*spec[:3]) for _, spec in entries]
+
+
+async def _save_chunk(items: list) -> list:
+    try:
+        return await async_repository.save_secrets(items)
+    except Exception as e:
+        return failed_chunk(items, e)
+
+
+async def create_secrets_batch_async(event: dict):
+    rejected, results, valid = parse_batch(event)
+    if rejected is not None:
+        return rejected
+
+    # Pipeline: enquanto um lote de WRITE_CHUNK_SIZE itens é gravado (I/O, sem
+    # GIL), o próximo já está sendo criptografado.
+    built = []
+    saves = []
+    for start in range(0, len(valid), WRITE_CHUNK_SIZE):
+        chunk = await run_blocking(_build_chunk, valid[start:start + WRITE_CHUNK_SIZE])
+        built.extend(chunk)
+        saves.append(asyncio.ensure_future(_save_chunk([secret.item for secret in chunk])))
+
+    failed = [item for chunk_failed in await asyncio.gather(*saves) for item in chunk_failed]
+    return batch_response(results, valid, built, failed)
+
+
+async def _reencrypt(token_hash: str, key_id: Optional[str], secret: str) -> None:
+    new_key_id, ciphertext = await run_blocking(encrypt_with_key_id, secret)
+    try:
+        await async_repository.reencrypt_secret(token_hash, key_id, new_key_id, ciphertext)
+    except Exception as e:
+        print(f"get_secret_async: recriptografia falhou: {e!r}", file=sys.stderr)
+
+
+async def get_secret_async(event: dict):
+    pwd_id = get_path_param(event, "pwdId")
+    if not pwd_id:
+        return MISSING_PWD_ID()
+
+    token_hash = sha256_hex(pwd_id)
+    # O rate limiter pode consultar o DynamoDB e o filtro de tokens faz Scan ao
+    # se renovar: ambos ficam fora do loop.
+    rejected = await run_blocking(screen_request, event, pwd_id, token_hash)
+    if rejected is not None:
+        return rejected
+
+    status, item = await async_repository.consume_view_and_maybe_delete(token_hash)
+    if status == "not_found":
+        return NOT_FOUND()
+
+    if status == "not_allowed":
+        return NOT_ALLOWED()
+
+    key_id = item.get("key_id")
+    secret = await run_blocking(decrypt, item["ciphertext"], key_id)
+
+    # Recriptografia é best effort: não segura a resposta.
+    if status == "consumed" and needs_reencryption(key_id):
+        run_in_background(_reencrypt(token_hash, key_id, secret))
+
+    return secret_response(pwd_id, item, secret)
+
+
+async def peek_secret_async(event: dict):
+    pwd_id = get_path_param(event, "pwdId")
+    if not pwd_id:
+        return MISSING_PWD_ID()
+
+    token_hash = sha256_hex(pwd_id)
+    rejected = await run_blocking(screen_request, event, pwd_id, token_hash)
+    if rejected is not None:
+        return rejected
+
+    item = await async_repository.peek_secret(token_hash)
+    if item is None:
+        return NOT_FOUND()
+
+    return meta_response(pwd_id, item)
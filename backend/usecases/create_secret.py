@@ -1,54 +1,243 @@
 import json
-import secrets
+import sys
+from typing import NamedTuple, Optional
 
 from infra.pwd_repository import save_secret
-from infra.password_generator import generate_password
-from infra.crypto_service import encrypt
-from utils.http import json_response
-from utils.security import sha256_hex
+from infra.password_generator import AMBIGUOUS, PassphrasePolicy, PasswordPolicy, generate_passphrases, generate_passwords
+from infra.wordlist import get_wordlist
+from infra.crypto_service import decrypt, encrypt_with_key_id
+from infra.idempotency import IdempotencyRecord, IdempotencyUnavailable, get_idempotency
+from infra.token_filter import get_token_filter
+from utils import metrics
+from utils.http import RESPONSE_HEADERS, constant_response, encode_body, json_response
+from utils.security import get_header, new_revoke_token, new_token, sha256_hex
 from utils.time_utils import now_unix
 
 
-def create_secret(event: dict):
-    body = json.loads(event.get("body") or "{}")
+def _int_field(body: dict, name: str, default: int) -> int:
+    try:
+        return int(body.get(name, default))
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} inválido")
+
+
+class CreateSpec(NamedTuple):
+    expiration: int
+    max_views: int
+    secret_plain: str
+    entropy_bits: Optional[float] = None
+
+
+def _chars_field(body: dict, name: str) -> str:
+    value = body.get(name, "")
+    if not isinstance(value, str):
+        raise ValueError(f"{name} inválido")
+    return value
+
+
+def parse_password_policy(body: dict) -> PasswordPolicy:
+    exclude = _chars_field(body, "pass_exclude")
+    if body.get("pass_exclude_ambiguous"):
+        exclude += AMBIGUOUS
+    return PasswordPolicy(
+        bool(body.get("use_letters", True)),
+        bool(body.get("use_digits", True)),
+        bool(body.get("use_punctuation", True)),
+        _int_field(body, "pass_length", 16),
+        include=_chars_field(body, "pass_include"),
+        exclude=exclude,
+    )
+
+
+def parse_passphrase_policy(body: dict) -> PassphrasePolicy:
+    separator = body.get("pass_separator", "-")
+    capitalize = body.get("pass_capitalize", "none")
+    if not isinstance(separator, str):
+        raise ValueError("pass_separator inválido")
+    if not isinstance(capitalize, str):
+        raise ValueError("pass_capitalize inválido")
+    policy = PassphrasePolicy(
+        _int_field(body, "pass_words", 6),
+        separator,
+        capitalize,
+        bool(body.get("pass_digit", False)),
+    )
+    policy.validate()
+    return policy
+
 
-    expiration = int(body.get("expiration_in_seconds", 3600))
-    max_views = int(body.get("pass_view_limit", 1))
+def parse_create_spec(body: dict) -> CreateSpec:
+    if not isinstance(body, dict):
+        raise ValueError("Item inválido")
+
+    expiration = _int_field(body, "expiration_in_seconds", 3600)
+    max_views = _int_field(body, "pass_view_limit", 1)
 
     if expiration <= 0:
-        return json_response(400, {"message": "expiration_in_seconds deve ser maior que 0"})
+        raise ValueError("expiration_in_seconds deve ser maior que 0")
 
     if max_views <= 0:
-        return json_response(400, {"message": "pass_view_limit deve ser maior que 0"})
+        raise ValueError("pass_view_limit deve ser maior que 0")
 
     sended_password = body.get("sended_password")
 
     if sended_password is not None:
         if not isinstance(sended_password, str) or not sended_password.strip():
-            return json_response(400, {"message": "sended_password inválido"})
-        secret_plain = sended_password.strip()
-    else:
-        use_letters = bool(body.get("use_letters", True))
-        use_digits = bool(body.get("use_digits", True))
-        use_punctuation = bool(body.get("use_punctuation", True))
-        pass_length = int(body.get("pass_length", 16))
+            raise ValueError("sended_password inválido")
+        return CreateSpec(expiration, max_views, sended_password.strip())
 
-        try:
-            secret_plain = generate_password(use_letters, use_digits, use_punctuation, pass_length)
-        except ValueError as e:
-            return json_response(400, {"message": str(e)})
+    if body.get("pass_mode", "password") == "passphrase":
+        policy = parse_passphrase_policy(body)
+        with metrics.span("generate"):
+            secret_plain = generate_passphrases(policy, 1)[0]
+        return CreateSpec(expiration, max_views, secret_plain, policy.entropy_bits(len(get_wordlist())))
+
+    policy = parse_password_policy(body)
+    with metrics.span("generate"):
+        secret_plain = generate_passwords(policy, 1)[0]
+    return CreateSpec(expiration, max_views, secret_plain, policy.entropy_bits())
+
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+MAX_IDEMPOTENCY_KEY_LENGTH = 255
+IDEMPOTENCY_CONFLICT = constant_response(422, {"message": "Idempotency-Key já usada com outro corpo"})
+IDEMPOTENCY_IN_PROGRESS = constant_response(409, {"message": "Requisição com esta Idempotency-Key ainda em andamento"})
 
-    token = secrets.token_urlsafe(32)
-    token_hash = sha256_hex(token)
+
+class BuiltSecret(NamedTuple):
+    token: str
+    item: dict
+    revoke_token: str
+
+
+def build_item(
+    expiration: int,
+    max_views: int,
+    secret_plain: str,
+    token: Optional[str] = None,
+    revoke_token: Optional[str] = None,
+) -> BuiltSecret:
+    now = now_unix()
+    token = token or new_token(now)
+    revoke_token = revoke_token or new_revoke_token()
+    with metrics.span("sha256"):
+        token_hash = sha256_hex(token)
+        revoke_hash = sha256_hex(revoke_token)
+    with metrics.span("encrypt"):
+        key_id, ciphertext = encrypt_with_key_id(secret_plain)
 
     item = {
         "token_hash": token_hash,
-        "ciphertext": encrypt(secret_plain),
-        "expires_at": now_unix() + expiration,
+        "ciphertext": ciphertext,
+        "key_id": key_id,
+        "expires_at": now + expiration,
         "max_views": max_views,
         "views_used": 0,
         "revoked": False,
+        "revoke_hash": revoke_hash,
     }
+    return BuiltSecret(token, item, revoke_token)
+
+
+def _idempotency_key(event: dict) -> Optional[str]:
+    key = get_header(event, IDEMPOTENCY_HEADER)
+    if key is None:
+        return None
+    if not 0 < len(key) <= MAX_IDEMPOTENCY_KEY_LENGTH or not all(" " < c < "\x7f" for c in key):
+        raise ValueError(f"{IDEMPOTENCY_HEADER} inválida")
+    return sha256_hex(key)
+
+
+def _replay(record: IdempotencyRecord, fingerprint: str) -> dict:
+    if record.fingerprint != fingerprint:
+        return IDEMPOTENCY_CONFLICT()
+    if not record.completed:
+        # O pwdId ainda não existe na tabela: não pode ser devolvido.
+        resp = IDEMPOTENCY_IN_PROGRESS()
+        resp["headers"]["Retry-After"] = "1"
+        return resp
+    return {
+        "statusCode": 201,
+        "headers": {**RESPONSE_HEADERS, "Idempotent-Replayed": "true"},
+        "body": decrypt(record.response, record.key_id),
+    }
+
+
+def create_secret(event: dict):
+    raw_body = event.get("body") or "{}"
+    body = json.loads(raw_body)
+
+    try:
+        idempotency_key = _idempotency_key(event)
+    except ValueError as e:
+        return json_response(400, {"message": str(e)})
+
+    token = new_token(now_unix())
+    revoke_token = new_revoke_token()
+    if idempotency_key is not None:
+        # Retentativa no mesmo container responde do LRU; em outro, perde o put
+        # condicional. Nos dois casos antes de gerar a senha ou cifrar qualquer
+        # coisa: o claim leva só fingerprint e token_hash.
+        fingerprint = sha256_hex(raw_body)
+        idempotency = get_idempotency()
+        cached = idempotency.lookup(idempotency_key)
+        if cached is not None:
+            return _replay(cached, fingerprint)
+
+        record = IdempotencyRecord(
+            fingerprint=fingerprint,
+            token_hash=sha256_hex(token),
+            key_id="",
+            response="",
+            expires_at=idempotency.now() + idempotency.lease_seconds,
+        )
+        try:
+            with metrics.span("idempotency"):
+                existing = idempotency.claim(idempotency_key, record)
+        except IdempotencyUnavailable as e:
+            print(f"idempotency indisponível, criando sem deduplicar: {e}", file=sys.stderr)
+            existing = idempotency_key = None
+        if existing is not None:
+            return _replay(existing, fingerprint)
+
+    try:
+        expiration, max_views, secret_plain, entropy_bits = parse_create_spec(body)
+    except ValueError as e:
+        if idempotency_key is not None:
+            get_idempotency().release(idempotency_key)
+        return json_response(400, {"message": str(e)})
+
+    built = build_item(expiration, max_views, secret_plain, token, revoke_token)
+
+    try:
+        with metrics.span("save"):
+            save_secret(built.item)
+    except Exception:
+        if idempotency_key is not None:
+            get_idempotency().release(idempotency_key)
+        raise
+
+    if idempotency_key is not None:
+        key_id, stored = encrypt_with_key_id(encode_body(created_body(token, revoke_token, entropy_bits)))
+        try:
+            get_idempotency().complete(idempotency_key, record._replace(key_id=key_id, response=stored))
+        except IdempotencyUnavailable as e:
+            # O segredo já foi gravado; uma retentativa só vê 409 até o claim vencer.
+            print(f"idempotency indisponível ao concluir: {e}", file=sys.stderr)
+
+    with metrics.span("response"):
+        return created_response(built, entropy_bits)
+
+
+def created_body(token: str, revoke_token: str, entropy_bits: Optional[float]) -> dict:
+    response = {"pwdId": token, "revokeToken": revoke_token}
+    if entropy_bits is not None:
+        response["entropy_bits"] = round(entropy_bits, 1)
+    return response
+
 
-    save_secret(item)
-    return json_response(201, {"pwdId": token})
\ No newline at end of file
+def created_response(built: BuiltSecret, entropy_bits: Optional[float]) -> dict:
+    token_filter = get_token_filter()
+    if token_filter is not None:
+        token_filter.add(built.item["token_hash"])
+    return json_response(201, created_body(built.token, built.revoke_token, entropy_bits))
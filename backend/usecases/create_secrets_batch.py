@@ -0,0 +1,87 @@
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from infra.pwd_repository import save_secrets
+from infra.token_filter import get_token_filter
+from usecases.create_secret import build_item, parse_create_spec
+from utils import metrics
+from utils.http import json_response
+
+
+MAX_BATCH_ITEMS = 500
+WRITE_CHUNK_SIZE = 25
+DEFAULT_BATCH_WORKERS = 8
+
+
+def _workers() -> int:
+    return max(1, int(os.environ.get("BATCH_WORKERS", DEFAULT_BATCH_WORKERS)))
+
+
+def parse_batch(event: dict):
+    # Retorna (resposta de erro, None, None) ou (None, results, valid).
+    body = json.loads(event.get("body") or "{}")
+    specs = body.get("items") if isinstance(body, dict) else body
+
+    if not isinstance(specs, list) or not specs:
+        return json_response(400, {"message": "items deve ser uma lista não vazia"}), None, None
+
+    if len(specs) > MAX_BATCH_ITEMS:
+        return json_response(400, {"message": f"items aceita no máximo {MAX_BATCH_ITEMS} entradas"}), None, None
+
+    results = [None] * len(specs)
+    valid = []
+    for index, spec in enumerate(specs):
+        try:
+            valid.append((index, parse_create_spec(spec)))
+        except ValueError as e:
+            results[index] = {"index": index, "message": str(e)}
+    return None, results, valid
+
+
+def failed_chunk(items: list, error: Exception) -> list:
+    # Um lote que falha inteiro (throttling, erro do DynamoDB) vira erro por
+    # entrada na resposta 207, sem derrubar os lotes que já foram gravados.
+    print(f"create_secrets_batch: lote de {len(items)} itens falhou: {error!r}", file=sys.stderr)
+    return items
+
+
+def save_chunk(items: list) -> list:
+    try:
+        return save_secrets(items)
+    except Exception as e:
+        return failed_chunk(items, e)
+
+
+def batch_response(results: list, valid: list, built: list, failed: list) -> dict:
+    token_filter = get_token_filter()
+    failed_hashes = {item["token_hash"] for item in failed}
+    for (index, spec), (token, item, revoke_token) in zip(valid, built):
+        if item["token_hash"] in failed_hashes:
+            results[index] = {"index": index, "message": "Falha ao gravar o segredo, tente novamente"}
+        else:
+            results[index] = {"index": index, "pwdId": token, "revokeToken": revoke_token}
+            if spec.entropy_bits is not None:
+                results[index]["entropy_bits"] = round(spec.entropy_bits, 1)
+            if token_filter is not None:
+                token_filter.add(item["token_hash"])
+
+    has_errors = any("message" in result for result in results)
+    return json_response(207 if has_errors else 201, {"results": results})
+
+
+def create_secrets_batch(event: dict):
+    rejected, results, valid = parse_batch(event)
+    if rejected is not None:
+        return rejected
+
+    with ThreadPoolExecutor(max_workers=_workers()) as pool:
+        with metrics.span("build_items"):
+            built = list(pool.map(metrics.propagate(lambda entry: build_item(*entry[1][:3])), valid))
+        items = [secret.item for secret in built]
+        chunks = [items[i:i + WRITE_CHUNK_SIZE] for i in range(0, len(items), WRITE_CHUNK_SIZE)]
+        with metrics.span("save"):
+            failed = [item for chunk_failed in pool.map(metrics.propagate(save_chunk), chunks) for item in chunk_failed]
+
+    return batch_response(results, valid, built, failed)
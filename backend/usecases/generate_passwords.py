@@ -0,0 +1,41 @@
+import json
+
+from infra.password_generator import generate_passphrases, generate_passwords as generate
+from infra.wordlist import get_wordlist
+from usecases.create_secret import parse_passphrase_policy, parse_password_policy
+from utils import metrics
+from utils.http import json_response
+from utils.security import get_query_param
+
+
+MAX_GENERATE_COUNT = 1000
+
+
+def generate_passwords(event: dict):
+    body = json.loads(event.get("body") or "{}")
+    if not isinstance(body, dict):
+        return json_response(400, {"message": "Body inválido"})
+
+    try:
+        count = int(get_query_param(event, "count") or 1)
+    except ValueError:
+        return json_response(400, {"message": "count inválido"})
+
+    if count <= 0 or count > MAX_GENERATE_COUNT:
+        return json_response(400, {"message": f"count deve estar entre 1 e {MAX_GENERATE_COUNT}"})
+
+    try:
+        if body.get("pass_mode", "password") == "passphrase":
+            policy = parse_passphrase_policy(body)
+            with metrics.span("generate"):
+                passwords = generate_passphrases(policy, count)
+            entropy_bits = policy.entropy_bits(len(get_wordlist()))
+        else:
+            policy = parse_password_policy(body)
+            with metrics.span("generate"):
+                passwords = generate(policy, count)
+            entropy_bits = policy.entropy_bits()
+    except ValueError as e:
+        return json_response(400, {"message": str(e)})
+
+    return json_response(200, {"passwords": passwords, "entropy_bits": round(entropy_bits, 1)})
@@ -1,26 +1,91 @@
-from infra.pwd_repository import consume_view_and_maybe_delete
-from infra.crypto_service import decrypt
-from utils.http import json_response
-from utils.security import sha256_hex, get_path_param
+import math
+import sys
+from typing import Optional
+
+from infra.pwd_repository import consume_view_and_maybe_delete, reencrypt_secret
+from infra.crypto_service import decrypt, encrypt_with_key_id, needs_reencryption
+from infra.rate_limiter import get_rate_limiter
+from infra.revoked_cache import get_revoked_cache
+from infra.token_filter import get_token_filter
+from utils import metrics
+from utils.http import constant_response, json_response
+from utils.security import sha256_hex, get_path_param, get_source_ip, is_legacy_token, token_created_at
+
+
+MISSING_PWD_ID = constant_response(400, {"message": "pwdId ausente"})
+NOT_FOUND = constant_response(404, {"message": "Link inválido"})
+NOT_ALLOWED = constant_response(410, {"message": "Link expirou ou atingiu o limite de visualizações"})
+REVOKED = constant_response(410, {"message": "Link revogado"})
+TOO_MANY_REQUESTS = constant_response(429, {"message": "Muitas requisições, tente novamente mais tarde"})
+
+
+def _rate_limited(retry_after: float) -> dict:
+    resp = TOO_MANY_REQUESTS()
+    resp["headers"]["Retry-After"] = str(max(1, math.ceil(retry_after)))
+    return resp
+
+
+def screen_request(event: dict, pwd_id: str, token_hash: str) -> Optional[dict]:
+    if token_hash in get_revoked_cache():
+        return REVOKED()
+
+    rate_limiter = get_rate_limiter()
+    if rate_limiter is not None:
+        with metrics.span("rate_limit"):
+            retry_after = rate_limiter.check(get_source_ip(event), token_hash)
+        if retry_after:
+            return _rate_limited(retry_after)
+
+    token_filter = get_token_filter()
+    if token_filter is not None:
+        with metrics.span("token_filter"):
+            might_exist = token_filter.might_exist(
+                token_hash, token_created_at(pwd_id), legacy=is_legacy_token(pwd_id)
+            )
+        if not might_exist:
+            return NOT_FOUND()
+    return None
 
 
 def get_secret(event: dict):
     pwd_id = get_path_param(event, "pwdId")
     if not pwd_id:
-        return json_response(400, {"message": "pwdId ausente"})
+        return MISSING_PWD_ID()
+
+    with metrics.span("sha256"):
+        token_hash = sha256_hex(pwd_id)
 
-    token_hash = sha256_hex(pwd_id)
+    rejected = screen_request(event, pwd_id, token_hash)
+    if rejected is not None:
+        return rejected
 
-    status, item = consume_view_and_maybe_delete(token_hash)
+    with metrics.span("consume"):
+        status, item = consume_view_and_maybe_delete(token_hash)
 
     if status == "not_found":
-        return json_response(404, {"message": "Link inválido"})
+        return NOT_FOUND()
 
     if status == "not_allowed":
-        return json_response(410, {"message": "Link expirou ou atingiu o limite de visualizações"})
+        return NOT_ALLOWED()
+
+    key_id = item.get("key_id")
+    with metrics.span("decrypt"):
+        secret = decrypt(item["ciphertext"], key_id)
+
+    if status == "consumed" and needs_reencryption(key_id):
+        with metrics.span("reencrypt"):
+            new_key_id, ciphertext = encrypt_with_key_id(secret)
+            try:
+                reencrypt_secret(token_hash, key_id, new_key_id, ciphertext)
+            except Exception as e:
+                # Best effort: a visualização já foi consumida, o segredo volta mesmo assim.
+                print(f"get_secret: recriptografia falhou: {e!r}", file=sys.stderr)
+
+    with metrics.span("response"):
+        return secret_response(pwd_id, item, secret)
 
-    secret = decrypt(item["ciphertext"])
 
+def secret_response(pwd_id: str, item: dict, secret: str) -> dict:
     expires_at = int(item.get("expires_at", 0))
     views_used = int(item.get("views_used", 0))
     max_views = int(item.get("max_views", 0))
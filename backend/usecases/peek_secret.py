@@ -0,0 +1,41 @@
+from infra.pwd_repository import peek_secret as peek_item
+from usecases.get_secret import MISSING_PWD_ID, NOT_FOUND, screen_request
+from utils import metrics
+from utils.http import json_response
+from utils.security import get_path_param, sha256_hex
+from utils.time_utils import now_unix
+
+
+def peek_secret(event: dict):
+    pwd_id = get_path_param(event, "pwdId")
+    if not pwd_id:
+        return MISSING_PWD_ID()
+
+    with metrics.span("sha256"):
+        token_hash = sha256_hex(pwd_id)
+
+    rejected = screen_request(event, pwd_id, token_hash)
+    if rejected is not None:
+        return rejected
+
+    with metrics.span("peek"):
+        item = peek_item(token_hash)
+
+    if item is None:
+        return NOT_FOUND()
+
+    return meta_response(pwd_id, item)
+
+
+def meta_response(pwd_id: str, item: dict) -> dict:
+    expires_at = int(item.get("expires_at", 0))
+    views_remaining = max(0, int(item.get("max_views", 0)) - int(item.get("views_used", 0)))
+    revoked = bool(item.get("revoked", False))
+
+    return json_response(200, {
+        "pwdId": pwd_id,
+        "expiration_date": expires_at,
+        "view_count": views_remaining,
+        "revoked": revoked,
+        "available": not revoked and views_remaining > 0 and expires_at > now_unix(),
+    })
@@ -0,0 +1,53 @@
+from infra.pwd_repository import revoke_secret_with_token
+from infra.revoked_cache import get_revoked_cache
+from usecases.get_secret import MISSING_PWD_ID, NOT_FOUND, screen_request
+from utils import metrics
+from utils.http import constant_response, json_response
+from utils.security import get_header, get_path_param, sha256_hex
+
+
+MISSING_REVOKE_TOKEN = constant_response(401, {"message": "Token de revogação ausente"})
+FORBIDDEN = constant_response(403, {"message": "Token de revogação inválido"})
+
+
+def _revoke_token(event: dict) -> str | None:
+    # Authorization: Bearer <revokeToken>
+    scheme, _, token = (get_header(event, "Authorization") or "").partition(" ")
+    if scheme.lower() != "bearer" or not token.strip():
+        return None
+    return token.strip()
+
+
+def revoke_secret(event: dict):
+    pwd_id = get_path_param(event, "pwdId")
+    if not pwd_id:
+        return MISSING_PWD_ID()
+
+    revoke_token = _revoke_token(event)
+    if revoke_token is None:
+        return MISSING_REVOKE_TOKEN()
+
+    with metrics.span("sha256"):
+        token_hash = sha256_hex(pwd_id)
+
+    # Hash já revogado neste container: screen_request responde o mesmo 410 do
+    # GET, sem conferir o token (um 200 confirmaria a revogação a qualquer um).
+    rejected = screen_request(event, pwd_id, token_hash)
+    if rejected is not None:
+        return rejected
+
+    with metrics.span("revoke"):
+        status = revoke_secret_with_token(token_hash, sha256_hex(revoke_token))
+
+    if status == "not_found":
+        return NOT_FOUND()
+
+    if status == "forbidden":
+        return FORBIDDEN()
+
+    get_revoked_cache().add(token_hash)
+    return revoked_response(pwd_id)
+
+
+def revoked_response(pwd_id: str) -> dict:
+    return json_response(200, {"pwdId": pwd_id, "revoked": True})
@@ -0,0 +1,167 @@
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional
+
+from infra.pwd_repository import delete_secrets, iter_dead_pages
+from infra.sweep_cursors import SweepCursorStore, get_cursor_store
+from utils import metrics
+
+
+DELETE_CHUNK_SIZE = 25
+DEFAULT_SEGMENTS = 4
+DEFAULT_WRITE_CAPACITY_PER_SECOND = 50.0
+DEFAULT_READ_CAPACITY_PER_SECOND = 100.0
+DEFAULT_PAGE_SIZE = 1000
+# Folga antes do timeout da Lambda para terminar o lote em curso, salvar os
+# cursores e emitir o relatório.
+DEFAULT_DEADLINE_MARGIN_SECONDS = 30.0
+
+
+class CapacityBudget:
+    # Balde de fichas compartilhado entre os segmentos (um para RCUs do Scan,
+    # outro para WCUs dos deletes): o sweeper espera em vez de estourar o
+    # budget. Um gasto maior que o saldo deixa o balde negativo e atrasa os
+    # próximos, já que uma página de Scan pode custar mais que 1s de budget.
+    def __init__(
+        self,
+        units_per_second: float,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.units_per_second = units_per_second
+        self.clock = clock
+        self.sleep = sleep
+        self.available = units_per_second
+        self.updated_at = clock()
+        self._lock = threading.Lock()
+
+    def spend(self, units: float) -> None:
+        while True:
+            with self._lock:
+                now = self.clock()
+                self.available = min(
+                    self.units_per_second,
+                    self.available + (now - self.updated_at) * self.units_per_second,
+                )
+                self.updated_at = now
+                needed = min(units, self.units_per_second)
+                if self.available >= needed:
+                    self.available -= units
+                    return
+                wait = (needed - self.available) / self.units_per_second
+            self.sleep(wait)
+
+
+def _sweep_segment(
+    segment: int,
+    total_segments: int,
+    read_budget: CapacityBudget,
+    write_budget: CapacityBudget,
+    page_size: int,
+    deadline: Optional[float] = None,
+    cursors: Optional[SweepCursorStore] = None,
+    clock: Callable[[], float] = time.monotonic,
+) -> dict:
+    counts = {"found": 0, "deleted": 0, "failed": 0}
+    cursor_key = f"{total_segments}:{segment}"
+    cursor = cursors.load(cursor_key) if cursors is not None else None
+
+    def out_of_time() -> bool:
+        return deadline is not None and clock() >= deadline
+
+    complete = False
+    pages = iter_dead_pages(segment, total_segments, page_size, read_budget.spend, cursor)
+    for token_hashes, next_cursor in pages:
+        chunks = [token_hashes[i:i + DELETE_CHUNK_SIZE] for i in range(0, len(token_hashes), DELETE_CHUNK_SIZE)]
+        while chunks and not out_of_time():
+            chunk = chunks.pop(0)
+            failed = delete_secrets(chunk, write_budget.spend)
+            counts["found"] += len(chunk)
+            counts["deleted"] += len(chunk) - len(failed)
+            counts["failed"] += len(failed)
+        if chunks:
+            # Parou no meio da página: a próxima execução relê a página inteira.
+            break
+        cursor = next_cursor
+        complete = cursor is None
+        if complete or out_of_time():
+            break
+    if cursors is not None:
+        cursors.save(cursor_key, cursor)
+    counts["complete"] = complete
+    return counts
+
+
+def sweep(
+    segments: int = DEFAULT_SEGMENTS,
+    write_capacity_per_second: float = DEFAULT_WRITE_CAPACITY_PER_SECOND,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    read_capacity_per_second: float = DEFAULT_READ_CAPACITY_PER_SECOND,
+    deadline: Optional[float] = None,
+    cursors: Optional[SweepCursorStore] = None,
+    clock: Callable[[], float] = time.monotonic,
+) -> dict:
+    # deadline (no relógio clock): os segmentos param antes dele e o relatório
+    # sai parcial, com complete False. Com cursors, cada segmento retoma de
+    # onde parou na execução anterior.
+    read_budget = CapacityBudget(read_capacity_per_second)
+    write_budget = CapacityBudget(write_capacity_per_second)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=segments) as pool:
+        sweep_segment = metrics.propagate(
+            lambda s: _sweep_segment(s, segments, read_budget, write_budget, page_size, deadline, cursors, clock)
+        )
+        results = list(pool.map(sweep_segment, range(segments)))
+    elapsed = time.perf_counter() - start
+
+    report = {"segments": segments, "found": 0, "deleted": 0, "failed": 0}
+    for counts in results:
+        for name in ("found", "deleted", "failed"):
+            report[name] += counts[name]
+    report["complete"] = all(counts["complete"] for counts in results)
+    report["seconds"] = round(elapsed, 3)
+    report["items_per_second"] = round(report["deleted"] / elapsed, 1) if elapsed else 0.0
+    for name in ("found", "deleted", "failed"):
+        metrics.add_count(f"sweep_{name}", report[name])
+    return report
+
+
+def sweep_from_env(remaining_ms: Optional[int] = None) -> dict:
+    deadline = None
+    if remaining_ms is not None:
+        margin = float(os.environ.get("SWEEP_DEADLINE_MARGIN_SECONDS", DEFAULT_DEADLINE_MARGIN_SECONDS))
+        deadline = time.monotonic() + remaining_ms / 1000 - margin
+    return sweep(
+        segments=max(1, int(os.environ.get("SWEEP_SEGMENTS", DEFAULT_SEGMENTS))),
+        write_capacity_per_second=float(
+            os.environ.get("SWEEP_WRITE_CAPACITY_PER_SECOND", DEFAULT_WRITE_CAPACITY_PER_SECOND)
+        ),
+        page_size=int(os.environ.get("SWEEP_PAGE_SIZE", DEFAULT_PAGE_SIZE)),
+        read_capacity_per_second=float(
+            os.environ.get("SWEEP_READ_CAPACITY_PER_SECOND", DEFAULT_READ_CAPACITY_PER_SECOND)
+        ),
+        deadline=deadline,
+        cursors=get_cursor_store(),
+    )
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Remove segredos expirados, esgotados ou revogados.")
+    parser.add_argument("--segments", type=int, default=DEFAULT_SEGMENTS)
+    parser.add_argument("--write-capacity", type=float, default=DEFAULT_WRITE_CAPACITY_PER_SECOND)
+    parser.add_argument("--page-size", type=int, default=DEFAULT_PAGE_SIZE)
+    parser.add_argument("--read-capacity", type=float, default=DEFAULT_READ_CAPACITY_PER_SECOND)
+    args = parser.parse_args(argv)
+
+    report = sweep(args.segments, args.write_capacity, args.page_size, args.read_capacity)
+    print(json.dumps(report))
+    return 1 if report["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
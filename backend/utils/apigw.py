@@ -0,0 +1,72 @@
+import base64
+import time
+import uuid
+from typing import Optional
+from urllib.parse import parse_qsl
+
+
+def http_event(
+    method: str,
+    route: str,
+    path: str,
+    body: Optional[str] = None,
+    path_params: Optional[dict] = None,
+    headers: Optional[dict] = None,
+    source_ip: str = "127.0.0.1",
+    raw_query_string: str = "",
+    is_base64_encoded: bool = False,
+) -> dict:
+    # Evento HTTP API (payload 2.0), como o API Gateway entrega às Lambdas.
+    now = time.time()
+    headers = {name.lower(): value for name, value in (headers or {}).items()}
+    event = {
+        "version": "2.0",
+        "routeKey": f"{method} {route}",
+        "rawPath": path,
+        "rawQueryString": raw_query_string,
+        "headers": headers,
+        "requestContext": {
+            "accountId": "anonymous",
+            "apiId": "local",
+            "domainName": headers.get("host", "localhost"),
+            "http": {
+                "method": method,
+                "path": path,
+                "protocol": "HTTP/1.1",
+                "sourceIp": source_ip,
+                "userAgent": headers.get("user-agent", ""),
+            },
+            "requestId": uuid.uuid4().hex,
+            "routeKey": f"{method} {route}",
+            "stage": "$default",
+            "time": time.strftime("%d/%b/%Y:%H:%M:%S +0000", time.gmtime(now)),
+            "timeEpoch": int(now * 1000),
+        },
+        "pathParameters": path_params,
+        "body": body,
+        "isBase64Encoded": is_base64_encoded,
+    }
+    if raw_query_string:
+        params = {}
+        for name, value in parse_qsl(raw_query_string, keep_blank_values=True):
+            params[name] = f"{params[name]},{value}" if name in params else value
+        event["queryStringParameters"] = params
+    if "cookie" in headers:
+        event["cookies"] = [cookie.strip() for cookie in headers.pop("cookie").split(";")]
+    return event
+
+
+def encode_body(raw: bytes) -> tuple:
+    if not raw:
+        return None, False
+    try:
+        return raw.decode("utf-8"), False
+    except UnicodeDecodeError:
+        return base64.b64encode(raw).decode(), True
+
+
+def decode_body(response: dict) -> bytes:
+    body = response.get("body") or ""
+    if response.get("isBase64Encoded"):
+        return base64.b64decode(body)
+    return body.encode("utf-8")
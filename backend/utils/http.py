@@ -1,23 +1,47 @@
 import json
-from decimal import Decimal
+from types import MappingProxyType
+from typing import Callable
 
-CORS_HEADERS = {
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+CORS_HEADERS = MappingProxyType({
     "Access-Control-Allow-Origin": "http://localhost:3000",
-    "Access-Control-Allow-Headers": "Content-Type,Authorization",
-    "Access-Control-Allow-Methods": "OPTIONS,GET,POST",
+    "Access-Control-Allow-Headers": "Content-Type,Authorization,Idempotency-Key",
+    "Access-Control-Allow-Methods": "OPTIONS,GET,POST,DELETE",
+})
+
+_RESPONSE_HEADERS = {
+    "Content-Type": "application/json",
+    **CORS_HEADERS,
 }
+RESPONSE_HEADERS = MappingProxyType(_RESPONSE_HEADERS)
 
-def json_response(status_code: int, body: dict):
-    def default(o):
-        if isinstance(o, Decimal):
-            return int(o) if o % 1 == 0 else float(o)
-        raise TypeError
+if orjson is not None:
+    def encode_body(body) -> str:
+        return orjson.dumps(body).decode()
+else:
+    encode_body = json.JSONEncoder().encode
 
+
+def json_response(status_code: int, body: dict):
     return {
         "statusCode": status_code,
-        "headers": {
-            "Content-Type": "application/json",
-            **CORS_HEADERS,
-        },
-        "body": json.dumps(body, default=default),
-    }
\ No newline at end of file
+        "headers": _RESPONSE_HEADERS.copy(),
+        "body": encode_body(body),
+    }
+
+
+def constant_response(status_code: int, body: dict) -> Callable[[], dict]:
+    encoded = encode_body(body)
+
+    def response() -> dict:
+        return {
+            "statusCode": status_code,
+            "headers": _RESPONSE_HEADERS.copy(),
+            "body": encoded,
+        }
+
+    return response
\ No newline at end of file
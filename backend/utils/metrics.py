@@ -0,0 +1,188 @@
+import contextvars
+import functools
+import json
+import os
+import sys
+import threading
+import time
+
+
+NAMESPACE = os.environ.get("METRICS_NAMESPACE", "SecurePasswordApi")
+
+_enabled = os.environ.get("METRICS_ENABLED", "").lower() in ("1", "true")
+_cold_start = True
+# Etapas da requisição corrente. ContextVar em vez de threading.local: cada
+# tarefa asyncio tem o seu, e workers que recebem a função via propagate()
+# somam no mesmo dicionário da requisição (daí o lock).
+_request_stages: contextvars.ContextVar = contextvars.ContextVar("metrics_stages", default=None)
+_stages_lock = threading.Lock()
+# Etapas do INIT (infra.prewarm), emitidas junto do primeiro registro.
+_init_stages = {}
+# Valores que não são tempo: saem com Unit Count e o nome da métrica daqui.
+COUNT_METRICS = {
+    "dynamodb_capacity_units": "DynamoDBCapacityUnits",
+    "sweep_found": "SweepFound",
+    "sweep_deleted": "SweepDeleted",
+    "sweep_failed": "SweepFailed",
+}
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def set_enabled(enabled: bool) -> None:
+    global _enabled
+    _enabled = enabled
+
+
+def _stages() -> dict:
+    stages = _request_stages.get()
+    if stages is None:
+        stages = {}
+        _request_stages.set(stages)
+    return stages
+
+
+def _add(name: str, value: float) -> None:
+    stages = _stages()
+    with _stages_lock:
+        stages[name] = stages.get(name, 0.0) + value
+
+
+def propagate(fn):
+    # Para ThreadPoolExecutor/run_in_executor, que não copiam o contexto:
+    # a função roda numa cópia do contexto de quem chamou propagate().
+    context = contextvars.copy_context()
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        # Um Context não pode estar ativo em duas threads: cada chamada usa
+        # uma cópia, que aponta para o mesmo dicionário de etapas.
+        return context.copy().run(fn, *args, **kwargs)
+    return wrapper
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class _Span:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        _add(self.name, (time.perf_counter() - self.start) * 1000)
+        return False
+
+
+def span(name: str):
+    if not _enabled:
+        return _NOOP_SPAN
+    return _Span(name)
+
+
+def timed(name: str):
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            with _Span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def add_init_stage(name: str, elapsed_ms: float) -> None:
+    _init_stages[name] = _init_stages.get(name, 0.0) + elapsed_ms
+
+
+def add_consumed_capacity(consumed) -> None:
+    if not _enabled or not consumed:
+        return
+    entries = consumed if isinstance(consumed, list) else [consumed]
+    _add("dynamodb_capacity_units", sum(float(entry.get("CapacityUnits", 0)) for entry in entries))
+
+
+def add_count(name: str, value: float) -> None:
+    if _enabled:
+        _add(name, value)
+
+
+def dynamodb_capacity_kwargs() -> dict:
+    return {"ReturnConsumedCapacity": "TOTAL"} if _enabled else {}
+
+
+def emf_record(function_name: str, stages: dict, cold_start: bool) -> dict:
+    metrics = [{"Name": "ColdStart", "Unit": "Count"}]
+    record = {"Function": function_name, "ColdStart": int(cold_start)}
+    for name, value in stages.items():
+        if name in COUNT_METRICS:
+            metrics.append({"Name": COUNT_METRICS[name], "Unit": "Count"})
+            record[COUNT_METRICS[name]] = round(value, 3)
+        else:
+            metric_name = f"{name}_ms"
+            metrics.append({"Name": metric_name, "Unit": "Milliseconds"})
+            record[metric_name] = round(value, 3)
+
+    record["_aws"] = {
+        "Timestamp": int(time.time() * 1000),
+        "CloudWatchMetrics": [{
+            "Namespace": NAMESPACE,
+            "Dimensions": [["Function"]],
+            "Metrics": metrics,
+        }],
+    }
+    return record
+
+
+class _Request:
+    __slots__ = ("function_name", "start", "token")
+
+    def __init__(self, function_name: str):
+        self.function_name = function_name
+        self.token = None
+
+    def __enter__(self):
+        if _enabled:
+            self.token = _request_stages.set({})
+            self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        global _cold_start
+        cold_start, _cold_start = _cold_start, False
+        if not _enabled:
+            return False
+
+        stages = _stages()
+        stages["total"] = (time.perf_counter() - self.start) * 1000
+        if cold_start:
+            # Métrica própria para a primeira invocação do container, separada
+            # do total das requisições quentes.
+            stages["first_invocation"] = stages["total"]
+            stages.update(_init_stages)
+        if self.token is not None:
+            _request_stages.reset(self.token)
+        sys.stdout.write(json.dumps(emf_record(self.function_name, stages, cold_start)) + "\n")
+        return False
+
+
+def request(function_name: str) -> _Request:
+    return _Request(function_name)
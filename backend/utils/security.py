@@ -1,7 +1,93 @@
+import base64
 import hashlib
+import hmac
+import os
+import secrets
+
+# pwdId = base64url(24 bytes aleatórios + segundo de criação (uint32) mascarado + HMAC de 8 bytes),
+# 48 chars. Sem TOKEN_MAC_KEY não dá para ler a data nem forjar um pwdId com data válida.
+TOKEN_RANDOM_BYTES = 24
+TOKEN_TAG_BYTES = 8
+TOKEN_LENGTH = 48
+# Formato antigo, sem data: só os 43 chars aleatórios.
+LEGACY_TOKEN_RANDOM_BYTES = 32
+LEGACY_TOKEN_LENGTH = 43
+# Token de revogação: fica só com quem criou o segredo; o item guarda o SHA-256.
+REVOKE_TOKEN_BYTES = 24
 
 def sha256_hex(value: str) -> str:
     return hashlib.sha256(value.encode()).hexdigest()
 
 def get_path_param(event: dict, name: str) -> str | None:
-    return (event.get("pathParameters") or {}).get(name)
\ No newline at end of file
+    return (event.get("pathParameters") or {}).get(name)
+
+def get_query_param(event: dict, name: str) -> str | None:
+    return (event.get("queryStringParameters") or {}).get(name)
+
+def get_header(event: dict, name: str) -> str | None:
+    # Payload 2.0 já vem em minúsculas; o 1.0 (e eventos de teste) não.
+    headers = event.get("headers") or {}
+    value = headers.get(name.lower())
+    if value is None:
+        value = next((v for k, v in headers.items() if k.lower() == name.lower()), None)
+    return value
+
+def get_source_ip(event: dict) -> str | None:
+    return ((event.get("requestContext") or {}).get("http") or {}).get("sourceIp")
+
+def token_mac_key() -> bytes | None:
+    key = os.environ.get("TOKEN_MAC_KEY")
+    return key.encode() if key else None
+
+def _timestamp_mask(key: bytes, nonce: bytes) -> bytes:
+    return hmac.digest(key, b"mask:" + nonce, "sha256")[:4]
+
+def _token_tag(key: bytes, nonce: bytes, timestamp: bytes) -> bytes:
+    return hmac.digest(key, b"tag:" + nonce + timestamp, "sha256")[:TOKEN_TAG_BYTES]
+
+def _xor(a: bytes, b: bytes) -> bytes:
+    return bytes(x ^ y for x, y in zip(a, b))
+
+def new_token(created_at: int) -> str:
+    key = token_mac_key()
+    if key is None:
+        return secrets.token_urlsafe(LEGACY_TOKEN_RANDOM_BYTES)
+    nonce = secrets.token_bytes(TOKEN_RANDOM_BYTES)
+    timestamp = int(created_at).to_bytes(4, "big")
+    masked = _xor(timestamp, _timestamp_mask(key, nonce))
+    return base64.urlsafe_b64encode(nonce + masked + _token_tag(key, nonce, timestamp)).decode()
+
+def new_revoke_token() -> str:
+    return secrets.token_urlsafe(REVOKE_TOKEN_BYTES)
+
+def previous_token_mac_keys() -> list[bytes]:
+    # Chaves aposentadas (rotação): pwdIds assinados com elas não têm mais data
+    # confiável, mas continuam válidos como legado até TOKEN_LEGACY_UNTIL.
+    return [key.strip().encode() for key in os.environ.get("TOKEN_MAC_PREVIOUS_KEYS", "").split(",") if key.strip()]
+
+def _verified_timestamp(token: str, key: bytes) -> int | None:
+    if len(token) != TOKEN_LENGTH:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(token)
+    except ValueError:
+        return None
+    if len(raw) != TOKEN_RANDOM_BYTES + 4 + TOKEN_TAG_BYTES:
+        return None
+    nonce, masked, tag = raw[:TOKEN_RANDOM_BYTES], raw[TOKEN_RANDOM_BYTES:-TOKEN_TAG_BYTES], raw[-TOKEN_TAG_BYTES:]
+    timestamp = _xor(masked, _timestamp_mask(key, nonce))
+    if not hmac.compare_digest(tag, _token_tag(key, nonce, timestamp)):
+        return None
+    return int.from_bytes(timestamp, "big")
+
+def is_legacy_token(token: str) -> bool:
+    if len(token) == LEGACY_TOKEN_LENGTH:
+        return True
+    return any(_verified_timestamp(token, key) is not None for key in previous_token_mac_keys())
+
+def token_created_at(token: str) -> int | None:
+    # Só devolve a data de pwdIds no formato atual com HMAC válido na chave atual.
+    key = token_mac_key()
+    if key is None:
+        return None
+    return _verified_timestamp(token, key)
\ No newline at end of file
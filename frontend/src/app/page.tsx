@@ -82,6 +82,7 @@ function MainContent() {
         onClose={form.closeCreated}
         onCopy={form.copyCreatedUrl}
         onViewNow={form.viewNow}
+        onRevoke={form.revokeCreated}
       />
 
       <ActionErrorModal open={!!form.errorMessage} message={form.errorMessage ?? ""} onClose={form.closeError} />
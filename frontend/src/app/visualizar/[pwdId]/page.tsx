@@ -22,6 +22,17 @@ export default function Page() {
       
       try {
         setLoading(true);
+        // O meta não consome visualização: link expirado/revogado não chega ao GET.
+        // A leitura é eventualmente consistente (o link pode ter acabado de ser
+        // criado), então só um available: false explícito interrompe; erro no
+        // meta segue para o GET, que dá a resposta definitiva.
+        const meta = await pwdApi.meta(String(pwdId)).catch(() => null);
+        if (meta && meta.available === false) {
+          setError(meta.revoked ? "Link revogado" : "Link expirou ou atingiu o limite de visualizações");
+          setData(null);
+          return;
+        }
+
         const resp = await pwdApi.get(String(pwdId));
         setData(resp);
         setError(null);
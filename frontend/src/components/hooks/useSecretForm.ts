@@ -1,4 +1,4 @@
-import { useMemo, useState } from "react";
+import { useMemo, useRef, useState } from "react";
 import { useRouter } from "next/navigation";
 
 import { pwdApi } from "@/lib/api/pwd";
@@ -6,7 +6,7 @@ import { buildShareUrl, extractTokenFromInput } from "@/lib/utils/token";
 import { ExpiresUnit, toExpirationSeconds } from "@/lib/utils/time";
 import { generatePassword } from "@/lib/utils/password";
 
-type Created = { pwdId: string; url: string };
+type Created = { pwdId: string; url: string; revokeToken: string };
 
 const MIN_LEN = 8;
 const MAX_LEN = 128;
@@ -29,6 +29,10 @@ export function useSecretForm() {
 
   const [viewLimit, setViewLimit] = useState<number | "">(1);
 
+  // Mesma chave enquanto o usuário reenvia o mesmo pedido (ex.: após timeout),
+  // para o backend devolver o segredo já criado em vez de gravar outro.
+  const pendingCreate = useRef<{ body: string; key: string } | null>(null);
+
   const [isSubmitting, setIsSubmitting] = useState(false);
   const [created, setCreated] = useState<Created | null>(null);
   const [errorMessage, setErrorMessage] = useState<string | null>(null);
@@ -156,8 +160,14 @@ export function useSecretForm() {
             }),
       };
 
-      const { pwdId } = await pwdApi.create(payload);
-      setCreated({ pwdId, url: buildShareUrl(pwdId) });
+      const body = JSON.stringify(payload);
+      if (pendingCreate.current?.body !== body) {
+        pendingCreate.current = { body, key: crypto.randomUUID() };
+      }
+
+      const { pwdId, revokeToken } = await pwdApi.create(payload, pendingCreate.current.key);
+      pendingCreate.current = null;
+      setCreated({ pwdId, url: buildShareUrl(pwdId), revokeToken });
     } catch (err: any) {
       const msg =
         err.response?.data?.message ||
@@ -192,6 +202,16 @@ export function useSecretForm() {
     if (created?.url) await navigator.clipboard.writeText(created.url);
   };
 
+  const revokeCreated = async () => {
+    if (!created) return;
+    try {
+      await pwdApi.revoke(created.pwdId, created.revokeToken);
+      setCreated(null);
+    } catch (err: any) {
+      setErrorMessage(err?.message || "Não conseguimos revogar o link agora. Tente novamente em instantes.");
+    }
+  };
+
   const viewNow = () => {
     if (created?.pwdId) router.push(`/visualizar/${encodeURIComponent(created.pwdId)}`);
   };
@@ -236,6 +256,7 @@ export function useSecretForm() {
     closeCreated,
     closeError,
     copyCreatedUrl,
+    revokeCreated,
     viewNow,
   };
 }
\ No newline at end of file
@@ -11,10 +11,11 @@ interface ModalProps {
   onClose: () => void;
   onCopy: () => void;
   onViewNow: () => void;
+  onRevoke: () => void;
 }
 
 export function TokenCreatedModal({ 
-  open, url, expiresLabel, viewLimit, onClose, onCopy, onViewNow 
+  open, url, expiresLabel, viewLimit, onClose, onCopy, onViewNow, onRevoke 
 }: ModalProps) {
   const [copied, setCopied] = useState(false);
 
@@ -67,6 +68,10 @@ export function TokenCreatedModal({
           Visualizar agora
           <svg width="18" height="18" viewBox="0 0 24 24" fill="none" stroke="currentColor" strokeWidth="3"><path d="M5 12h14m-7-7l7 7-7 7"/></svg>
         </button>
+
+        <button className={styles.revokeBtn} onClick={onRevoke}>
+          Revogar link
+        </button>
       </article>
     </div>
   );
@@ -1,11 +1,12 @@
 import { apiFetch } from "./client";
-import type { CreatePwdRequest, CreatePwdResponse, GetPwdResponse } from "./types";
+import type { CreatePwdRequest, CreatePwdResponse, GetPwdMetaResponse, GetPwdResponse, RevokePwdResponse } from "./types";
 
 export const pwdApi = {
-  create(payload: CreatePwdRequest) {
+  create(payload: CreatePwdRequest, idempotencyKey?: string) {
     return apiFetch<CreatePwdResponse>("/pwd", {
       method: "POST",
       body: JSON.stringify(payload),
+      headers: idempotencyKey ? { "Idempotency-Key": idempotencyKey } : undefined,
     });
   },
 
@@ -14,4 +15,17 @@ export const pwdApi = {
       method: "GET",
     });
   },
+
+  revoke(pwdId: string, revokeToken: string) {
+    return apiFetch<RevokePwdResponse>(`/pwd/${encodeURIComponent(pwdId)}`, {
+      method: "DELETE",
+      headers: { Authorization: `Bearer ${revokeToken}` },
+    });
+  },
+
+  meta(pwdId: string) {
+    return apiFetch<GetPwdMetaResponse>(`/pwd/${encodeURIComponent(pwdId)}/meta`, {
+      method: "GET",
+    });
+  },
 };
\ No newline at end of file
@@ -12,6 +12,9 @@ export type CreatePwdRequestWithPolicy = CreatePwdRequestBase & {
   use_digits: boolean;
   use_punctuation: boolean;
   pass_length: number;
+  pass_include?: string;
+  pass_exclude?: string;
+  pass_exclude_ambiguous?: boolean;
 };
 
 export type CreatePwdRequest =
@@ -20,10 +23,24 @@ export type CreatePwdRequest =
 
 export type CreatePwdResponse = {
   pwdId: string;
+  revokeToken: string;
+  entropy_bits?: number;
 };
 
 export type GetPwdResponse = {
   pwd: string;
   expiration_date: number;
   view_count: number;
+};
+
+export type RevokePwdResponse = {
+  pwdId: string;
+  revoked: boolean;
+};
+
+export type GetPwdMetaResponse = {
+  expiration_date: number;
+  view_count: number;
+  revoked: boolean;
+  available: boolean;
 };
\ No newline at end of file